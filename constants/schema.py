@@ -9,7 +9,12 @@ IGNORES_LINKED = (
     "validExt",
     "BASEFOLDERS",
     "ROOTS",
+    "SEEDFILES",
+    "SEEDHARDLINKS",
+    "PATHTEMPLATES",
 )
+# Config settings the schema editor doesn't show, kept as they are when a config is re-saved.
+PASSTHROUGH_KEYS = ("SEEDFILES", "SEEDHARDLINKS", "PATHTEMPLATES")
 EMPTY_CONFIG_DATA = {
     "projectName": "",
     "projectPath": "",
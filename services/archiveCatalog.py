@@ -0,0 +1,331 @@
+import os
+import time
+import sqlite3
+import zipfile
+import logging
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from services import archiveManager as ss_archiveManager
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".switch", "archiveCatalog.db")
+CATALOG_VERSION = 1
+MAX_WORKERS = 8
+SEARCH_LIMIT = 500
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archives (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    scanned REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS members (
+    archive INTEGER NOT NULL REFERENCES archives(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    crc INTEGER NOT NULL,
+    sha256 TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS members_name ON members(name);
+CREATE INDEX IF NOT EXISTS members_archive ON members(archive);
+"""
+
+
+@dataclass(frozen=True)
+class CatalogHit:
+    """A member of a catalogued archive."""
+
+    archivePath: str
+    memberPath: str
+    size: int = 0
+    sha256: str = ""
+    source: str = ""
+
+    def name(self):
+        return self.memberPath.rstrip("/").rpartition("/")[2]
+
+
+def _normalize(path):
+    return os.path.abspath(path).replace("\\", "/")
+
+
+def _readArchive(archivePath):
+    """Read an archive's members from its central directory, and their hashes from its manifest
+    if archiveManager wrote one. Runs on a worker thread.
+
+    Returns:
+        tuple(str, list[tuple]): (source, [(path, name, size, crc, sha256)]) None if it can't be read
+    """
+    try:
+        members = ss_archiveManager.listArchive(archivePath)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning("Skipping archive %s: %s", archivePath, e)
+        return None
+
+    hashes = dict()
+    source = ""
+    try:
+        manifest = ss_archiveManager.loadManifest(archivePath)
+    except (OSError, ValueError):
+        pass
+    else:
+        source = manifest.get("source", "")
+        hashes = {entry["path"]: entry["sha256"] for entry in manifest["files"]}
+
+    return source, [
+        (
+            member.path,
+            member.path.rstrip("/").rpartition("/")[2],
+            member.size,
+            member.crc,
+            hashes.get(member.path, ""),
+        )
+        for member in members
+    ]
+
+
+class ArchiveCatalog:
+    def __init__(self, catalogPath=None):
+        """A SQLite index of every archive's members, so finding which archive holds a file
+        doesn't mean opening them all. Archives are only read again when their mtime or size changes.
+
+        Args:
+            catalogPath (str): optional, defaults to CATALOG_PATH, ":memory:" for a throwaway catalog
+        """
+        self.catalogPath = catalogPath or CATALOG_PATH
+        if self.catalogPath != ":memory:":
+            os.makedirs(os.path.dirname(self.catalogPath), exist_ok=True)
+        # Scans run as background jobs while the panel searches, the connection is shared behind a lock.
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.catalogPath, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, CATALOG_VERSION):
+            # It's only a cache, it gets rebuilt by the next scan.
+            logger.warning("Rebuilding archive catalog %s", self.catalogPath)
+            self._db.executescript(
+                "DROP TABLE IF EXISTS members; DROP TABLE IF EXISTS archives;"
+            )
+        self._db.executescript(_SCHEMA)
+        self._db.execute("PRAGMA user_version = {}".format(CATALOG_VERSION))
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _stamps(self, dirPath=None):
+        """
+        Returns:
+            dict: {archive path: (mtime, size)} of the catalogued archives, under dirPath if given
+        """
+        query = "SELECT path, mtime, size FROM archives"
+        args = ()
+        if dirPath is not None:
+            query += " WHERE path LIKE ? ESCAPE '\\'"
+            escaped = (
+                dirPath.rstrip("/")
+                .replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            args = (escaped + "/%",)
+        with self._lock:
+            rows = self._db.execute(query, args).fetchall()
+        return {path: (mtime, size) for path, mtime, size in rows}
+
+    def _store(self, archivePath, stat, source, members):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM archives WHERE path = ?", (archivePath,))
+            archiveId = self._db.execute(
+                "INSERT INTO archives (path, mtime, size, source, scanned) VALUES (?, ?, ?, ?, ?)",
+                (archivePath, stat.st_mtime_ns, stat.st_size, source, time.time()),
+            ).lastrowid
+            self._db.executemany(
+                "INSERT INTO members (archive, path, name, size, crc, sha256) VALUES (?, ?, ?, ?, ?, ?)",
+                [(archiveId,) + member for member in members],
+            )
+
+    def _forget(self, archivePaths):
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM archives WHERE path = ?",
+                [(archivePath,) for archivePath in archivePaths],
+            )
+
+    def addArchives(
+        self, archivePaths, maxWorkers=MAX_WORKERS, progress=None, isCancelled=None
+    ):
+        """Catalog archives, eg: as they're written. Unchanged archives are skipped.
+
+        Args:
+            archivePaths (list[str]):
+            maxWorkers (int):
+            progress (callable): optional, called with (archives read, archives to read)
+            isCancelled (callable): optional
+
+        Returns:
+            int: the number of archives read
+        """
+        stamps = self._stamps()
+        changed = []
+        for archivePath in archivePaths:
+            archivePath = _normalize(archivePath)
+            try:
+                stat = os.stat(archivePath)
+            except OSError:
+                continue
+            if stamps.get(archivePath) != (stat.st_mtime_ns, stat.st_size):
+                changed.append((archivePath, stat))
+
+        read = 0
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            results = executor.map(
+                _readArchive, [archivePath for archivePath, _ in changed]
+            )
+            for (archivePath, stat), result in zip(changed, results):
+                if isCancelled is not None and isCancelled():
+                    break
+                if result is not None:
+                    self._store(archivePath, stat, *result)
+                read += 1
+                if progress is not None:
+                    progress(read, len(changed))
+
+        return read
+
+    def scanDirectory(
+        self, dirPath, maxWorkers=MAX_WORKERS, progress=None, isCancelled=None
+    ):
+        """Bring the catalog up to date with the archives under a folder. Only new and changed
+        archives are read, archives that are gone are dropped.
+
+        Args:
+            dirPath (str):
+            maxWorkers (int):
+            progress (callable): optional, called with (archives read, archives to read)
+            isCancelled (callable): optional
+
+        Returns:
+            int: the number of archives read
+        """
+        dirPath = _normalize(dirPath)
+        found = dict()
+        toVisit = [dirPath]
+        while toVisit:
+            try:
+                with os.scandir(toVisit.pop()) as dirEntries:
+                    for dirEntry in dirEntries:
+                        if dirEntry.is_dir(follow_symlinks=False):
+                            toVisit.append(dirEntry.path)
+                        elif dirEntry.name.lower().endswith(".zip"):
+                            found[_normalize(dirEntry.path)] = dirEntry.stat()
+            except OSError as e:
+                logger.debug("Can not scan %s: %s", dirPath, e)
+
+        stamps = self._stamps(dirPath)
+        self._forget(
+            [archivePath for archivePath in stamps if archivePath not in found]
+        )
+        changed = [
+            archivePath
+            for archivePath, stat in found.items()
+            if stamps.get(archivePath) != (stat.st_mtime_ns, stat.st_size)
+        ]
+
+        read = 0
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            for archivePath, result in zip(
+                changed, executor.map(_readArchive, changed)
+            ):
+                if isCancelled is not None and isCancelled():
+                    break
+                if result is not None:
+                    self._store(archivePath, found[archivePath], *result)
+                read += 1
+                if progress is not None:
+                    progress(read, len(changed))
+
+        logger.info("Scanned %s, %s of %s archives read", dirPath, read, len(found))
+        return read
+
+    def search(self, pattern, dirPath=None, limit=SEARCH_LIMIT):
+        """Find the members named like the pattern. A pattern with * ? or [ is a glob matched
+        against the member's name, anything else matches any part of the name, ignoring case.
+
+        Args:
+            pattern (str): eg: Arachne_v012.ma, Arachne_v*.ma
+            dirPath (str): optional, only search the archives under this folder
+            limit (int):
+
+        Returns:
+            list[CatalogHit]
+        """
+        pattern = pattern.strip()
+        if not pattern:
+            return []
+
+        if any(char in pattern for char in "*?["):
+            where = "members.name GLOB ?"
+            args = [pattern]
+        else:
+            escaped = (
+                pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            where = "members.name LIKE ? ESCAPE '\\'"
+            args = ["%{}%".format(escaped)]
+
+        if dirPath is not None:
+            escaped = (
+                _normalize(dirPath)
+                .rstrip("/")
+                .replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            where += " AND archives.path LIKE ? ESCAPE '\\'"
+            args.append(escaped + "/%")
+
+        query = (
+            "SELECT archives.path, members.path, members.size, members.sha256, archives.source "
+            "FROM members JOIN archives ON members.archive = archives.id "
+            "WHERE {} ORDER BY members.name, archives.path LIMIT ?".format(where)
+        )
+        with self._lock:
+            rows = self._db.execute(query, args + [limit]).fetchall()
+        return [CatalogHit(*row) for row in rows]
+
+    def archives(self):
+        """
+        Returns:
+            list[str]: the catalogued archive paths
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path FROM archives ORDER BY path"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def members(self, archivePath):
+        """
+        Args:
+            archivePath (str):
+
+        Returns:
+            list[CatalogHit]: the archive's members
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT archives.path, members.path, members.size, members.sha256, archives.source "
+                "FROM members JOIN archives ON members.archive = archives.id "
+                "WHERE archives.path = ? ORDER BY members.path",
+                (_normalize(archivePath),),
+            ).fetchall()
+        return [CatalogHit(*row) for row in rows]
@@ -1,17 +1,259 @@
 import os, sys
+import json
+import time
+import zlib
+import fnmatch
+import hashlib
+import shutil
 import logging
 import zipfile
+import threading
+from collections import deque
+from functools import partial
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import widgets.utils as widgetUtils
+from services import archiveStore as ss_archiveStore
 
 logger = logging.getLogger(__name__)
 
+COMPRESSION = {
+    "store": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+DEFAULT_COMPRESSION = "deflate"
+MAX_WORKERS = os.cpu_count() or 4
+# Files this size or bigger are streamed into the archive one at a time instead of compressed in memory.
+LARGE_FILE_SIZE = 32 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+# Folders archived at once by archiveFolders, the cores are shared out between them.
+FOLDER_WORKERS = 4
+# Seconds between the progress reports of a single folder.
+REPORT_INTERVAL = 0.25
+# Written next to each folder archive, eg: assets_Character_Arachne.zip.manifest.json
+MANIFEST_EXT = ".manifest.json"
+MANIFEST_VERSION = 1
+# Completed members of a resumable archive, one json line each, eg: Arachne.zip.checkpoint
+CHECKPOINT_EXT = ".checkpoint"
+CHECKPOINT_VERSION = 1
+# The ZipInfo fields a checkpoint keeps to rebuild the zip's central directory on resume.
+_ZINFO_FIELDS = (
+    "filename",
+    "compress_type",
+    "flag_bits",
+    "external_attr",
+    "internal_attr",
+    "CRC",
+    "compress_size",
+    "file_size",
+    "header_offset",
+    "create_system",
+    "create_version",
+    "extract_version",
+    "volume",
+)
+# What archiveFolders writes, a zip per folder or a deduplicating archiveStore beside them.
+BACKENDS = ("zip", "store")
+DEFAULT_BACKEND = "zip"
+STORE_DIRNAME = "archiveStore"
+# Members are restored to <path>.part and renamed once complete.
+PART_EXT = ".part"
+# {abspath: ((st_mtime_ns, st_size), tuple(ArchiveMember))} see listArchive
+_LISTINGS = dict()
+_LISTINGS_LOCK = threading.Lock()
 
-def archiveFile(inFilePath, outFilePath):
+
+@dataclass
+class FolderProgress:
+    """Where a folder's archiving is up to, reported as it runs and once when it ends."""
+
+    inDirPath: str
+    outFilePath: str
+    state: str = "queued"  # queued, running, verifying, done, failed, cancelled
+    files: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+
+    def throughput(self):
+        """
+        Returns:
+            float: bytes per second
+        """
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class RestoreProgress:
+    """Where an archive's restore is up to, reported as it runs and once when it ends."""
+
+    inFilePath: str
+    rootDir: str
+    state: str = "queued"  # queued, running, done, failed, cancelled
+    files: int = 0
+    bytes: int = 0
+    totalFiles: int = 0
+    totalBytes: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+
+    def throughput(self):
+        """
+        Returns:
+            float: bytes per second
+        """
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class VerifyResult:
+    """What verifyArchive found, an archive is only safe to delete the source of if ok."""
+
+    outFilePath: str
+    files: int = 0
+    bytes: int = 0
+    errors: list = field(default_factory=list)
+
+    def ok(self):
+        return not self.errors
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """A file or folder in an archive, as listed in the zip's central directory."""
+
+    path: str
+    size: int = 0
+    compressSize: int = 0
+    crc: int = 0
+    isDir: bool = False
+    dateTime: tuple = (1980, 1, 1, 0, 0, 0)
+
+
+def _getCompressType(compression):
+    try:
+        return COMPRESSION[compression]
+    except KeyError:
+        raise ValueError(
+            "Unknown compression {}, use one of {}".format(
+                compression, ", ".join(COMPRESSION)
+            )
+        ) from None
+
+
+def _iterMembers(inDirPath, arcRoot):
+    """Yield the files, and the empty folders, to archive. Folders are walked in a stable order.
+
+    Yields:
+        tuple(str, str, bool, int): (path, arcname, isDir, size)
+    """
+    for root, dirs, files in os.walk(inDirPath, topdown=True):
+        dirs.sort()
+        if not dirs and not files:
+            yield root, os.path.relpath(root, arcRoot), True, 0
+            continue
+
+        for fileName in sorted(files):
+            fp = os.path.join(root, fileName)
+            yield fp, os.path.relpath(fp, arcRoot), False, os.path.getsize(fp)
+
+
+def _memberEntry(zinfo, stat, digest):
+    return {
+        "path": zinfo.filename,
+        "size": zinfo.file_size,
+        "mtime": stat.st_mtime,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def _compressMember(filepath, arcname, compressType, compressLevel):
+    """Compress a whole file in memory, runs on a worker thread.
+    zlib, bz2 and lzma release the GIL while compressing so threads use every core.
+
+    Returns:
+        tuple(ZipInfo, bytes, dict): the member's header info, its compressed data and manifest entry
+    """
+    stat = os.stat(filepath)
+    zinfo = zipfile.ZipInfo.from_file(filepath, arcname)
+    zinfo.compress_type = compressType
+    if compressType == zipfile.ZIP_LZMA:
+        # Compressed data includes an end-of-stream (EOS) marker
+        zinfo.flag_bits |= 0x02
+
+    compressor = zipfile._get_compressor(compressType, compressLevel)
+    digest = hashlib.sha256()
+    chunks = []
+    crc = 0
+    size = 0
+    with open(filepath, "rb") as infile:
+        while True:
+            data = infile.read(READ_SIZE)
+            if not data:
+                break
+            size += len(data)
+            crc = zlib.crc32(data, crc)
+            digest.update(data)
+            chunks.append(compressor.compress(data) if compressor else data)
+
+    if compressor is not None:
+        chunks.append(compressor.flush())
+
+    raw = b"".join(chunks)
+    zinfo.file_size = size
+    zinfo.CRC = crc
+    zinfo.compress_size = len(raw)
+    return zinfo, raw, _memberEntry(zinfo, stat, digest)
+
+
+def _streamMember(myzip, filepath, arcname, compressType, compressLevel):
+    """Stream a large file into the archive, hashing it on the way.
+
+    Returns:
+        dict: the member's manifest entry
+    """
+    stat = os.stat(filepath)
+    zinfo = zipfile.ZipInfo.from_file(filepath, arcname)
+    zinfo.compress_type = compressType
+    zinfo._compresslevel = compressLevel
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as infile, myzip.open(zinfo, "w") as outfile:
+        while True:
+            data = infile.read(READ_SIZE)
+            if not data:
+                break
+            digest.update(data)
+            outfile.write(data)
+
+    return _memberEntry(zinfo, stat, digest)
+
+
+def _writeCompressed(myzip, zinfo, raw):
+    """Write an already compressed member, the same way ZipFile.write lays it out."""
+    with myzip._lock:
+        myzip.fp.seek(myzip.start_dir)
+        zinfo.header_offset = myzip.fp.tell()
+        myzip._writecheck(zinfo)
+        myzip._didModify = True
+        myzip.fp.write(zinfo.FileHeader())
+        myzip.fp.write(raw)
+        myzip.filelist.append(zinfo)
+        myzip.NameToInfo[zinfo.filename] = zinfo
+        myzip.start_dir = myzip.fp.tell()
+
+
+def archiveFile(
+    inFilePath, outFilePath, compression=DEFAULT_COMPRESSION, compressLevel=None
+):
     """Archive a file to zip.
 
     Args:
         inFilePath (str): full file path including ext of the file to archive.
         outFilePath (str): full file path including ext to archive to.
+        compression (str): one of COMPRESSION
+        compressLevel (int): optional, see zipfile.ZipFile
 
     Returns:
         bool: success or fail
@@ -26,18 +268,451 @@ def archiveFile(inFilePath, outFilePath):
         widgetUtils.errorWidget(title="File already exists.", message=message)
         return False
 
-    with zipfile.ZipFile(outFilePath, "w") as myzip:
-        myzip.write(inFilePath)
+    with zipfile.ZipFile(
+        outFilePath,
+        "w",
+        compression=_getCompressType(compression),
+        compresslevel=compressLevel,
+    ) as myzip:
+        myzip.write(inFilePath, os.path.basename(inFilePath))
 
     return True
 
 
-def archiveFolder(inDirPath, outFilePath):
-    """Archive a folder to zip.
+def manifestPath(outFilePath):
+    """
+    Args:
+        outFilePath (str): the archive's path
+
+    Returns:
+        str: the path of the archive's manifest
+    """
+    return outFilePath + MANIFEST_EXT
+
+
+def loadManifest(outFilePath):
+    """Load the manifest archiveFolder wrote next to the archive.
+
+    Args:
+        outFilePath (str): the archive's path
+
+    Returns:
+        dict: {"source", "arcRoot", "files": [{"path", "size", "mtime", "sha256"}], "dirs", ...}
+    """
+    with open(manifestPath(outFilePath)) as infile:
+        return json.load(infile)
+
+
+def _writeJson(filepath, data):
+    tmpPath = "{}.{}.tmp".format(filepath, os.getpid())
+    with open(tmpPath, "w") as outfile:
+        json.dump(data, outfile, indent=1)
+    os.replace(tmpPath, filepath)
+
+
+def volumePath(outFilePath, number):
+    """
+    Args:
+        outFilePath (str): the archive's path eg: Arachne.zip
+        number (int): from 1
+
+    Returns:
+        str: the path of a volume of a split archive eg: Arachne.001.zip
+    """
+    root, ext = os.path.splitext(outFilePath)
+    return "{}.{:03d}{}".format(root, number, ext)
+
+
+def indexPath(outFilePath):
+    """
+    Args:
+        outFilePath (str): the archive's path eg: Arachne.zip
+
+    Returns:
+        str: the path of a split archive's index eg: Arachne.index.json
+    """
+    return "{}.index.json".format(os.path.splitext(outFilePath)[0])
+
+
+def loadIndex(outFilePath):
+    """Load a split archive's index.
+
+    Args:
+        outFilePath (str): the archive's path, not a volume's
+
+    Returns:
+        dict: {"volumes": [volume file names], "members": {member path: volume number}, ...}
+    """
+    with open(indexPath(outFilePath)) as infile:
+        return json.load(infile)
+
+
+def volumePaths(outFilePath):
+    """
+    Args:
+        outFilePath (str): the archive's path
+
+    Returns:
+        list[str]: the volumes of a split archive, or just outFilePath
+    """
+    if os.path.isfile(outFilePath) or not os.path.isfile(indexPath(outFilePath)):
+        return [outFilePath]
+
+    dirPath = os.path.dirname(outFilePath)
+    return [os.path.join(dirPath, name) for name in loadIndex(outFilePath)["volumes"]]
+
+
+def checkpointPath(outFilePath):
+    """
+    Args:
+        outFilePath (str): the archive's path
+
+    Returns:
+        str: the path of the archive's checkpoint, see archiveFolder(checkpoint=True)
+    """
+    return outFilePath + CHECKPOINT_EXT
+
+
+def _zinfoRecord(zinfo):
+    record = {name: getattr(zinfo, name) for name in _ZINFO_FIELDS}
+    record["date_time"] = list(zinfo.date_time)
+    record["extra"] = zinfo.extra.hex()
+    record["comment"] = zinfo.comment.hex()
+    return record
+
+
+def _zinfoFromRecord(record):
+    zinfo = zipfile.ZipInfo(record["filename"], tuple(record["date_time"]))
+    for name in _ZINFO_FIELDS:
+        setattr(zinfo, name, record[name])
+    zinfo.extra = bytes.fromhex(record["extra"])
+    zinfo.comment = bytes.fromhex(record["comment"])
+    return zinfo
+
+
+def loadCheckpoint(outFilePath):
+    """Read an interrupted archive's checkpoint. A line cut short by a crash, and any member
+    whose data didn't make it to disk, is left out so it's archived again.
+
+    Args:
+        outFilePath (str): the archive's path
+
+    Returns:
+        tuple(dict, list[dict]): (settings, records) settings is None if the checkpoint is unusable
+    """
+    records = []
+    settings = None
+    sizes = dict()
+    with open(checkpointPath(outFilePath)) as infile:
+        for line in infile:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if settings is None:
+                if record.get("checkpoint") != CHECKPOINT_VERSION:
+                    return None, []
+                settings = record
+                continue
+
+            number = record.get("volume")
+            if number is not None and number not in sizes:
+                path = (
+                    volumePath(outFilePath, number)
+                    if settings["maxVolumeSize"]
+                    else outFilePath
+                )
+                sizes[number] = os.path.getsize(path) if os.path.isfile(path) else -1
+            if number is not None and record["end"] > sizes[number]:
+                break
+            records.append(record)
+
+    return settings, records
+
+
+def _removeStale(outFilePath):
+    """Remove what's left of an archive whose checkpoint can't be resumed from."""
+    paths = [checkpointPath(outFilePath), outFilePath, indexPath(outFilePath)]
+    number = 1
+    while os.path.isfile(volumePath(outFilePath, number)):
+        paths.append(volumePath(outFilePath, number))
+        number += 1
+    for path in paths:
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def _archiveExists(outFilePath):
+    return os.path.exists(outFilePath) or os.path.exists(indexPath(outFilePath))
+
+
+class _Volumes:
+    # Local and central headers of a member, including a zip64 extra.
+    ENTRY_OVERHEAD = 128
+
+    def __init__(
+        self,
+        outFilePath,
+        manifest,
+        compressType,
+        compressLevel,
+        maxVolumeSize=None,
+        checkpoint=False,
+    ):
+        """Hands archiveFolder the zip to write each member to. With a maxVolumeSize a new volume
+        is started before a member would take the current one past it, each volume is a whole zip
+        with its own manifest and an index maps the members to their volumes.
+
+        Args:
+            outFilePath (str):
+            manifest (dict): the fields every volume's manifest starts with
+            compressType (int):
+            compressLevel (int):
+            maxVolumeSize (int): optional, bytes
+            checkpoint (bool): record each member in a checkpoint as it's written, see resume
+        """
+        self.outFilePath = outFilePath
+        self.maxVolumeSize = maxVolumeSize
+        self._manifest = manifest
+        self._compressType = compressType
+        self._compressLevel = compressLevel
+        self.paths = []
+        self.manifests = []
+        self.myzip = None
+        self._fp = None
+        self._centralSize = 0
+        self._checkpoint = None
+        if checkpoint:
+            self._checkpoint = open(checkpointPath(outFilePath), "a")
+            if not self._checkpoint.tell():
+                self._record(
+                    dict(
+                        checkpoint=CHECKPOINT_VERSION,
+                        maxVolumeSize=maxVolumeSize,
+                        **manifest
+                    )
+                )
+
+    def _record(self, record):
+        self._checkpoint.write(json.dumps(record) + "\n")
+        self._checkpoint.flush()
+
+    def resume(self, records):
+        """Pick up from a checkpoint. Finished volumes are kept, the last volume is cut back to the
+        end of its last recorded member and its central directory rebuilt from the records.
+
+        Args:
+            records (list[dict]): see loadCheckpoint
+
+        Returns:
+            set(str): the member names already archived
+        """
+        volumes = dict()
+        for record in records:
+            if "closed" not in record:
+                volumes.setdefault(record["volume"], []).append(record)
+        if not volumes:
+            return set()
+
+        for number in sorted(volumes):
+            self._addVolume(number)
+            for record in volumes[number]:
+                self.added(record.get("entry"), record.get("dir"))
+
+        # Reopen the last volume where it left off, the way ZipFile(mode="w") would have it.
+        lastRecords = volumes[max(volumes)]
+        self._fp = open(self.paths[-1], "r+b")
+        self._fp.truncate(lastRecords[-1]["end"])
+        self._fp.seek(lastRecords[-1]["end"])
+        self.myzip = zipfile.ZipFile(
+            self._fp,
+            "w",
+            compression=self._compressType,
+            compresslevel=self._compressLevel,
+        )
+        for record in lastRecords:
+            zinfo = _zinfoFromRecord(record["zinfo"])
+            self.myzip.filelist.append(zinfo)
+            self.myzip.NameToInfo[zinfo.filename] = zinfo
+            self._centralSize += self._overhead(zinfo.filename) // 2
+
+        return {
+            record["zinfo"]["filename"]
+            for volumeRecords in volumes.values()
+            for record in volumeRecords
+        }
+
+    def _addVolume(self, number):
+        if self.maxVolumeSize:
+            path = volumePath(self.outFilePath, number)
+        else:
+            path = self.outFilePath
+        self.paths.append(path)
+        self.manifests.append(
+            dict(self._manifest, archive=os.path.basename(path), files=[], dirs=[])
+        )
+        return path
+
+    def _overhead(self, arcname):
+        return self.ENTRY_OVERHEAD + 2 * len(arcname.encode("utf-8"))
+
+    def _open(self):
+        if self.myzip is not None:
+            self.closeVolume()
+            if self._checkpoint is not None:
+                self._record({"closed": len(self.paths)})
+
+        path = self._addVolume(len(self.paths) + 1)
+        self.myzip = zipfile.ZipFile(
+            path, "w", compression=self._compressType, compresslevel=self._compressLevel
+        )
+        self._centralSize = 0
+
+    def zipFor(self, arcname, size):
+        """
+        Args:
+            arcname (str):
+            size (int): the member's compressed size, or its file size if it's still to be compressed
+
+        Returns:
+            ZipFile: to write the member to
+        """
+        overhead = self._overhead(arcname)
+        if self.myzip is None or (
+            self.maxVolumeSize
+            and self.myzip.filelist
+            and self.myzip.start_dir + self._centralSize + overhead + size
+            > self.maxVolumeSize
+        ):
+            self._open()
+        self._centralSize += overhead // 2
+        return self.myzip
+
+    def added(self, entry=None, dirName=None, zinfo=None):
+        """
+        Args:
+            entry (dict): the manifest entry of a file
+            dirName (str): the name of an empty folder
+            zinfo (ZipInfo): the member just written, recorded in the checkpoint
+        """
+        if entry is not None:
+            self.manifests[-1]["files"].append(entry)
+        if dirName is not None:
+            self.manifests[-1]["dirs"].append(dirName)
+        if zinfo is None or self._checkpoint is None:
+            return
+
+        # The member's data has to reach the file before the checkpoint says it's there.
+        self.myzip.fp.flush()
+        record = {
+            "volume": len(self.paths),
+            "end": self.myzip.start_dir,
+            "zinfo": _zinfoRecord(zinfo),
+        }
+        if entry is not None:
+            record["entry"] = entry
+        if dirName is not None:
+            record["dir"] = dirName
+        self._record(record)
+
+    def closeVolume(self):
+        if self.myzip is not None:
+            self.myzip.close()
+            self.myzip = None
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def suspend(self):
+        """Close what's open but keep the archive and checkpoint to resume from."""
+        try:
+            self.closeVolume()
+        finally:
+            self._checkpoint.close()
+
+    def close(self):
+        """Close the last volume and write the manifests, and the index of a split archive."""
+        if self.myzip is None and not self.paths:
+            self._open()
+        self.closeVolume()
+        for path, manifest in zip(self.paths, self.manifests):
+            _writeJson(manifestPath(path), manifest)
+
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+            os.remove(checkpointPath(self.outFilePath))
+
+        if not self.maxVolumeSize:
+            return
+
+        members = dict()
+        for number, manifest in enumerate(self.manifests, 1):
+            members.update((entry["path"], number) for entry in manifest["files"])
+            members.update((dirName, number) for dirName in manifest["dirs"])
+        index = dict(
+            self._manifest,
+            archive=os.path.basename(self.outFilePath),
+            maxVolumeSize=self.maxVolumeSize,
+            volumes=[os.path.basename(path) for path in self.paths],
+            members=members,
+        )
+        _writeJson(indexPath(self.outFilePath), index)
+
+    def remove(self):
+        """Close and remove everything written so far."""
+        try:
+            self.closeVolume()
+        finally:
+            paths = [indexPath(self.outFilePath)] if self.maxVolumeSize else []
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+                paths.append(checkpointPath(self.outFilePath))
+            for path in self.paths:
+                paths.extend([path, manifestPath(path)])
+            for path in paths:
+                if os.path.isfile(path):
+                    os.remove(path)
+
+
+def archiveFolder(
+    inDirPath,
+    outFilePath,
+    compression=DEFAULT_COMPRESSION,
+    compressLevel=None,
+    arcRoot=None,
+    maxWorkers=MAX_WORKERS,
+    progress=None,
+    isCancelled=None,
+    maxVolumeSize=None,
+    checkpoint=False,
+    paths=None,
+):
+    """Archive a folder to zip. Files are compressed in parallel and written in order,
+    only a few are held in memory at once and files of LARGE_FILE_SIZE or more are streamed in.
+    A manifest with each file's size, mtime and sha256 is written next to the archive, see verifyArchive.
+
+    With a maxVolumeSize the archive is split into volumes eg: Arachne.001.zip, Arachne.002.zip
+    and an Arachne.index.json mapping members to volumes. Every volume is a zip of its own that can be
+    verified and restored without the others. A streamed file's volume is picked on its uncompressed
+    size and a file bigger than maxVolumeSize gets a volume to itself.
+
+    With checkpoint each member is recorded in <outFilePath>.checkpoint as it's written. A crash or
+    cancel leaves the archive and checkpoint behind and archiving the folder again resumes from the
+    last good member, using the settings it was started with.
 
     Args:
         inDirPath (str): full dir path of the dir to archive.
         outFilePath (str): full zip path to archive to.
+        compression (str): one of COMPRESSION
+        compressLevel (int): optional, see zipfile.ZipFile
+        arcRoot (str): member names are relative to this, defaults to the parent of inDirPath
+            so the archive holds the folder itself. eg: the project path to restore it back in place.
+        maxWorkers (int):
+        progress (callable): optional, called with (files, bytes) archived so far
+        isCancelled (callable): optional, returning True stops and removes the partial archive
+        maxVolumeSize (int): optional, bytes, split the archive into volumes of up to this size
+        checkpoint (bool): make the archive resumable
+        paths (set[str]): optional, only archive these member names eg: the changed files, see updateArchive
 
     Returns:
         bool: success or fail
@@ -46,26 +721,1072 @@ def archiveFolder(inDirPath, outFilePath):
         logger.info("Directory path %s does not exist!", inDirPath)
         return False
 
-    if os.path.isfile(outFilePath):
+    compressType = _getCompressType(compression)
+    settings = None
+    records = []
+    if checkpoint and os.path.isfile(checkpointPath(outFilePath)):
+        settings, records = loadCheckpoint(outFilePath)
+        if settings is None:
+            logger.warning("Starting %s over, its checkpoint is unusable.", outFilePath)
+            _removeStale(outFilePath)
+    elif _archiveExists(outFilePath):
         message = "Can not archive this file as file already exists on disk. \nPlease remove existing an try again."
         widgetUtils.errorWidget(title="File exists.", message=message)
         return False
 
-    with zipfile.ZipFile(outFilePath, "w") as myzip:
-        for root, _, files in os.walk(inDirPath, topdown=True):
-            for file in files:
-                fp = os.path.join(root, file)
-                myzip.write(fp)
+    if settings is not None:
+        logger.info("Resuming %s from its checkpoint.", outFilePath)
+        arcRoot = settings["arcRoot"]
+        maxVolumeSize = settings["maxVolumeSize"]
+        manifest = {
+            key: settings[key] for key in ("version", "source", "arcRoot", "created")
+        }
+    else:
+        arcRoot = arcRoot or os.path.dirname(os.path.abspath(inDirPath))
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "source": os.path.abspath(inDirPath).replace("\\", "/"),
+            "arcRoot": os.path.abspath(arcRoot).replace("\\", "/"),
+            "created": time.time(),
+        }
+
+    maxPending = maxWorkers * 2
+    cancelled = False
+    volumes = _Volumes(
+        outFilePath,
+        manifest,
+        compressType,
+        compressLevel,
+        maxVolumeSize=maxVolumeSize,
+        checkpoint=checkpoint,
+    )
+    done = volumes.resume(records)
+    archived = [
+        len(done),
+        sum(
+            entry["size"]
+            for volumeManifest in volumes.manifests
+            for entry in volumeManifest["files"]
+        ),
+    ]
+
+    def written(zinfo, entry=None, dirName=None):
+        volumes.added(entry, dirName, zinfo=zinfo)
+        archived[0] += 1
+        if entry is not None:
+            archived[1] += entry["size"]
+        if progress is not None:
+            progress(archived[0], archived[1])
+
+    try:
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            pending = deque()
+
+            def drain(limit):
+                while len(pending) > limit:
+                    zinfo, raw, entry = pending.popleft().result()
+                    _writeCompressed(
+                        volumes.zipFor(zinfo.filename, len(raw)), zinfo, raw
+                    )
+                    written(zinfo, entry)
+
+            for path, arcname, isDir, size in _iterMembers(inDirPath, arcRoot):
+                if isCancelled is not None and isCancelled():
+                    logger.info("Archiving %s cancelled.", inDirPath)
+                    for future in pending:
+                        future.cancel()
+                    pending.clear()
+                    cancelled = True
+                    break
+
+                name = arcname.replace(os.path.sep, "/") + ("/" if isDir else "")
+                if name in done or (paths is not None and name not in paths):
+                    continue
+
+                if not isDir and size < LARGE_FILE_SIZE:
+                    pending.append(
+                        executor.submit(
+                            _compressMember, path, arcname, compressType, compressLevel
+                        )
+                    )
+                    drain(maxPending)
+                    continue
+
+                # Keep the archive in walk order, write what's queued first.
+                drain(0)
+                myzip = volumes.zipFor(arcname, size)
+                if isDir:
+                    myzip.write(path, arcname)
+                    written(myzip.filelist[-1], dirName=myzip.filelist[-1].filename)
+                    continue
+                entry = _streamMember(myzip, path, arcname, compressType, compressLevel)
+                written(myzip.filelist[-1], entry)
+
+            drain(0)
+
+        if not cancelled:
+            volumes.close()
+    except BaseException:
+        if not checkpoint:
+            volumes.remove()
+            raise
+        # Keep what's archived to resume from.
+        try:
+            volumes.suspend()
+        except Exception as e:
+            logger.warning("Failed to close %s: %s", outFilePath, e)
+        raise
+
+    if cancelled:
+        if checkpoint:
+            volumes.suspend()
+        else:
+            volumes.remove()
+        return False
 
     return True
 
 
-def restoreFile(inFilePath, rootDir):
+def _shareMembers(members, count, sizeOf):
+    """Split members between workers by size. Biggest first onto the least loaded worker,
+    so no worker is left with all the big files.
+
+    Returns:
+        list[list]: at least one share, none of them empty unless members is
+    """
+    shares = [[0, []] for _ in range(max(1, min(count, len(members))))]
+    for member in sorted(members, key=sizeOf, reverse=True):
+        share = min(shares, key=lambda share: share[0])
+        share[0] += sizeOf(member)
+        share[1].append(member)
+
+    return [shareMembers for _, shareMembers in shares]
+
+
+def _verifyMembers(members, isCancelled):
+    """Stream some of the archive's members through sha256, runs on a worker thread with its own ZipFiles.
+
+    Args:
+        members (list[tuple(str, dict)]): (volume path, manifest entry)
+
+    Returns:
+        tuple(int, int, list[str]): (files, bytes, errors)
+    """
+    files = 0
+    size = 0
+    errors = []
+    zips = dict()
+    try:
+        for path, member in members:
+            if isCancelled is not None and isCancelled():
+                break
+
+            myzip = zips.get(path)
+            if myzip is None:
+                myzip = zips[path] = zipfile.ZipFile(path)
+
+            digest = hashlib.sha256()
+            try:
+                # ZipExtFile also checks the CRC once the member is read to the end.
+                with myzip.open(member["path"]) as infile:
+                    while True:
+                        data = infile.read(READ_SIZE)
+                        if not data:
+                            break
+                        digest.update(data)
+            except (zipfile.BadZipFile, OSError, EOFError, zlib.error) as e:
+                errors.append("{} is damaged: {}".format(member["path"], e))
+                continue
+
+            if digest.hexdigest() != member["sha256"]:
+                errors.append("{} doesn't match its hash".format(member["path"]))
+                continue
+            files += 1
+            size += member["size"]
+    finally:
+        for myzip in zips.values():
+            myzip.close()
+
+    return files, size, errors
+
+
+def _checkSource(inDirPath, arcRoot, entries):
+    """Every file in the source has to be in the manifest, unchanged since it was archived.
+
+    Args:
+        inDirPath (str):
+        arcRoot (str):
+        entries (list[dict]): the manifest's files
+
+    Returns:
+        list[str]: errors
+    """
+    errors = []
+    members = {member["path"]: member for member in entries}
+    for path, arcname, isDir, size in _iterMembers(inDirPath, arcRoot):
+        if isDir:
+            continue
+        member = members.get(arcname.replace(os.path.sep, "/"))
+        if member is None:
+            errors.append("{} isn't in the archive".format(path))
+        elif member["size"] != size or member["mtime"] != os.path.getmtime(path):
+            errors.append("{} changed since it was archived".format(path))
+
+    return errors
+
+
+def verifyArchive(
+    outFilePath, inDirPath=None, maxWorkers=MAX_WORKERS, isCancelled=None
+):
+    """Check an archive against its manifest without extracting anything.
+    Members are split between the workers by size, each worker streams its share out of its own ZipFile
+    and compares the sha256. Given the source folder, its files are checked against the manifest too.
+    Every volume of a split archive is checked, or pass a volume's path to check just that one.
+
+    Args:
+        outFilePath (str): the archive's path
+        inDirPath (str): optional, the folder that was archived
+        maxWorkers (int):
+        isCancelled (callable): optional, a cancelled verification is never ok
+
+    Returns:
+        VerifyResult
+    """
+    result = VerifyResult(outFilePath)
+    members = []
+    entries = []
+    arcRoot = None
+    try:
+        for path in volumePaths(outFilePath):
+            manifest = loadManifest(path)
+            arcRoot = manifest["arcRoot"]
+            with zipfile.ZipFile(path) as myzip:
+                infos = {zinfo.filename: zinfo for zinfo in myzip.infolist()}
+
+            for member in manifest["files"]:
+                entries.append(member)
+                zinfo = infos.get(member["path"])
+                if zinfo is None:
+                    result.errors.append(
+                        "{} is missing from {}".format(member["path"], path)
+                    )
+                elif zinfo.file_size != member["size"]:
+                    result.errors.append("{} has the wrong size".format(member["path"]))
+                else:
+                    members.append((path, member))
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        result.errors.append("Can not read {}: {}".format(outFilePath, e))
+        return result
+
+    if inDirPath is not None:
+        result.errors.extend(_checkSource(inDirPath, arcRoot, entries))
+    if result.errors:
+        return result
+
+    shares = _shareMembers(members, maxWorkers, lambda member: member[1]["size"])
+    with ThreadPoolExecutor(max_workers=len(shares)) as executor:
+        futures = [
+            executor.submit(_verifyMembers, shareMembers, isCancelled)
+            for shareMembers in shares
+        ]
+        for future in futures:
+            files, size, errors = future.result()
+            result.files += files
+            result.bytes += size
+            result.errors.extend(errors)
+
+    if isCancelled is not None and isCancelled():
+        result.errors.append("Verifying {} cancelled".format(outFilePath))
+
+    return result
+
+
+def storeFor(outFilePath, compression=DEFAULT_COMPRESSION):
+    """
+    Args:
+        outFilePath (str): the archive's path
+        compression (str): a new store is zlib compressed unless this is store
+
+    Returns:
+        ArchiveStore: the store beside outFilePath that archiveFolders(backend="store") archives to
+    """
+    return ss_archiveStore.ArchiveStore(
+        os.path.join(os.path.dirname(outFilePath), STORE_DIRNAME),
+        compress=compression != "store",
+    )
+
+
+def storeName(outFilePath):
+    """
+    Args:
+        outFilePath (str): the archive's path
+
+    Returns:
+        str: the name of its manifest in the store, eg: assets_Character_Arachne
+    """
+    name = os.path.basename(outFilePath)
+    return name[: -len(".zip")] if name.lower().endswith(".zip") else name
+
+
+def _storeFolder(
+    inDirPath,
+    outFilePath,
+    arcRoot=None,
+    compression=DEFAULT_COMPRESSION,
+    maxWorkers=MAX_WORKERS,
+    progress=None,
+    isCancelled=None,
+    **kwargs
+):
+    """Archive a folder into the store beside outFilePath, see archiveFolders(backend="store").
+    Volumes and checkpoints are zip only, a store only ever writes what it doesn't already hold.
+
+    Returns:
+        bool: False if cancelled or inDirPath does not exist
+    """
+    if not os.path.isdir(inDirPath):
+        return False
+
+    store = storeFor(outFilePath, compression)
+    name = storeName(outFilePath)
+    if name in store.manifests():
+        raise ValueError("{} already exists in {}!".format(name, store.storeDir))
+
+    manifest = store.archiveFolder(
+        inDirPath,
+        name,
+        arcRoot=arcRoot,
+        maxWorkers=maxWorkers,
+        progress=progress,
+        isCancelled=isCancelled,
+    )
+    return manifest is not None
+
+
+def _archiveFolderReported(
+    inDirPath,
+    outFilePath,
+    arcRoot,
+    removeSource,
+    callback,
+    isCancelled,
+    backend=DEFAULT_BACKEND,
+    **kwargs
+):
+    report = FolderProgress(inDirPath, outFilePath, state="running")
+    resuming = kwargs.get("checkpoint") and os.path.isfile(checkpointPath(outFilePath))
+    if backend == "zip" and _archiveExists(outFilePath) and not resuming:
+        # Checked here as archiveFolder would pop up a dialog from this worker thread.
+        report.state = "failed"
+        report.error = "{} already exists!".format(outFilePath)
+        callback(report)
+        return report
+
+    start = time.perf_counter()
+    lastReport = [0.0]
+
+    def folderProgress(files, size):
+        report.files = files
+        report.bytes = size
+        report.elapsed = time.perf_counter() - start
+        if report.elapsed - lastReport[0] >= REPORT_INTERVAL:
+            lastReport[0] = report.elapsed
+            callback(report)
+
+    callback(report)
+    try:
+        archive = _storeFolder if backend == "store" else archiveFolder
+        success = archive(
+            inDirPath,
+            outFilePath,
+            arcRoot=arcRoot,
+            progress=folderProgress,
+            isCancelled=isCancelled,
+            **kwargs
+        )
+        if success and removeSource:
+            # Only ever delete a source the archive is known to hold.
+            report.state = "verifying"
+            callback(report)
+            maxWorkers = kwargs.get("maxWorkers", MAX_WORKERS)
+            if backend == "store":
+                errors = storeFor(outFilePath).verify(
+                    storeName(outFilePath),
+                    maxWorkers=maxWorkers,
+                    isCancelled=isCancelled,
+                )
+            else:
+                errors = verifyArchive(
+                    outFilePath,
+                    inDirPath=inDirPath,
+                    maxWorkers=maxWorkers,
+                    isCancelled=isCancelled,
+                ).errors
+            if errors:
+                raise ValueError(
+                    "Verification failed, {} was kept: {}".format(inDirPath, errors[0])
+                )
+            shutil.rmtree(inDirPath)
+    except Exception as e:
+        logger.error("Failed to archive %s: %s", inDirPath, e)
+        report.state = "failed"
+        report.error = str(e)
+    else:
+        if success:
+            report.state = "done"
+        elif isCancelled is not None and isCancelled():
+            report.state = "cancelled"
+        else:
+            report.state = "failed"
+            report.error = "{} does not exist!".format(inDirPath)
+
+    report.elapsed = time.perf_counter() - start
+    callback(report)
+    return report
+
+
+def archiveFolders(
+    folders,
+    maxWorkers=FOLDER_WORKERS,
+    compression=DEFAULT_COMPRESSION,
+    compressLevel=None,
+    removeSource=False,
+    callback=None,
+    progress=None,
+    isCancelled=None,
+    maxVolumeSize=None,
+    checkpoint=False,
+    backend=DEFAULT_BACKEND,
+):
+    """Archive several folders at once. Each folder gets an equal share of the cores for compressing.
+
+    Args:
+        folders (list[tuple(str, str, str)]): (inDirPath, outFilePath, arcRoot) arcRoot may be None, see archiveFolder
+        maxWorkers (int): folders archived at once
+        compression (str): one of COMPRESSION
+        compressLevel (int): optional
+        removeSource (bool): delete each folder once it's archived
+        callback (callable): optional, called with a FolderProgress as each folder starts, every REPORT_INTERVAL while it runs and when it ends
+        progress (callable): optional, called with (finished, total) folders
+        isCancelled (callable): optional
+        maxVolumeSize (int): optional, split each archive into volumes, see archiveFolder
+        checkpoint (bool): make each archive resumable, see archiveFolder
+        backend (str): one of BACKENDS, store archives each folder into the ArchiveStore beside its outFilePath
+            (see storeFor) under the name of the zip it would have been (see storeName)
+
+    Returns:
+        list[FolderProgress]: in the order of folders
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            "Unknown backend {}, use one of {}".format(backend, ", ".join(BACKENDS))
+        )
+
+    lock = threading.Lock()
+
+    def report(folderProgress):
+        if callback is None:
+            return
+        # Hand out a copy, the worker keeps updating its own.
+        with lock:
+            callback(FolderProgress(**vars(folderProgress)))
+
+    maxWorkers = max(1, min(maxWorkers, len(folders) or 1))
+    compressWorkers = max(1, MAX_WORKERS // maxWorkers)
+    results = [None] * len(folders)
+    with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        futures = {
+            executor.submit(
+                _archiveFolderReported,
+                inDirPath,
+                outFilePath,
+                arcRoot,
+                removeSource,
+                report,
+                isCancelled,
+                compression=compression,
+                compressLevel=compressLevel,
+                maxWorkers=compressWorkers,
+                backend=backend,
+                maxVolumeSize=maxVolumeSize,
+                checkpoint=checkpoint,
+            ): idx
+            for idx, (inDirPath, outFilePath, arcRoot) in enumerate(folders)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(folders))
+
+    return results
+
+
+def listArchive(inFilePath):
+    """List an archive's members. Only the zip's central directory is read, the listing is
+    cached against the archive's mtime and size so listing it again is free until it changes.
+
+    Args:
+        inFilePath (str): the archive's path
+
+    Returns:
+        tuple(ArchiveMember): in archive order
+    """
+    key = os.path.abspath(inFilePath)
+    stat = os.stat(key)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _LISTINGS_LOCK:
+        cached = _LISTINGS.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with zipfile.ZipFile(key) as myzip:
+        members = tuple(
+            ArchiveMember(
+                path=zinfo.filename,
+                size=zinfo.file_size,
+                compressSize=zinfo.compress_size,
+                crc=zinfo.CRC,
+                isDir=zinfo.is_dir(),
+                dateTime=zinfo.date_time,
+            )
+            for zinfo in myzip.infolist()
+        )
+
+    with _LISTINGS_LOCK:
+        _LISTINGS[key] = (stamp, members)
+    return members
+
+
+def clearListCache(inFilePath=None):
+    """Forget the cached listing of an archive, or of every archive.
+
+    Args:
+        inFilePath (str): optional
+    """
+    with _LISTINGS_LOCK:
+        if inFilePath is None:
+            _LISTINGS.clear()
+        else:
+            _LISTINGS.pop(os.path.abspath(inFilePath), None)
+
+
+def filterMembers(members, patterns=None, subtrees=None, paths=None):
+    """Pick the members matching any of the glob patterns, under any of the subtrees or
+    named in paths. With none of them given every member is picked.
+
+    Args:
+        members (iterable[ArchiveMember]): see listArchive
+        patterns (list[str]): matched against the whole member path eg: */maya/*.ma
+        subtrees (list[str]): member folders eg: Arachne/Model/work
+        paths (list[str]): exact member paths eg: from the ArchiveMemberPicker
+
+    Returns:
+        list[ArchiveMember]
+    """
+    if not patterns and not subtrees and paths is None:
+        return list(members)
+
+    patterns = patterns or []
+    paths = set(paths or [])
+    prefixes = [
+        subtree.replace("\\", "/").strip("/") + "/" for subtree in subtrees or []
+    ]
+    return [
+        member
+        for member in members
+        if member.path in paths
+        or any(fnmatch.fnmatchcase(member.path, pattern) for pattern in patterns)
+        or any(
+            member.path.startswith(prefix) or member.path == prefix[:-1]
+            for prefix in prefixes
+        )
+    ]
+
+
+def restoreMembers(inFilePath, rootDir, patterns=None, subtrees=None, paths=None):
+    """Restore only the matching members of an archive, see filterMembers.
+
+    Args:
+        inFilePath (str): the archive's path
+        rootDir (str): full dir path to restore to.
+        patterns (list[str]): optional
+        subtrees (list[str]): optional
+        paths (list[str]): optional
+
+    Returns:
+        list[str]: the restored paths
+    """
+    members = filterMembers(listArchive(inFilePath), patterns, subtrees, paths)
+    restored = []
+    with zipfile.ZipFile(inFilePath) as myzip:
+        for member in members:
+            restored.append(myzip.extract(member.path, path=rootDir))
+
+    return restored
+
+
+def _memberPath(rootDir, arcname):
+    """Where a member restores to, drive letters and .. are dropped the same way ZipFile.extract does."""
+    arcname = os.path.splitdrive(arcname.replace("\\", "/"))[1]
+    parts = [part for part in arcname.split("/") if part not in ("", ".", "..")]
+    return os.path.join(rootDir, *parts)
+
+
+def _restoreShare(inFilePath, rootDir, members, written, isCancelled):
+    """Stream some of an archive's members out to disk, runs on a worker thread with its own ZipFile.
+    A member is written to a PART_EXT file and only renamed into place once complete.
+
+    Args:
+        written (callable): called with (files, bytes) as they're restored
+    """
+    with zipfile.ZipFile(inFilePath) as myzip:
+        for member in members:
+            if isCancelled is not None and isCancelled():
+                return
+
+            destPath = _memberPath(rootDir, member.path)
+            if member.isDir:
+                os.makedirs(destPath, exist_ok=True)
+                written(1, 0)
+                continue
+
+            os.makedirs(os.path.dirname(destPath), exist_ok=True)
+            partPath = destPath + PART_EXT
+            cancelled = False
+            try:
+                with myzip.open(member.path) as infile, open(
+                    partPath, "wb", buffering=READ_SIZE
+                ) as outfile:
+                    while True:
+                        if isCancelled is not None and isCancelled():
+                            cancelled = True
+                            break
+                        data = infile.read(READ_SIZE)
+                        if not data:
+                            break
+                        outfile.write(data)
+                        written(0, len(data))
+            except BaseException:
+                if os.path.isfile(partPath):
+                    os.remove(partPath)
+                raise
+
+            if cancelled:
+                os.remove(partPath)
+                return
+
+            os.replace(partPath, destPath)
+            mtime = time.mktime(member.dateTime + (0, 0, -1))
+            os.utime(destPath, (mtime, mtime))
+            written(1, 0)
+
+
+def restoreArchives(
+    archives, maxWorkers=MAX_WORKERS, callback=None, progress=None, isCancelled=None
+):
+    """Restore several archives at once. Each archive's members are split between the workers
+    by size and streamed out in READ_SIZE chunks, a cancel removes any partly written files.
+
+    Args:
+        archives (list[tuple(str, str, list[str])]): (inFilePath, rootDir, paths) paths may be None to restore every member
+        maxWorkers (int):
+        callback (callable): optional, called with a RestoreProgress as each archive starts, every REPORT_INTERVAL while it runs and when it ends
+        progress (callable): optional, called with (finished, total) archives
+        isCancelled (callable): optional
+
+    Returns:
+        list[RestoreProgress]: in the order of archives
+    """
+    lock = threading.Lock()
+    start = time.perf_counter()
+    # {id(RestoreProgress): [shares left, last report]}
+    running = dict()
+
+    def report(restoreProgress):
+        restoreProgress.elapsed = time.perf_counter() - start
+        if callback is not None:
+            # Hand out a copy, the workers keep updating their own.
+            callback(RestoreProgress(**vars(restoreProgress)))
+
+    reports = []
+    tasks = []
+    for inFilePath, rootDir, paths in archives:
+        restoreProgress = RestoreProgress(inFilePath, rootDir, state="running")
+        reports.append(restoreProgress)
+        try:
+            members = filterMembers(listArchive(inFilePath), paths=paths)
+        except (OSError, zipfile.BadZipFile) as e:
+            restoreProgress.state = "failed"
+            restoreProgress.error = str(e)
+            report(restoreProgress)
+            continue
+
+        restoreProgress.totalFiles = len(members)
+        restoreProgress.totalBytes = sum(member.size for member in members)
+        shares = _shareMembers(members, maxWorkers, lambda member: member.size)
+        running[id(restoreProgress)] = [len(shares), 0.0]
+        tasks.extend((restoreProgress, share) for share in shares)
+        report(restoreProgress)
+
+    def written(restoreProgress, files, size):
+        with lock:
+            restoreProgress.files += files
+            restoreProgress.bytes += size
+            state = running[id(restoreProgress)]
+            if time.perf_counter() - start - state[1] >= REPORT_INTERVAL:
+                report(restoreProgress)
+                state[1] = restoreProgress.elapsed
+
+    finished = len(archives) - len(running)
+    if progress is not None and finished:
+        progress(finished, len(archives))
+
+    with ThreadPoolExecutor(max_workers=max(1, maxWorkers)) as executor:
+        futures = {
+            executor.submit(
+                _restoreShare,
+                restoreProgress.inFilePath,
+                restoreProgress.rootDir,
+                share,
+                partial(written, restoreProgress),
+                isCancelled,
+            ): restoreProgress
+            for restoreProgress, share in tasks
+        }
+        for future in as_completed(futures):
+            restoreProgress = futures[future]
+            with lock:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(
+                        "Failed to restore %s: %s", restoreProgress.inFilePath, e
+                    )
+                    restoreProgress.error = restoreProgress.error or str(e)
+
+                state = running[id(restoreProgress)]
+                state[0] -= 1
+                if state[0]:
+                    continue
+
+                if restoreProgress.error:
+                    restoreProgress.state = "failed"
+                elif restoreProgress.files < restoreProgress.totalFiles:
+                    restoreProgress.state = "cancelled"
+                else:
+                    restoreProgress.state = "done"
+                report(restoreProgress)
+
+            finished += 1
+            if progress is not None:
+                progress(finished, len(archives))
+
+    return reports
+
+
+def generationPath(outFilePath, number):
+    """
+    Args:
+        outFilePath (str): the archive's path eg: Arachne.zip
+        number (int): from 1
+
+    Returns:
+        str: the path of a generation of an incremental archive eg: Arachne.gen002.zip
+    """
+    root, ext = os.path.splitext(outFilePath)
+    return "{}.gen{:03d}{}".format(root, number, ext)
+
+
+def generationsPath(outFilePath):
+    """
+    Args:
+        outFilePath (str): the archive's path eg: Arachne.zip
+
+    Returns:
+        str: the path of an incremental archive's generations eg: Arachne.generations.json
+    """
+    return "{}.generations.json".format(os.path.splitext(outFilePath)[0])
+
+
+def loadGenerations(outFilePath):
+    """Load an incremental archive's generations, see updateArchive.
+
+    Args:
+        outFilePath (str): the archive's path
+
+    Returns:
+        dict: {"arcRoot", "members": {name: {"size", "mtime", "crc", "sha256", "generation"}},
+            "generations": [{"number", "created", "archive", "added", "changed", "deleted"}]}
+    """
+    with open(generationsPath(outFilePath)) as infile:
+        return json.load(infile)
+
+
+def _fileCrc(filepath):
+    crc = 0
+    with open(filepath, "rb") as infile:
+        while True:
+            data = infile.read(READ_SIZE)
+            if not data:
+                break
+            crc = zlib.crc32(data, crc)
+    return crc
+
+
+def _addGeneration(generations, number, paths, added, changed):
+    """Add an archive's members to the generations, from its manifests and central directory."""
+    for path in paths:
+        crcs = {member.path: member.crc for member in listArchive(path)}
+        manifest = loadManifest(path)
+        for entry in manifest["files"]:
+            if entry["path"] not in added and entry["path"] not in changed:
+                continue
+            generations["members"][entry["path"]] = {
+                "size": entry["size"],
+                "mtime": entry["mtime"],
+                "crc": crcs[entry["path"]],
+                "sha256": entry["sha256"],
+                "generation": number,
+            }
+        for dirName in manifest["dirs"]:
+            if dirName in added:
+                generations["members"][dirName] = {"size": 0, "generation": number}
+
+
+def _baseGenerations(outFilePath, arcRoot):
+    """Start the generations of an archive made by archiveFolder, it becomes generation 0."""
+    generations = {
+        "version": MANIFEST_VERSION,
+        "arcRoot": arcRoot,
+        "members": dict(),
+        "generations": [],
+    }
+    if not _archiveExists(outFilePath):
+        return generations
+
+    paths = volumePaths(outFilePath)
+    manifests = [loadManifest(path) for path in paths]
+    names = set()
+    for manifest in manifests:
+        names.update(entry["path"] for entry in manifest["files"])
+        names.update(manifest["dirs"])
+    generations["arcRoot"] = manifests[0]["arcRoot"]
+    _addGeneration(generations, 0, paths, names, ())
+    generations["generations"].append(
+        {
+            "number": 0,
+            "created": manifests[0]["created"],
+            "archive": os.path.basename(outFilePath),
+            "added": sorted(names),
+            "changed": [],
+            "deleted": [],
+        }
+    )
+    return generations
+
+
+def updateArchive(
+    inDirPath,
+    outFilePath,
+    compression=DEFAULT_COMPRESSION,
+    compressLevel=None,
+    arcRoot=None,
+    maxWorkers=MAX_WORKERS,
+    progress=None,
+    isCancelled=None,
+):
+    """Bring an incremental archive up to date with the folder. Only new and changed files are
+    archived, into a new generation eg: Arachne.gen003.zip, and deleted files are recorded.
+    Arachne.generations.json keeps every member's size, mtime and CRC. A file is only read to check
+    its CRC if its mtime changed but its size didn't. An existing archive made by archiveFolder
+    becomes generation 0, see restoreGeneration to restore from them.
+
+    Args:
+        inDirPath (str): full dir path of the dir to archive.
+        outFilePath (str): the archive's path, the generations are named from it
+        compression (str): one of COMPRESSION
+        compressLevel (int): optional
+        arcRoot (str): see archiveFolder, only used by a new archive
+        maxWorkers (int):
+        progress (callable): optional, see archiveFolder
+        isCancelled (callable): optional
+
+    Returns:
+        dict: the new generation, its archive is None if only deletes were recorded and it is
+            None if the archive was already up to date or it was cancelled
+    """
+    if not os.path.isdir(inDirPath):
+        logger.info("Directory path %s does not exist!", inDirPath)
+        return None
+
+    if os.path.isfile(generationsPath(outFilePath)):
+        generations = loadGenerations(outFilePath)
+    else:
+        arcRoot = arcRoot or os.path.dirname(os.path.abspath(inDirPath))
+        generations = _baseGenerations(
+            outFilePath, os.path.abspath(arcRoot).replace("\\", "/")
+        )
+    members = generations["members"]
+    added = []
+    changed = []
+    # (name, path, mtime) of the files with a new mtime but the same size
+    touched = []
+    seen = set()
+    for path, arcname, isDir, size in _iterMembers(inDirPath, generations["arcRoot"]):
+        name = arcname.replace(os.path.sep, "/") + ("/" if isDir else "")
+        seen.add(name)
+        member = members.get(name)
+        if member is None:
+            added.append(name)
+        elif isDir:
+            continue
+        elif member["size"] != size:
+            changed.append(name)
+        else:
+            mtime = os.path.getmtime(path)
+            if mtime != member["mtime"]:
+                touched.append((name, path, mtime))
+
+    with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        crcs = executor.map(_fileCrc, [path for _, path, _ in touched])
+        for (name, _, mtime), crc in zip(touched, crcs):
+            if crc == members[name]["crc"]:
+                # Same content, remember the new mtime so it isn't read again next time.
+                members[name]["mtime"] = mtime
+            else:
+                changed.append(name)
+
+    deleted = sorted(name for name in members if name not in seen)
+    if isCancelled is not None and isCancelled():
+        return None
+
+    generation = None
+    if added or changed or deleted:
+        number = (
+            generations["generations"][-1]["number"] + 1
+            if generations["generations"]
+            else 1
+        )
+        generation = {
+            "number": number,
+            "created": time.time(),
+            "archive": None,
+            "added": sorted(added),
+            "changed": sorted(changed),
+            "deleted": deleted,
+        }
+
+    if added or changed:
+        genPath = generationPath(outFilePath, generation["number"])
+        # Left by an update that never finished.
+        for filepath in (genPath, manifestPath(genPath)):
+            if os.path.isfile(filepath):
+                os.remove(filepath)
+
+        if not archiveFolder(
+            inDirPath,
+            genPath,
+            compression=compression,
+            compressLevel=compressLevel,
+            arcRoot=generations["arcRoot"],
+            maxWorkers=maxWorkers,
+            progress=progress,
+            isCancelled=isCancelled,
+            paths=set(added + changed),
+        ):
+            return None
+        generation["archive"] = os.path.basename(genPath)
+        _addGeneration(
+            generations, generation["number"], [genPath], set(added), set(changed)
+        )
+
+    for name in deleted:
+        members.pop(name)
+
+    if generation is not None:
+        generations["generations"].append(generation)
+    if generation is not None or touched:
+        _writeJson(generationsPath(outFilePath), generations)
+
+    return generation
+
+
+def restoreGeneration(
+    outFilePath,
+    rootDir,
+    generation=None,
+    paths=None,
+    maxWorkers=MAX_WORKERS,
+    callback=None,
+    progress=None,
+    isCancelled=None,
+):
+    """Restore an incremental archive as it was at a generation. The generations are replayed to find
+    the one holding each member's latest version, then they're restored together with restoreArchives.
+
+    Args:
+        outFilePath (str): the archive's path
+        rootDir (str): full dir path to restore to.
+        generation (int): optional, defaults to the latest
+        paths (list[str]): optional, only restore these members
+        maxWorkers (int):
+        callback (callable): optional, see restoreArchives
+        progress (callable): optional
+        isCancelled (callable): optional
+
+    Returns:
+        list[RestoreProgress]: one per generation archive restored from
+    """
+    generations = loadGenerations(outFilePath)
+    # {name: generation number}
+    live = dict()
+    for record in generations["generations"]:
+        if generation is not None and record["number"] > generation:
+            break
+        live.update((name, record["number"]) for name in record["added"])
+        live.update((name, record["number"]) for name in record["changed"])
+        for name in record["deleted"]:
+            live.pop(name, None)
+
+    if paths is not None:
+        wanted = set(paths)
+        live = {name: number for name, number in live.items() if name in wanted}
+
+    dirPath = os.path.dirname(outFilePath)
+    volumes = None
+    # {archive path: [names]}
+    archives = dict()
+    for name, number in sorted(live.items()):
+        if number:
+            archivePath = generationPath(outFilePath, number)
+        elif os.path.isfile(outFilePath):
+            archivePath = outFilePath
+        else:
+            # Generation 0 is a split archive, see archiveFolder(maxVolumeSize=)
+            if volumes is None:
+                index = loadIndex(outFilePath)
+                volumes = (index["volumes"], index["members"])
+            archivePath = os.path.join(dirPath, volumes[0][volumes[1][name] - 1])
+        archives.setdefault(archivePath, []).append(name)
+
+    return restoreArchives(
+        [(archivePath, rootDir, names) for archivePath, names in archives.items()],
+        maxWorkers=maxWorkers,
+        callback=callback,
+        progress=progress,
+        isCancelled=isCancelled,
+    )
+
+
+def restoreFile(inFilePath, rootDir, patterns=None, subtrees=None, paths=None):
     """From an archive filepath restore to a directory.
 
     Args:
         inFilePath (str): full file path including ext of the file to archive.
         rootDir (str): full dir path to archive to.
+        patterns (list[str]): optional, only restore the members matching these, see filterMembers
+        subtrees (list[str]): optional, only restore the members under these
+        paths (list[str]): optional, only restore these members
 
     Returns:
         bool: success for fail
@@ -75,6 +1796,16 @@ def restoreFile(inFilePath, rootDir):
         widgetUtils.errorWidget(title="Filepath does not exist.", message=message)
         return False
 
+    if patterns or subtrees or paths is not None:
+        restored = restoreMembers(inFilePath, rootDir, patterns, subtrees, paths)
+        logger.info(
+            "Successfully restored %s members of %s to %s",
+            len(restored),
+            inFilePath,
+            rootDir,
+        )
+        return True
+
     archive = zipfile.ZipFile(inFilePath)
     archive.extractall(path=rootDir)
     logger.info("Successfully restored %s to %s", inFilePath, rootDir)
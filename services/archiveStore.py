@@ -0,0 +1,519 @@
+import os
+import json
+import time
+import zlib
+import socket
+import hashlib
+import logging
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+STORE_VERSION = 1
+MAX_WORKERS = os.cpu_count() or 4
+READ_SIZE = 1024 * 1024
+# archiveFolder holds a lease while it runs so garbageCollect keeps the objects its manifest will need.
+# A lease that isn't refreshed for LEASE_TIMEOUT seconds was left behind by a crash and is ignored.
+LEASE_TIMEOUT = 60 * 60
+LEASE_REFRESH = 60
+# File mtimes can lag time.time() by a clock tick, a lease starts this much early to cover it.
+CLOCK_SLACK = 1.0
+_TMP_IDS = itertools.count(1)
+
+
+class StoreError(OSError):
+    """The store, a manifest or an object in it is missing or damaged."""
+
+
+def hashFile(filepath):
+    """
+    Args:
+        filepath (str):
+
+    Returns:
+        tuple(str, int): the sha256 hex digest and size of the file
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(filepath, "rb") as infile:
+        while True:
+            data = infile.read(READ_SIZE)
+            if not data:
+                break
+            size += len(data)
+            digest.update(data)
+
+    return digest.hexdigest(), size
+
+
+class ArchiveStore:
+    def __init__(self, storeDir, compress=True):
+        """A content addressed alternative to zip archives. File contents are stored once as objects
+        named by their sha256, each archive is a manifest listing its files and their objects.
+        Archiving the same or overlapping folders again only stores the files that changed.
+
+        storeDir/
+            store.json
+            objects/ab/abcdef...
+            manifests/<name>.json
+        leases/<pid>.<n>.json
+
+        Args:
+            storeDir (str):
+            compress (bool): zlib compress new objects, only used when the store is created.
+        """
+        self.storeDir = storeDir
+        self._objectsDir = os.path.join(storeDir, "objects")
+        self._manifestsDir = os.path.join(storeDir, "manifests")
+        self._leasesDir = os.path.join(storeDir, "leases")
+        settingsPath = os.path.join(storeDir, "store.json")
+        if os.path.isfile(settingsPath):
+            with open(settingsPath) as infile:
+                settings = json.load(infile)
+            if settings.get("version") != STORE_VERSION:
+                raise StoreError("Unsupported store version in {}".format(storeDir))
+        else:
+            settings = {"version": STORE_VERSION, "compress": compress}
+            os.makedirs(self._objectsDir, exist_ok=True)
+            os.makedirs(self._manifestsDir, exist_ok=True)
+            self._writeJson(settingsPath, settings)
+
+        self.compress = settings["compress"]
+        # Held while an object is renamed into place, so only the first writer of a duplicate keeps its copy.
+        self._lock = threading.Lock()
+
+    def _writeJson(self, filepath, data):
+        tmpPath = "{}.{}.{}.tmp".format(filepath, os.getpid(), next(_TMP_IDS))
+        with open(tmpPath, "w") as outfile:
+            json.dump(data, outfile, indent=1)
+        os.replace(tmpPath, filepath)
+
+    def objectPath(self, digest):
+        """
+        Args:
+            digest (str): sha256 hex digest
+
+        Returns:
+            str
+        """
+        return os.path.join(self._objectsDir, digest[:2], digest[2:])
+
+    def hasObject(self, digest):
+        return os.path.isfile(self.objectPath(digest))
+
+    def putFile(self, filepath):
+        """Store a file's contents. The file is read once, hashed as it's written to a temp object
+        and renamed to its digest, so an object always holds exactly what was hashed.
+
+        Args:
+            filepath (str):
+
+        Returns:
+            tuple(str, int, bool): (sha256, size, True if a new object was written)
+        """
+        tmpPath = os.path.join(
+            self._objectsDir, "{}.{}.tmp".format(os.getpid(), next(_TMP_IDS))
+        )
+        try:
+            digest, size = self._writeObject(filepath, tmpPath)
+            objectPath = self.objectPath(digest)
+            os.makedirs(os.path.dirname(objectPath), exist_ok=True)
+            with self._lock:
+                stored = not os.path.isfile(objectPath)
+                if stored:
+                    os.replace(tmpPath, objectPath)
+                else:
+                    # Touched so a garbageCollect running alongside sees it's in use again.
+                    os.utime(objectPath)
+                    os.remove(tmpPath)
+        except BaseException:
+            if os.path.isfile(tmpPath):
+                os.remove(tmpPath)
+            raise
+
+        return digest, size, stored
+
+    def _writeObject(self, filepath, tmpPath):
+        """
+        Returns:
+            tuple(str, int): the sha256 hex digest and size of the file written
+        """
+        compressor = zlib.compressobj() if self.compress else None
+        digest = hashlib.sha256()
+        size = 0
+        with open(filepath, "rb") as infile, open(tmpPath, "wb") as outfile:
+            while True:
+                data = infile.read(READ_SIZE)
+                if not data:
+                    break
+                size += len(data)
+                digest.update(data)
+                outfile.write(compressor.compress(data) if compressor else data)
+            if compressor is not None:
+                outfile.write(compressor.flush())
+
+        return digest.hexdigest(), size
+
+    def _takeLease(self, name):
+        os.makedirs(self._leasesDir, exist_ok=True)
+        leasePath = os.path.join(
+            self._leasesDir, "{}.{}.json".format(os.getpid(), next(_TMP_IDS))
+        )
+        self._writeJson(
+            leasePath,
+            {
+                "name": name,
+                "pid": os.getpid(),
+                "host": socket.gethostname(),
+                "started": time.time() - CLOCK_SLACK,
+            },
+        )
+        return leasePath
+
+    def _dropLease(self, leasePath):
+        try:
+            os.remove(leasePath)
+        except FileNotFoundError:
+            pass
+
+    def _leaseStarts(self):
+        """
+        Returns:
+            list[float]: when each archiveFolder still running against the store started
+        """
+        if not os.path.isdir(self._leasesDir):
+            return []
+
+        starts = []
+        for fileName in os.listdir(self._leasesDir):
+            leasePath = os.path.join(self._leasesDir, fileName)
+            try:
+                if time.time() - os.path.getmtime(leasePath) > LEASE_TIMEOUT:
+                    continue
+                with open(leasePath) as infile:
+                    starts.append(json.load(infile)["started"])
+            except (OSError, ValueError, KeyError):
+                # Dropped as it was read, or still being written.
+                continue
+        return starts
+
+    def _putMember(self, filepath, relPath):
+        stat = os.stat(filepath)
+        digest, size, stored = self.putFile(filepath)
+        return {
+            "path": relPath,
+            "size": size,
+            "mtime": stat.st_mtime,
+            "mode": stat.st_mode & 0o777,
+            "sha256": digest,
+        }, stored
+
+    def archiveFolder(
+        self,
+        inDirPath,
+        name,
+        arcRoot=None,
+        maxWorkers=MAX_WORKERS,
+        progress=None,
+        isCancelled=None,
+    ):
+        """Store a folder and write its manifest. Files are hashed and stored in parallel.
+
+        Args:
+            inDirPath (str):
+            name (str): the manifest name, eg: assets_Character_Arachne
+            arcRoot (str): paths in the manifest are relative to this, defaults to the parent of inDirPath
+            maxWorkers (int):
+            progress (callable): optional, called with (files, newBytes) so far
+            isCancelled (callable): optional, no manifest is written if cancelled
+
+        Returns:
+            dict: the manifest, None if cancelled
+        """
+        arcRoot = arcRoot or os.path.dirname(os.path.abspath(inDirPath))
+        leasePath = self._takeLease(name)
+        lastRefresh = [time.time()]
+        manifest = {
+            "name": name,
+            "source": os.path.abspath(inDirPath).replace("\\", "/"),
+            "created": time.time(),
+            "files": [],
+            "dirs": [],
+            "newBytes": 0,
+        }
+        maxPending = maxWorkers * 2
+        pending = set()
+
+        def collect(done):
+            for future in done:
+                member, stored = future.result()
+                manifest["files"].append(member)
+                if stored:
+                    manifest["newBytes"] += member["size"]
+                if progress is not None:
+                    progress(len(manifest["files"]), manifest["newBytes"])
+            if time.time() - lastRefresh[0] >= LEASE_REFRESH:
+                lastRefresh[0] = time.time()
+                os.utime(leasePath)
+
+        try:
+            with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+                for root, dirs, files in os.walk(inDirPath, topdown=True):
+                    if isCancelled is not None and isCancelled():
+                        for future in pending:
+                            future.cancel()
+                        return None
+
+                    dirs.sort()
+                    relRoot = os.path.relpath(root, arcRoot).replace("\\", "/")
+                    if not dirs and not files:
+                        manifest["dirs"].append(relRoot)
+
+                    for fileName in sorted(files):
+                        pending.add(
+                            executor.submit(
+                                self._putMember,
+                                os.path.join(root, fileName),
+                                "/".join([relRoot, fileName]),
+                            )
+                        )
+                        if len(pending) >= maxPending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+
+                collect(pending)
+
+            manifest["files"].sort(key=lambda member: member["path"])
+            self.saveManifest(manifest)
+        finally:
+            self._dropLease(leasePath)
+
+        logger.info(
+            "Stored %s: %s files, %s new bytes",
+            name,
+            len(manifest["files"]),
+            manifest["newBytes"],
+        )
+        return manifest
+
+    def _manifestPath(self, name):
+        if not name or os.path.basename(name) != name or name.startswith("."):
+            raise ValueError("Invalid manifest name {}".format(name))
+        return os.path.join(self._manifestsDir, "{}.json".format(name))
+
+    def saveManifest(self, manifest):
+        self._writeJson(self._manifestPath(manifest["name"]), manifest)
+
+    def loadManifest(self, name):
+        """
+        Args:
+            name (str):
+
+        Returns:
+            dict
+        """
+        manifestPath = self._manifestPath(name)
+        if not os.path.isfile(manifestPath):
+            raise StoreError("No manifest named {}".format(name))
+
+        with open(manifestPath) as infile:
+            return json.load(infile)
+
+    def manifests(self):
+        """
+        Returns:
+            list[str]: the manifest names
+        """
+        return sorted(
+            fileName[: -len(".json")]
+            for fileName in os.listdir(self._manifestsDir)
+            if fileName.endswith(".json")
+        )
+
+    def removeManifest(self, name):
+        """Forget an archive, its objects stay until garbageCollect.
+
+        Args:
+            name (str):
+        """
+        os.remove(self._manifestPath(name))
+
+    def _iterObject(self, member):
+        """Yield a member's contents from its object, checking the hash once it's all been read.
+
+        Raises:
+            StoreError: if the object is missing or damaged
+        """
+        objectPath = self.objectPath(member["sha256"])
+        if not os.path.isfile(objectPath):
+            raise StoreError("Missing object for {}".format(member["path"]))
+
+        decompressor = zlib.decompressobj() if self.compress else None
+        digest = hashlib.sha256()
+        try:
+            with open(objectPath, "rb") as infile:
+                while True:
+                    data = infile.read(READ_SIZE)
+                    if not data:
+                        break
+                    if decompressor is not None:
+                        data = decompressor.decompress(data)
+                    digest.update(data)
+                    yield data
+                if decompressor is not None:
+                    data = decompressor.flush()
+                    digest.update(data)
+                    yield data
+        except zlib.error:
+            raise StoreError("Damaged object for {}".format(member["path"])) from None
+
+        if digest.hexdigest() != member["sha256"]:
+            raise StoreError("Damaged object for {}".format(member["path"]))
+
+    def restoreMember(self, member, destPath):
+        """Write a single manifest member back out, checking its hash as it goes.
+
+        Args:
+            member (dict): one of the manifest's files
+            destPath (str):
+
+        Raises:
+            StoreError: if the object is missing or damaged
+        """
+        if not os.path.isfile(self.objectPath(member["sha256"])):
+            raise StoreError("Missing object for {}".format(member["path"]))
+
+        os.makedirs(os.path.dirname(destPath) or ".", exist_ok=True)
+        tmpPath = "{}.{}.{}.tmp".format(destPath, os.getpid(), next(_TMP_IDS))
+        try:
+            with open(tmpPath, "wb") as outfile:
+                for data in self._iterObject(member):
+                    outfile.write(data)
+
+            os.replace(tmpPath, destPath)
+        except BaseException:
+            if os.path.isfile(tmpPath):
+                os.remove(tmpPath)
+            raise
+
+        os.chmod(destPath, member.get("mode", 0o644) or 0o644)
+        os.utime(destPath, (member["mtime"], member["mtime"]))
+
+    def restore(
+        self, name, rootDir, paths=None, maxWorkers=MAX_WORKERS, isCancelled=None
+    ):
+        """Restore an archive, or just some of its files, straight from the manifest.
+
+        Args:
+            name (str):
+            rootDir (str): the manifest paths are restored relative to this
+            paths (list[str]): optional, only restore these manifest paths
+            maxWorkers (int):
+            isCancelled (callable): optional
+
+        Returns:
+            list[str]: the files restored
+        """
+        manifest = self.loadManifest(name)
+        members = manifest["files"]
+        if paths is not None:
+            wanted = set(paths)
+            members = [member for member in members if member["path"] in wanted]
+
+        if paths is None:
+            for relPath in manifest.get("dirs", []):
+                os.makedirs(os.path.join(rootDir, *relPath.split("/")), exist_ok=True)
+
+        restored = []
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = {}
+            for member in members:
+                if isCancelled is not None and isCancelled():
+                    break
+                destPath = os.path.join(rootDir, *member["path"].split("/"))
+                futures[executor.submit(self.restoreMember, member, destPath)] = (
+                    destPath
+                )
+
+            for future, destPath in futures.items():
+                future.result()
+                restored.append(destPath)
+
+        return restored
+
+    def verify(self, name, maxWorkers=MAX_WORKERS, isCancelled=None):
+        """Read back every object an archive refers to and check its hash, eg: before deleting the source.
+
+        Args:
+            name (str):
+            maxWorkers (int):
+            isCancelled (callable): optional
+
+        Returns:
+            list[str]: what's wrong, empty if the archive is good
+        """
+
+        def check(member):
+            if isCancelled is not None and isCancelled():
+                return None
+            try:
+                for _ in self._iterObject(member):
+                    pass
+            except (OSError, StoreError) as e:
+                return str(e)
+            return None
+
+        manifest = self.loadManifest(name)
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            errors = [
+                error
+                for error in executor.map(check, manifest["files"])
+                if error is not None
+            ]
+        if isCancelled is not None and isCancelled():
+            errors.append("Verification of {} was cancelled".format(name))
+        return errors
+
+    def garbageCollect(self):
+        """Remove the objects no manifest refers to anymore. Objects written or reused since the
+        oldest running archiveFolder started are kept, its manifest isn't saved yet.
+
+        Returns:
+            int: the number of objects removed
+        """
+        cutoff = min([time.time()] + self._leaseStarts())
+        referenced = set()
+        for name in self.manifests():
+            referenced.update(
+                member["sha256"] for member in self.loadManifest(name)["files"]
+            )
+
+        removed = 0
+        for prefix in os.listdir(self._objectsDir):
+            prefixDir = os.path.join(self._objectsDir, prefix)
+            if not os.path.isdir(prefixDir):
+                # A temp object, only cleared once it's clearly been left behind by a crash.
+                try:
+                    if os.path.getmtime(prefixDir) < cutoff - LEASE_TIMEOUT:
+                        os.remove(prefixDir)
+                except FileNotFoundError:
+                    pass
+                continue
+
+            for fileName in os.listdir(prefixDir):
+                objectPath = os.path.join(prefixDir, fileName)
+                if prefix + fileName in referenced or fileName.endswith(".tmp"):
+                    continue
+                try:
+                    if os.path.getmtime(objectPath) >= cutoff:
+                        continue
+                    os.remove(objectPath)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+
+        return removed
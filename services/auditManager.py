@@ -0,0 +1,173 @@
+import os
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from services import folderManager as ss_folderManager
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+MAX_WORKERS = 8
+
+
+@dataclass
+class AssetAudit:
+    """How an asset's folders on disk differ from the config's schema."""
+
+    root: str
+    assetName: str
+    folderPath: str
+    missing: list = field(default_factory=list)
+    unexpected: list = field(default_factory=list)
+    error: str = ""
+
+    def isClean(self):
+        return not self.error and not self.missing and not self.unexpected
+
+
+def getRootFolderPath(config, root):
+    """
+    Args:
+        config (Config):
+        root (str): One of the config's ROOTS
+
+    Returns:
+        str
+    """
+    return os.path.sep.join(config.rootPathTokens() + [root])
+
+
+def iterAssets(config):
+    """Yield every asset folder under every root of the config.
+
+    Args:
+        config (Config):
+
+    Yields:
+        tuple(root, assetName, folderPath)
+    """
+    for root in config.iterRoots():
+        rootPath = getRootFolderPath(config, root)
+        try:
+            with os.scandir(rootPath) as entries:
+                assets = sorted(entry.name for entry in entries if entry.is_dir())
+        except FileNotFoundError:
+            logger.debug("Root %s does not exist on disk.", rootPath)
+            continue
+
+        for assetName in assets:
+            yield root, assetName, os.path.sep.join([rootPath, assetName])
+
+
+def auditAsset(plan, root, assetName, folderPath):
+    """Compare an asset's folders on disk with the schema plan.
+    Only folders that belong to the schema are scanned, an unexpected folder is reported but not walked.
+
+    Args:
+        plan (tuple(str)): see folderManager.getSchemaPlan
+        root (str):
+        assetName (str):
+        folderPath (str):
+
+    Returns:
+        AssetAudit
+    """
+    expected = set(plan)
+    found = set()
+    audit = AssetAudit(root=root, assetName=assetName, folderPath=folderPath)
+
+    toScan = [""]
+    while toScan:
+        relPath = toScan.pop()
+        dirPath = os.path.sep.join([folderPath, relPath]) if relPath else folderPath
+        with os.scandir(dirPath) as entries:
+            children = sorted(entry.name for entry in entries if entry.is_dir())
+
+        for name in children:
+            childPath = os.path.sep.join([relPath, name]) if relPath else name
+            if childPath in expected:
+                found.add(childPath)
+                toScan.append(childPath)
+            else:
+                audit.unexpected.append(childPath)
+
+    audit.missing = [relPath for relPath in plan if relPath not in found]
+    audit.unexpected.sort()
+    return audit
+
+
+def _auditAssetSafe(plan, root, assetName, folderPath):
+    """auditAsset, an asset that can't be scanned (eg: deleted or permissions) is reported instead of ending the audit."""
+    try:
+        return auditAsset(plan, root, assetName, folderPath)
+    except Exception as e:
+        logger.error("Failed to audit %s: %s", folderPath, e)
+        return AssetAudit(
+            root=root, assetName=assetName, folderPath=folderPath, error=str(e)
+        )
+
+
+def iterAudit(config, maxWorkers=MAX_WORKERS, isCancelled=None):
+    """Audit every asset of the config, scanning assets in parallel.
+    Results are yielded as they finish and only a few assets are in flight at once,
+    so very large projects are never held in memory.
+
+    Args:
+        config (Config):
+        maxWorkers (int):
+        isCancelled (callable): optional, returning True stops queuing more assets
+
+    Yields:
+        AssetAudit: with its error set if the asset couldn't be scanned
+    """
+    plan = ss_folderManager.getSchemaPlan(config)
+    maxPending = maxWorkers * 2
+    pending = set()
+    with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        for root, assetName, folderPath in iterAssets(config):
+            if isCancelled is not None and isCancelled():
+                break
+
+            pending.add(
+                executor.submit(_auditAssetSafe, plan, root, assetName, folderPath)
+            )
+            if len(pending) < maxPending:
+                continue
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+        for future in pending:
+            yield future.result()
+
+
+def auditProject(
+    config, maxWorkers=MAX_WORKERS, callback=None, progress=None, isCancelled=None
+):
+    """Audit every asset of the config, handing each AssetAudit to the callback as it finishes.
+
+    Args:
+        config (Config):
+        maxWorkers (int):
+        callback (callable): optional, called with each AssetAudit
+        progress (callable): optional, called with (audited, dirty) asset counts
+        isCancelled (callable): optional
+
+    Returns:
+        tuple(int, int): the number of assets audited and how many differ from the schema
+    """
+    audited = 0
+    dirty = 0
+    for audit in iterAudit(config, maxWorkers=maxWorkers, isCancelled=isCancelled):
+        audited += 1
+        if not audit.isClean():
+            dirty += 1
+        if callback is not None:
+            callback(audit)
+        if progress is not None:
+            progress(audited, dirty)
+
+    logger.info("Audited %s assets, %s differ from the schema.", audited, dirty)
+    return audited, dirty
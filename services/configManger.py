@@ -1,14 +1,106 @@
 import os, sys
+import copy
+import time
+import socket
 import logging
-from dataclasses import dataclass
+import itertools
+import threading
+import contextlib
+from dataclasses import dataclass, field
 from constants import schema as c_schema
-from PySide6 import QtCore
+from services import journalManager as ss_journalManager
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 logger.propagate = False
 logging.basicConfig()
 
+# Seconds to wait for another save to release the config's lock and the age after
+# which a lock taken on another host is assumed to be left behind by a crashed save.
+LOCK_TIMEOUT = 10.0
+STALE_LOCK_AGE = 60.0
+_TMP_IDS = itertools.count(1)
+
+# {absolute config path: ((st_mtime_ns, st_size), Config)}
+_CONFIG_CACHE = dict()
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+
+class SchemaError(ValueError):
+    """The config's schema links to itself or to a schema that doesn't exist."""
+
+
+class ConfigLockError(OSError):
+    """Another save held the config's lock for longer than the timeout."""
+
+
+def _readOnly(self, *args, **kwargs):
+    raise TypeError("Cached config data is read only, edit a Config.copy() instead.")
+
+
+class _ReadOnlyDict(dict):
+    """A dict of cached config data, copies of it are plain dicts again."""
+
+    __setitem__ = __delitem__ = _readOnly
+    clear = pop = popitem = setdefault = update = __ior__ = _readOnly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class _ReadOnlyList(list):
+    """A list of cached config data, copies of it are plain lists again."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readOnly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readOnly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _freeze(data):
+    """
+    Args:
+        data: loaded json
+
+    Returns:
+        the same data with its dicts and lists made read only
+    """
+    if isinstance(data, dict):
+        return _ReadOnlyDict((key, _freeze(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return _ReadOnlyList(_freeze(value) for value in data)
+    return data
+
+
+@dataclass(frozen=True)
+class SchemaNode:
+    """A resolved folder of the schema. Linked schemas are resolved once and their nodes shared."""
+
+    name: str
+    children: tuple = ()
+
+
+def _isEmpty(value):
+    return value is None or value == str(None)
+
 
 @dataclass
 class Config:
@@ -31,6 +123,15 @@ class Config:
     data: dict
     _configName = str
     _configPath = str
+    # Resolved lazily, once per config. See schemaGraph()
+    _linkedNames: tuple = field(default=None, init=False, repr=False, compare=False)
+    _linkedNameSet: frozenset = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _linkedNodes: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _schemaGraph: tuple = field(default=None, init=False, repr=False, compare=False)
 
     def name(self):
         """Returns name of the config being used
@@ -42,6 +143,17 @@ class Config:
     def setName(self, confgName):
         self._configName = confgName
 
+    def copy(self):
+        """A Config with its own editable copy of the data, the cached Configs are read only.
+
+        Returns:
+            Config
+        """
+        config = Config(data=copy.deepcopy(self.data))
+        config.setName(self.name())
+        config.setConfigPath(self.configPath())
+        return config
+
     def projectName(self):
         return self.data.get("projectName", "")
 
@@ -88,6 +200,32 @@ class Config:
             ),
         )
 
+    def seedFiles(self):
+        """Template files to copy into the schema folders when creating an asset.
+
+        Returns:
+            dict: {"relative/schema/folder": ["templatePath", ...]}
+        """
+        return self.data.get("SEEDFILES", {}) or {}
+
+    def seedHardlinks(self):
+        """Seed files may be hardlinked to their templates when the filesystem can't reflink them.
+        A hardlink shares its data with the template so saving over a seeded file in place edits the
+        template and every other asset seeded from it. Only set "SEEDHARDLINKS": true for read-only templates.
+
+        Returns:
+            bool: defaults to False, seeds are real copies
+        """
+        return bool(self.data.get("SEEDHARDLINKS", False))
+
+    def pathTemplates(self):
+        """Named path templates relative to the rootPathTokens, see services.pathTemplates.
+
+        Returns:
+            dict: {"work": "{root}/{asset}/{dept}/work/{app}"}
+        """
+        return self.data.get("PATHTEMPLATES", {}) or {}
+
     def iterBaseFolders(self):
         data = self.data.get("BASEFOLDERS", {})
         for folderName, linkedData in data.items():
@@ -110,23 +248,43 @@ class Config:
 
     def linkedFolderNames(self):
         """Return a list of all the linked folder entries"""
-        invalidKeys = c_schema.IGNORES_LINKED
-        names = []
-        for k, _ in self.data.items():
-            if k in invalidKeys:
-                continue
-            names.append(k)
+        if self._linkedNames is None:
+            invalidKeys = c_schema.IGNORES_LINKED
+            self._linkedNames = tuple(k for k in self.data if k not in invalidKeys)
+            self._linkedNameSet = frozenset(self._linkedNames)
 
-        return names
+        return list(self._linkedNames)
+
+    def isLinkedFolderName(self, name):
+        """
+        Args:
+            name (string):
+
+        Returns:
+            bool
+        """
+        if self._linkedNameSet is None:
+            self.linkedFolderNames()
+
+        return name in self._linkedNameSet
 
     def roots(self):
         return self.data.get("ROOTS", {})
 
     def parseRoots(self):
-        return self._parseData(self.data.get("ROOTS", {}))
+        return dict(self.roots())
 
     def parseBaseFolders(self):
-        return self._parseData(self.data.get("BASEFOLDERS", {}))
+        """The BASEFOLDERS with all the linked schemas filled in.
+
+        Returns:
+            dict: {folderName: {subFolderName: ... or None}}
+        """
+
+        def toDict(nodes):
+            return {node.name: toDict(node.children) or None for node in nodes}
+
+        return toDict(self.schemaGraph())
 
     def iterRoots(self):
         """Generator to iter the roots entry in the dict.
@@ -140,36 +298,121 @@ class Config:
         for root in self.data.get("ROOTS", {}).keys():
             yield root
 
-    def _parseData(self, data):
-        """Mutates data to fill in anything that expects to reuse other key values.
+    def schemaGraph(self):
+        """The BASEFOLDERS resolved into SchemaNodes. Built once and memoized.
+
+        Raises:
+            SchemaError: on a cycle or a link to a schema that doesn't exist.
+
+        Returns:
+            tuple(SchemaNode)
+        """
+        if self._schemaGraph is None:
+            self._schemaGraph = self._resolveFolders(
+                self.data.get("BASEFOLDERS", {}) or {}, ("BASEFOLDERS",)
+            )
+
+        return self._schemaGraph
+
+    def validateSchema(self):
+        """
+        Returns:
+            list[string]: the problems with the schema, empty if it's valid.
+        """
+        errors = []
+        for name in ["BASEFOLDERS"] + self.linkedFolderNames():
+            try:
+                if name == "BASEFOLDERS":
+                    self.schemaGraph()
+                else:
+                    self._resolveLinked(name, ())
+            except SchemaError as e:
+                if str(e) not in errors:
+                    errors.append(str(e))
+
+        return errors
+
+    def _resolveLinked(self, name, stack):
+        """The nodes of a linked schema, each linked schema is only resolved once.
+
+        Args:
+            name (string): the linked schema name eg: ASSETFOLDERS
+            stack (tuple(string)): the linked schemas being resolved, to catch cycles.
 
+        Returns:
+            tuple(SchemaNode)
+        """
+        if name in stack:
+            raise SchemaError(
+                "Schema cycle: {}".format(
+                    " -> ".join(stack[stack.index(name) :] + (name,))
+                )
+            )
+
+        if name not in self._linkedNodes:
+            folderData = self.data.get(name)
+            if not isinstance(folderData, dict):
+                folderData = {}
+            self._linkedNodes[name] = self._resolveFolders(folderData, stack + (name,))
+
+        return self._linkedNodes[name]
+
+    def _resolveFolders(self, folderData, stack):
+        """
         Args:
-            data (dict):
+            folderData (dict): {folderName: None | "LINKED" | ["LINKED", "subFolder"] | {...}}
+            stack (tuple(string)):
 
         Returns:
-            dict
+            tuple(SchemaNode)
         """
-        for folderName, folderData in data.items():
-            logger.debug("folderName: %s folderData: %s", folderName, folderData)
-            if folderName in ("projectName", "projectPath", "configRoot"):
-                logger.debug("Skipping %s %s", folderName, folderData)
+        nodes = []
+        for folderName, subFolders in folderData.items():
+            if _isEmpty(folderName):
                 continue
 
-            # None, String, Dict
-            if folderData is None or folderData == "None":
-                logger.debug("Skipping %s %s", folderName, folderData)
+            # A linked name as the key expands its folders straight into the parent.
+            if self.isLinkedFolderName(folderName):
+                nodes.extend(self._resolveLinked(folderName, stack))
                 continue
 
-            if isinstance(folderData, str):
-                logger.debug("Found subFolder name...")
-                d = self.data.get(folderData)
-                data[folderName] = self._parseData(d)
+            nodes.append(
+                SchemaNode(folderName, self._resolveSubFolders(subFolders, stack))
+            )
+
+        return tuple(nodes)
+
+    def _resolveSubFolders(self, subFolders, stack):
+        if isinstance(subFolders, dict):
+            return self._resolveFolders(subFolders, stack)
 
-        return data
+        if isinstance(subFolders, str) and not _isEmpty(subFolders):
+            # {"work": "WORKFOLDERS"} style always links to another schema.
+            if not self.isLinkedFolderName(subFolders):
+                raise SchemaError(
+                    "{} links to {} which doesn't exist!".format(stack[-1], subFolders)
+                )
+            return self._resolveLinked(subFolders, stack)
+
+        if not isinstance(subFolders, list):
+            return ()
+
+        children = []
+        for subFolder in subFolders:
+            if _isEmpty(subFolder):
+                continue
+
+            if self.isLinkedFolderName(subFolder):
+                children.extend(self._resolveLinked(subFolder, stack))
+            else:
+                children.append(SchemaNode(subFolder))
+
+        return tuple(children)
 
 
 def getConfigByFilePath(filepath):
-    """
+    """Configs are cached against the file's mtime and size, loading the same unchanged file again
+    returns the same shared Config without reading the file. Its data is read only, use Config.copy() to edit it.
 
     Args:
         filepath (string):
@@ -183,34 +426,63 @@ def getConfigByFilePath(filepath):
     if not filepath.endswith(".json"):
         filepath = "{}.json".format(filepath)
 
-    qdir = QtCore.QDir()
-    qdir.setPath(filepath)
-    qdir.makeAbsolute()
-    logger.debug("Fetching config: %s", qdir.path())
-    configPath = qdir.path()
-    if not os.path.isfile(configPath):
+    configPath = os.path.abspath(filepath).replace("\\", "/")
+    logger.debug("Fetching config: %s", configPath)
+    config = _getCachedConfig(configPath, getConfigNameFromFilePath(filepath))
+    if config is None:
         logger.warning("Config does not exist! \n\t%s", configPath)
-        return
-
-    data = loadJson(configPath)
-    config = Config(data=data)
-    config.setName(getConfigNameFromFilePath(filepath))
 
     return config
 
 
-def getConfigFilepath(configName):
+def _getCachedConfig(configPath, configName):
     """
-
     Args:
+        configPath (string): absolute path to the json
         configName (string):
 
     Returns:
-        string
+        Config: None if the file doesn't exist
     """
-    if not configName:
+    try:
+        stat = os.stat(configPath)
+    except OSError:
         return None
 
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(configPath)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    config = Config(data=_freeze(loadJson(configPath)))
+    config.setName(configName)
+    config.setConfigPath(configPath)
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[configPath] = (key, config)
+
+    return config
+
+
+def clearConfigCache(filepath=None):
+    """Forget the cached Config for filepath, or every cached Config.
+
+    Args:
+        filepath (string): optional
+    """
+    with _CONFIG_CACHE_LOCK:
+        if filepath is None:
+            _CONFIG_CACHE.clear()
+        else:
+            _CONFIG_CACHE.pop(os.path.abspath(filepath).replace("\\", "/"), None)
+
+
+def getConfigsDir():
+    """The configs folder shipped with switch.
+
+    Returns:
+        string
+    """
     if not getattr(sys, "frozen", False):
         currentPath = os.path.dirname(__file__).replace("\\", "/")
     else:
@@ -218,19 +490,29 @@ def getConfigFilepath(configName):
 
     tokens = os.path.split(currentPath)
     currentPath = os.path.sep.join(tokens[:-1])
-    configPath = "{}.json".format(
-        os.path.sep.join([currentPath, "configs", configName])
-    )
-    qdir = QtCore.QDir()
-    qdir.setPath(configPath)
-    qdir.makeAbsolute()
-    logger.debug("Fetching config: %s", qdir.path())
-    configPath = qdir.path()
+    return os.path.sep.join([currentPath, "configs"])
+
+
+def getConfigFilepath(configName):
+    """
+
+    Args:
+        configName (string):
+
+    Returns:
+        string
+    """
+    if not configName:
+        return None
+
+    configPath = "{}.json".format(os.path.sep.join([getConfigsDir(), configName]))
+    configPath = os.path.abspath(configPath).replace("\\", "/")
+    logger.debug("Fetching config: %s", configPath)
     if not os.path.isfile(configPath):
         logger.warning("Config does not exist! \n\t%s", configPath)
         return None
 
-    return qdir.path()
+    return configPath
 
 
 def getConfigNameFromFilePath(filepath):
@@ -259,8 +541,12 @@ def getConfigByName(configName):
     """
 
     configPath = getConfigFilepath(configName)
-    data = loadJson(configPath)
-    config = Config(data=data)
+    if configPath is not None:
+        config = _getCachedConfig(configPath, configName)
+        if config is not None:
+            return config
+
+    config = Config(data=dict())
     config.setName(configName)
     return config
 
@@ -281,18 +567,198 @@ def loadJson(filepath):
     if not os.path.isfile(filepath):
         return {}
 
-    with open(filepath) as infile:
-        data = json.load(infile)
+    with open(filepath, "rb") as infile:
+        data = _loads(infile.read())
 
     return data
 
 
-def saveConfig(filepath, data):
+def _loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+
+@contextlib.contextmanager
+def configLock(filepath, timeout=LOCK_TIMEOUT, staleAge=STALE_LOCK_AGE):
+    """Advisory lock for writers of the config, a `<filepath>.lock` file created exclusively.
+    Works across workstations on shared storage where file locking APIs often don't.
+
+    Args:
+        filepath (string):
+        timeout (float): seconds to wait for the lock
+        staleAge (float): a lock taken on another host longer ago than this is assumed to be left by a crash
+
+    Raises:
+        ConfigLockError: if the lock isn't released in time
+    """
+    lockPath = "{}.lock".format(filepath)
+    start = time.monotonic()
+    while True:
+        try:
+            fd = os.open(lockPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                owner = _readLockOwner(lockPath)
+            except FileNotFoundError:
+                continue
+
+            if _lockIsStale(owner, staleAge):
+                _breakLock(lockPath, owner)
+                continue
+
+            if time.monotonic() - start > timeout:
+                raise ConfigLockError("Timed out waiting for {}".format(lockPath))
+            time.sleep(0.05)
+
+    owner = {
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "time": time.time(),
+        "id": next(_TMP_IDS),
+    }
+    try:
+        os.write(fd, json.dumps(owner).encode("utf-8"))
+        os.close(fd)
+        yield lockPath
+    finally:
+        # Only remove the lock if it is still ours, it could have been broken
+        # as stale and taken by another save in the meantime.
+        with contextlib.suppress(FileNotFoundError):
+            if _readLockOwner(lockPath) == owner:
+                os.remove(lockPath)
+
+
+def _readLockOwner(lockPath):
+    """
+    Args:
+        lockPath (string):
+
+    Returns:
+        dict: host, pid and time of the save holding the lock, the time is the lock's mtime
+              if the lock doesn't say (still being written or left by an older version)
+
+    Raises:
+        FileNotFoundError: if the lock is gone
+    """
+    with open(lockPath, "rb") as infile:
+        raw = infile.read()
+        mtime = os.fstat(infile.fileno()).st_mtime
+    try:
+        owner = json.loads(raw)
+    except ValueError:
+        owner = None
+    if not isinstance(owner, dict):
+        host, _, pid = raw.decode("utf-8", "replace").rpartition(":")
+        owner = {"host": host, "pid": int(pid) if pid.isdigit() else None}
+    owner.setdefault("time", mtime)
+    return owner
+
+
+def _lockIsStale(owner, staleAge):
+    """A lock is stale once its save is no longer running: on this host that's checked with the pid,
+    a lock from another workstation is only assumed stale once the time it was taken is older than staleAge.
+
+    Args:
+        owner (dict): see _readLockOwner
+        staleAge (float):
+
+    Returns:
+        bool
+    """
+    if owner.get("host") == socket.gethostname() and owner.get("pid"):
+        return not ss_journalManager.processAlive(owner["pid"])
+    return time.time() - owner["time"] > staleAge
+
+
+def _breakLock(lockPath, owner):
+    """Move a stale lock out of the way with a rename to a unique name, only one of the
+    saves waiting on it can win the rename so it is never broken twice.
+
+    Args:
+        lockPath (string):
+        owner (dict): the owner the lock was judged stale for
+    """
+    stalePath = "{}.{}.{}.stale".format(lockPath, os.getpid(), next(_TMP_IDS))
+    try:
+        os.rename(lockPath, stalePath)
+    except OSError:
+        # Another save broke it first.
+        return
+
+    try:
+        if _readLockOwner(stalePath) != owner:
+            # The lock was broken and taken again between reading and renaming it, put it back.
+            with contextlib.suppress(FileExistsError):
+                os.link(stalePath, lockPath)
+            return
+        logger.warning("Removed stale config lock %s held by %s", lockPath, owner)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(stalePath)
+
+
+def _atomicWrite(filepath, raw):
+    """Write to a temp file in the same folder, fsync it then replace filepath with it.
+    Readers see the old file or the new one, never a partly written one.
+
+    Args:
+        filepath (string):
+        raw (bytes):
+    """
+    dirPath = os.path.dirname(os.path.abspath(filepath))
+    tmpPath = os.path.join(
+        dirPath,
+        ".{}.{}.{}.tmp".format(os.path.basename(filepath), os.getpid(), next(_TMP_IDS)),
+    )
+    # Created like a normal file so the saved config keeps the usual permissions.
+    fd = os.open(tmpPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as outfile:
+            outfile.write(raw)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+
+        for attempt in range(5):
+            try:
+                os.replace(tmpPath, filepath)
+                break
+            except PermissionError:
+                # Windows refuses while a reader has the file open, give it a moment.
+                if attempt == 4:
+                    raise
+                time.sleep(0.1)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmpPath)
+        raise
+
+    if os.name == "posix":
+        dirFd = os.open(dirPath, os.O_RDONLY)
+        try:
+            os.fsync(dirFd)
+        finally:
+            os.close(dirFd)
+
+
+def saveConfig(filepath, data, timeout=LOCK_TIMEOUT):
     """Save the json file using the configName and the dict()
+    The save is atomic and holds the config's lock, see configLock.
 
     Args:
         filepath (string):
         data (dict):
+        timeout (float): seconds to wait for another save to finish
+
+    Raises:
+        ConfigLockError:
     """
     if not filepath:
         return None
@@ -301,5 +767,7 @@ def saveConfig(filepath, data):
         filepath = "{}.json".format(filepath)
 
     logger.debug("Saving config: %s", filepath)
-    with open(filepath, "w") as outfile:
-        outfile.write(json.dumps(data))
+    raw = _dumps(data)
+    with configLock(filepath, timeout=timeout):
+        _atomicWrite(filepath, raw)
+    clearConfigCache(filepath)
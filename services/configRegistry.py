@@ -0,0 +1,257 @@
+import os
+import json
+import logging
+from dataclasses import dataclass, field, asdict
+from services import configManger as ss_configManager
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+REGISTRY_PATH = os.path.join(os.path.expanduser("~"), ".switch", "configRegistry.json")
+REGISTRY_VERSION = 1
+
+
+@dataclass
+class ConfigEntry:
+    """The little we need to know about a config to list it, without keeping the Config around."""
+
+    configPath: str
+    projectName: str = ""
+    projectPath: str = ""
+    configRoot: str = ""
+    roots: list = field(default_factory=list)
+    mtime: float = 0.0
+    size: int = 0
+
+    def configName(self):
+        return ss_configManager.getConfigNameFromFilePath(self.configPath)
+
+
+def _normalize(path):
+    return os.path.abspath(path).replace("\\", "/")
+
+
+def readEntry(configPath, stat=None):
+    """Read the metadata of a config file.
+
+    Args:
+        configPath (str):
+        stat (os.stat_result): optional, saves another stat
+
+    Returns:
+        ConfigEntry: None if the file isn't a valid config
+    """
+    try:
+        stat = stat or os.stat(configPath)
+        data = ss_configManager.loadJson(configPath)
+    except (OSError, ValueError) as e:
+        logger.warning("Skipping config %s: %s", configPath, e)
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    return ConfigEntry(
+        configPath=configPath,
+        projectName=data.get("projectName", "") or "",
+        projectPath=data.get("projectPath", "") or "",
+        configRoot=data.get("configRoot", "") or "",
+        roots=sorted((data.get("ROOTS") or {}).keys()),
+        mtime=stat.st_mtime,
+        size=stat.st_size,
+    )
+
+
+class ConfigRegistry:
+    def __init__(self, registryPath=None, configsDir=None):
+        """An index of the configs in the configs folder and any registered folders.
+        The metadata is kept in a small json cache so only new or changed config files are ever read,
+        full Configs are only loaded when asked for with getConfig.
+
+        Args:
+            registryPath (str): optional, defaults to REGISTRY_PATH
+            configsDir (str): optional, defaults to the configs folder shipped with switch
+        """
+        self.registryPath = registryPath or REGISTRY_PATH
+        self.configsDir = _normalize(configsDir or ss_configManager.getConfigsDir())
+        self._directories = list()
+        # {configPath: ConfigEntry}
+        self._entries = dict()
+        # {configPath: (mtime, size)} of files that aren't valid configs, skipped until they change
+        self._failed = dict()
+        # Changes not in the cache yet
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.isfile(self.registryPath):
+            return
+
+        try:
+            with open(self.registryPath) as infile:
+                data = json.load(infile)
+        except (OSError, ValueError) as e:
+            # It's only a cache, it gets rebuilt on the next refresh.
+            logger.warning(
+                "Ignoring damaged config registry %s: %s", self.registryPath, e
+            )
+            return
+
+        if data.get("version") != REGISTRY_VERSION:
+            return
+
+        self._directories = [
+            _normalize(dirPath) for dirPath in data.get("directories", [])
+        ]
+        for entryData in data.get("entries", []):
+            try:
+                entry = ConfigEntry(**entryData)
+            except TypeError:
+                continue
+            self._entries[entry.configPath] = entry
+        for configPath, mtime, size in data.get("failed", []):
+            self._failed[configPath] = (mtime, size)
+
+    def save(self):
+        """Write the registry cache."""
+        os.makedirs(os.path.dirname(self.registryPath), exist_ok=True)
+        data = {
+            "version": REGISTRY_VERSION,
+            "directories": self._directories,
+            "entries": [asdict(entry) for entry in self.entries()],
+            "failed": [
+                [configPath, mtime, size]
+                for configPath, (mtime, size) in sorted(self._failed.items())
+            ],
+        }
+        tmpPath = "{}.{}.tmp".format(self.registryPath, os.getpid())
+        with open(tmpPath, "w") as outfile:
+            json.dump(data, outfile, indent=2)
+        os.replace(tmpPath, self.registryPath)
+        self._dirty = False
+
+    def directories(self):
+        """
+        Returns:
+            list[str]: the configs folder followed by the registered folders
+        """
+        return [self.configsDir] + [
+            dirPath for dirPath in self._directories if dirPath != self.configsDir
+        ]
+
+    def registerDirectory(self, dirPath):
+        """Index the configs in another folder too, eg: a show's config folder on the server.
+
+        Args:
+            dirPath (str):
+
+        Returns:
+            list[ConfigEntry]: see refresh
+        """
+        dirPath = _normalize(dirPath)
+        if dirPath not in self.directories():
+            self._directories.append(dirPath)
+            self._dirty = True
+        return self.refresh()
+
+    def unregisterDirectory(self, dirPath):
+        """
+        Args:
+            dirPath (str):
+
+        Returns:
+            list[ConfigEntry]: see refresh
+        """
+        dirPath = _normalize(dirPath)
+        if dirPath in self._directories:
+            self._directories.remove(dirPath)
+            self._dirty = True
+        return self.refresh()
+
+    def refresh(self):
+        """Update the index with one scandir per folder. Config files are only read
+        if they are new or their mtime / size changed, deleted configs are dropped.
+        A file that isn't a valid config isn't read again until it changes.
+
+        Returns:
+            list[ConfigEntry]
+        """
+        entries = dict()
+        failed = dict()
+        changed = False
+        for dirPath in self.directories():
+            try:
+                with os.scandir(dirPath) as dirEntries:
+                    files = [
+                        dirEntry
+                        for dirEntry in dirEntries
+                        if dirEntry.name.endswith(".json") and dirEntry.is_file()
+                    ]
+            except OSError:
+                logger.debug("Config folder %s isn't available.", dirPath)
+                continue
+
+            for dirEntry in files:
+                configPath = "/".join([dirPath, dirEntry.name])
+                stat = dirEntry.stat()
+                stamp = (stat.st_mtime, stat.st_size)
+                if self._failed.get(configPath) == stamp:
+                    failed[configPath] = stamp
+                    continue
+
+                entry = self._entries.get(configPath)
+                if entry is None or (entry.mtime, entry.size) != stamp:
+                    entry = readEntry(configPath, stat=stat)
+                    changed = True
+                if entry is None:
+                    failed[configPath] = stamp
+                else:
+                    entries[configPath] = entry
+
+        changed = (
+            changed
+            or self._dirty
+            or set(entries) != set(self._entries)
+            or failed != self._failed
+        )
+        self._entries = entries
+        self._failed = failed
+        if changed:
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning("Failed to save the config registry: %s", e)
+
+        return self.entries()
+
+    def entries(self):
+        """
+        Returns:
+            list[ConfigEntry]: sorted by projectName then configPath
+        """
+        return sorted(
+            self._entries.values(),
+            key=lambda entry: (entry.projectName.lower(), entry.configPath),
+        )
+
+    def getEntry(self, configPath):
+        """
+        Args:
+            configPath (str):
+
+        Returns:
+            ConfigEntry
+        """
+        return self._entries.get(_normalize(configPath))
+
+    def getConfig(self, configPath):
+        """Load the full Config, see configManger.getConfigByFilePath.
+
+        Args:
+            configPath (str):
+
+        Returns:
+            Config
+        """
+        return ss_configManager.getConfigByFilePath(configPath)
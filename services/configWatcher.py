@@ -0,0 +1,113 @@
+import os
+import logging
+from PySide6 import QtCore
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+DEBOUNCE_MS = 300
+
+
+class ConfigWatcher(QtCore.QObject):
+    fileChanged = QtCore.Signal(str, name="fileChanged")
+
+    def __init__(self, debounceMs=DEBOUNCE_MS, parent=None):
+        """Watches config files on disk and emits fileChanged once an edit has settled.
+        Editors often save with several writes or by replacing the file, so changes are
+        collected until nothing has changed for debounceMs and each changed file is emitted once.
+
+        Args:
+            debounceMs (int):
+            parent (QObject):
+        """
+        super().__init__(parent=parent)
+        self._paths = set()
+        self._pending = set()
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._changed)
+        # A file replaced by a save (write temp + rename) drops out of the watcher,
+        # watching the folder catches it coming back.
+        self._watcher.directoryChanged.connect(self._directoryChanged)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounceMs)
+        self._timer.timeout.connect(self._flush)
+
+    def _normalize(self, filepath):
+        return os.path.abspath(filepath).replace("\\", "/")
+
+    def watch(self, filepath):
+        """
+        Args:
+            filepath (str): path to the config.json
+        """
+        filepath = self._normalize(filepath)
+        self._paths.add(filepath)
+        if os.path.isfile(filepath) and filepath not in self._watcher.files():
+            self._watcher.addPath(filepath)
+
+        dirPath = os.path.dirname(filepath)
+        if os.path.isdir(dirPath) and dirPath not in self._watcher.directories():
+            self._watcher.addPath(dirPath)
+
+    def unwatch(self, filepath):
+        """
+        Args:
+            filepath (str):
+        """
+        filepath = self._normalize(filepath)
+        self._paths.discard(filepath)
+        self._pending.discard(filepath)
+        if filepath in self._watcher.files():
+            self._watcher.removePath(filepath)
+
+        dirPath = os.path.dirname(filepath)
+        if dirPath in self._watcher.directories() and not any(
+            os.path.dirname(path) == dirPath for path in self._paths
+        ):
+            self._watcher.removePath(dirPath)
+
+    def clear(self):
+        """Stop watching everything."""
+        for filepath in list(self._paths):
+            self.unwatch(filepath)
+
+    def watched(self):
+        """
+        Returns:
+            list[str]
+        """
+        return sorted(self._paths)
+
+    def _changed(self, filepath):
+        filepath = self._normalize(filepath)
+        if filepath not in self._paths:
+            return
+
+        self._pending.add(filepath)
+        self._timer.start()
+
+    def _directoryChanged(self, dirPath):
+        watchedFiles = self._watcher.files()
+        for filepath in self._paths:
+            if os.path.dirname(filepath) != self._normalize(dirPath):
+                continue
+            if os.path.isfile(filepath) and filepath not in watchedFiles:
+                self._watcher.addPath(filepath)
+                self._changed(filepath)
+
+    def _flush(self):
+        pending = sorted(self._pending)
+        self._pending.clear()
+        for filepath in pending:
+            if not os.path.isfile(filepath):
+                # Mid save, the replacement will show up through _directoryChanged.
+                continue
+
+            if filepath not in self._watcher.files():
+                self._watcher.addPath(filepath)
+
+            logger.debug("Config changed on disk: %s", filepath)
+            self.fileChanged.emit(filepath)
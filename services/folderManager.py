@@ -1,11 +1,43 @@
 import os
+import csv
+import json
+import time
 import logging
-from PySide6 import QtCore
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from services import journalManager as ss_journalManager
+from services import seedManager as ss_seedManager
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
 logging.basicConfig()
 
+# {configPath: (mtime, plan)}
+_SCHEMA_PLANS = {}
+MAX_WORKERS = 8
+
+
+@dataclass
+class CreateResult:
+    """Outcome of creating a single asset's folders."""
+
+    assetType: str
+    assetName: str
+    success: bool
+    duration: float
+    error: str = ""
+
+
+@dataclass
+class FolderPlan:
+    """The schema folders of an asset split into those on disk and those still to create."""
+
+    folderPath: str
+    existing: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+    rootExists: bool = False
+    seeded: list = field(default_factory=list)
+
 
 def _getBaseFolderPath(config):
     """Combine the root folders into a string
@@ -22,26 +54,198 @@ def _getBaseFolderPath(config):
     return base
 
 
-def _createFolders(pathTo, folderData):
-    """Used recursively through the folderData to create all the schema's folders.
+def _getAssetFolderPath(config, assetType, assetName):
+    """The full path to the asset's root folder.
+
+    Args:
+        config (Config):
+        assetType (str):
+        assetName (str):
+
+    Returns:
+        str
+    """
+    return os.path.sep.join(
+        [
+            _getBaseFolderPath(config),
+            config.projectName(),
+            config.configRoot(),
+            assetType,
+            assetName,
+        ]
+    )
+
+
+def _iterSchemaPaths(nodes, tokens):
+    """Used recursively through the schema graph to yield every relative folder path of the schema.
+
+    Args:
+        nodes (tuple(SchemaNode)):
+        tokens (tuple(str)): parent folder names
+
+    Yields:
+        tuple(str)
+    """
+    for node in nodes:
+        folderTokens = tokens + (node.name,)
+        yield folderTokens
+        yield from _iterSchemaPaths(node.children, folderTokens)
+
+
+def compileSchema(config):
+    """Flatten the config's BASEFOLDERS into an ordered, de-duplicated list of relative folder paths.
+
+    Args:
+        config (Config):
+
+    Raises:
+        SchemaError: see Config.schemaGraph
+
+    Returns:
+        tuple(str)
+    """
+    paths = dict()
+    for tokens in _iterSchemaPaths(config.schemaGraph(), ()):
+        paths.setdefault(os.path.sep.join(tokens), None)
+
+    return tuple(paths.keys())
+
+
+def _configMTime(config):
+    configPath = config.configPath()
+    if not isinstance(configPath, str) or not os.path.isfile(configPath):
+        return None, None
+
+    configPath = os.path.abspath(configPath)
+    return configPath, os.stat(configPath).st_mtime_ns
+
+
+def getSchemaPlan(config):
+    """Fetch the compiled schema for the config. Cached against the config file's mtime.
+    Configs that don't exist on disk (eg: previews) are compiled fresh each time.
 
     Args:
-        pathTo (str):
-        folderData (dict):
+        config (Config):
+
+    Returns:
+        tuple(str)
     """
-    for folderName, subFolders in folderData.items():
-        folderPath = os.path.sep.join([pathTo, folderName])
-        if not os.path.isdir(folderPath):
-            qdir = QtCore.QDir()
-            qdir.mkpath(folderPath)
+    configPath, mtime = _configMTime(config)
+    if configPath is None:
+        return compileSchema(config)
 
-        if subFolders is None:
-            continue
+    cached = _SCHEMA_PLANS.get(configPath)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
 
-        _createFolders(folderPath, subFolders)
+    plan = compileSchema(config)
+    _SCHEMA_PLANS[configPath] = (mtime, plan)
+    logger.debug("Compiled schema plan for %s: %s folders", configPath, len(plan))
+    return plan
 
 
-def createFolders(config, assetType, assetName):
+def getLeafFolders(plan):
+    """The folders in the plan that are not a parent of another folder in the plan.
+    Creating these creates the whole plan.
+
+    Args:
+        plan (tuple(str)):
+
+    Returns:
+        list[str]
+    """
+    parents = set()
+    for relPath in plan:
+        tokens = relPath.split(os.path.sep)
+        for idx in range(1, len(tokens)):
+            parents.add(os.path.sep.join(tokens[:idx]))
+
+    return [relPath for relPath in plan if relPath not in parents]
+
+
+def _scanSubFolders(dirPath):
+    """Names of the folders directly under dirPath using a single scandir.
+
+    Args:
+        dirPath (str):
+
+    Returns:
+        set(str) or None if dirPath doesn't exist
+    """
+    try:
+        with os.scandir(dirPath) as entries:
+            return {entry.name for entry in entries if entry.is_dir()}
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def diffSchemaPlan(folderPath, plan):
+    """Split the plan into the folders that already exist under folderPath and those that are missing.
+    Only reads from disk; one scandir per existing parent folder, nothing below a missing one.
+
+    Args:
+        folderPath (str): the asset's root folder
+        plan (tuple(str)): relative folder paths, see getSchemaPlan
+
+    Returns:
+        FolderPlan
+    """
+    # {relParentPath: set(childNames) or None}, "" is the asset's root folder
+    listings = dict()
+
+    def exists(relPath):
+        parent, name = os.path.split(relPath)
+        if parent not in listings:
+            if parent and not exists(parent):
+                listings[parent] = None
+            else:
+                listings[parent] = _scanSubFolders(
+                    os.path.sep.join([folderPath, parent]) if parent else folderPath
+                )
+
+        children = listings[parent]
+        return children is not None and name in children
+
+    folderPlan = FolderPlan(folderPath=folderPath)
+    for relPath in plan:
+        if exists(relPath):
+            folderPlan.existing.append(relPath)
+        else:
+            folderPlan.missing.append(relPath)
+
+    if not plan:
+        folderPlan.rootExists = os.path.isdir(folderPath)
+    else:
+        folderPlan.rootExists = listings.get("") is not None
+
+    return folderPlan
+
+
+def planFolders(config, assetType, assetName):
+    """Report which schema folders already exist for the asset and which would be created. Doesn't create anything.
+
+    Args:
+        config (Config):
+        assetType (str):
+        assetName (str):
+
+    Returns:
+        FolderPlan
+    """
+    folderPath = _getAssetFolderPath(config, assetType, assetName)
+    return diffSchemaPlan(folderPath, getSchemaPlan(config))
+
+
+def createFolders(
+    config,
+    assetType,
+    assetName,
+    dryRun=False,
+    journalled=True,
+    seed=True,
+    progress=None,
+    isCancelled=None,
+):
     """
 
     Args:
@@ -51,27 +255,239 @@ def createFolders(config, assetType, assetName):
             The name of the assetType folder.For a valid list check the Config class eg: CHAR PROP etc
         assetName (str):
             The name of the asset
+        dryRun (bool):
+            Only report what would be created.
+        journalled (bool):
+            Record the folders about to be created so a failure, a cancel or a crash
+            (see journalManager.recoverJournals) removes them again.
+        seed (bool):
+            Copy the config's SEEDFILES templates into the asset, see seedManager.getSeedFiles.
+        progress (callable):
+            Optional, called with (done, total) as the folders are created.
+        isCancelled (callable):
+            Optional, returning True stops before the next folder is created.
+
+    Returns:
+        FolderPlan
     """
-    baseFolderPath = _getBaseFolderPath(config)
-    folderPath = os.path.sep.join(
-        [
-            baseFolderPath,
-            config.projectName(),
-            config.configRoot(),
-            assetType,
-            assetName,
-        ]
-    )
+    folderPlan = planFolders(config, assetType, assetName)
     logger.debug(
         "Creating folders for assetType: %s | assetName: %s", assetType, assetName
     )
-    logger.debug("baseFolderPath: %s", baseFolderPath)
-    logger.debug("folderPath: %s", folderPath)
-    if not os.path.isdir(folderPath):
-        qdir = QtCore.QDir()
-        qdir.setPath(folderPath)
-        qdir.makeAbsolute()
-        qdir.mkpath(folderPath)
-        logger.debug("Created %s ", qdir.path())
-
-    _createFolders(folderPath, config.parseBaseFolders())
+    logger.debug(
+        "folderPath: %s existing: %s missing: %s",
+        folderPlan.folderPath,
+        len(folderPlan.existing),
+        len(folderPlan.missing),
+    )
+    seeds = []
+    if seed:
+        seeds = ss_seedManager.getSeedFiles(config, getSchemaPlan(config), assetName)
+
+    if dryRun or (folderPlan.rootExists and not folderPlan.missing and not seeds):
+        return folderPlan
+
+    journal = None
+    if journalled:
+        # A single entry of everything up front keeps this cheap, rollback skips what was never made.
+        toCreate = [] if folderPlan.rootExists else [folderPlan.folderPath]
+        toCreate += [
+            os.path.sep.join([folderPlan.folderPath, relPath])
+            for relPath in folderPlan.missing
+        ]
+        journal = ss_journalManager.Journal(ss_journalManager.newJournalPath("create"))
+        if toCreate:
+            journal.record("mkdir", paths=toCreate)
+
+    try:
+        _makeFolders(folderPlan, progress=progress, isCancelled=isCancelled)
+        if seeds and not (isCancelled is not None and isCancelled()):
+            folderPlan.seeded = ss_seedManager.seedFolders(
+                seeds,
+                folderPlan.folderPath,
+                allowHardlink=config.seedHardlinks(),
+                journal=journal,
+            )
+    except Exception:
+        if journal is not None:
+            logger.error("Rolling back %s", folderPlan.folderPath)
+            journal.rollback()
+        raise
+
+    if journal is not None:
+        if isCancelled is not None and isCancelled():
+            journal.rollback()
+        else:
+            journal.commit()
+
+    logger.debug("Created %s ", folderPlan.folderPath)
+    return folderPlan
+
+
+def _makeFolders(folderPlan, progress=None, isCancelled=None):
+    if not folderPlan.missing:
+        os.makedirs(folderPlan.folderPath, exist_ok=True)
+
+    leaves = getLeafFolders(folderPlan.missing)
+    for idx, relPath in enumerate(leaves):
+        if isCancelled is not None and isCancelled():
+            logger.info("Cancelled creating %s", folderPlan.folderPath)
+            return
+
+        os.makedirs(os.path.sep.join([folderPlan.folderPath, relPath]), exist_ok=True)
+        if progress is not None:
+            progress(idx + 1, len(leaves))
+
+
+def loadManifest(filepath):
+    """Load the (assetType, assetName) rows from a .csv or .json manifest.
+
+    csv: one `assetType,assetName` per row, an optional header row is skipped.
+    json: [["Character", "Arachne"], ...], [{"assetType": "Character", "assetName": "Arachne"}, ...]
+        or {"Character": ["Arachne", ...]}
+
+    Args:
+        filepath (str):
+
+    Returns:
+        list[tuple(str, str)]
+    """
+    rows = []
+    if filepath.lower().endswith(".json"):
+        with open(filepath) as infile:
+            data = json.load(infile)
+
+        if isinstance(data, dict):
+            for assetType, assetNames in data.items():
+                rows.extend((assetType, assetName) for assetName in assetNames)
+        else:
+            for row in data:
+                if isinstance(row, dict):
+                    rows.append((row["assetType"], row["assetName"]))
+                else:
+                    rows.append((row[0], row[1]))
+    else:
+        with open(filepath, newline="") as infile:
+            for row in csv.reader(infile):
+                row = [token.strip() for token in row]
+                if len(row) < 2 or not row[0] or not row[1]:
+                    continue
+                if [token.lower() for token in row[:2]] == ["assettype", "assetname"]:
+                    continue
+                rows.append((row[0], row[1]))
+
+    # Drop duplicates but keep the manifest order
+    return list(dict.fromkeys(rows))
+
+
+def _invalidName(name):
+    """Manifest rows name a single folder, anything that could reach outside the project is rejected.
+
+    Args:
+        name (str): an assetType or assetName
+
+    Returns:
+        str: why the name can't be used, empty if it can
+    """
+    if not isinstance(name, str) or not name.strip():
+        return "empty name"
+    if "/" in name or "\\" in name:
+        return "path separator in {!r}".format(name)
+    if name.strip() in (".", ".."):
+        return "relative name {!r}".format(name)
+    if ":" in name or os.path.isabs(name):
+        return "drive or absolute path {!r}".format(name)
+    return ""
+
+
+def _createFoldersTimed(config, assetType, assetName):
+    start = time.perf_counter()
+    error = _invalidName(assetType) or _invalidName(assetName)
+    if error:
+        logger.error("Skipping %s/%s: %s", assetType, assetName, error)
+        return CreateResult(assetType, assetName, False, 0.0, error)
+
+    try:
+        createFolders(config, assetType, assetName)
+    except Exception as e:
+        # One bad asset never stops the rest of the batch.
+        logger.error("Failed to create %s/%s: %s", assetType, assetName, e)
+        return CreateResult(
+            assetType, assetName, False, time.perf_counter() - start, str(e)
+        )
+
+    return CreateResult(assetType, assetName, True, time.perf_counter() - start)
+
+
+def bulkCreateFolders(
+    config,
+    assets,
+    maxWorkers=MAX_WORKERS,
+    callback=None,
+    progress=None,
+    isCancelled=None,
+):
+    """Create the folders for many assets at once on a bounded thread pool.
+
+    Args:
+        config (Config):
+        assets (list[tuple(str, str)]): (assetType, assetName) pairs
+        maxWorkers (int): max number of assets being created at the same time
+        callback (callable): optional, called with each CreateResult as it finishes
+        progress (callable): optional, called with (done, total) assets
+        isCancelled (callable): optional, returning True drops any assets not yet started
+
+    Returns:
+        list[CreateResult]: in the same order as assets, minus any cancelled
+    """
+    # Compile once up front so the workers share the cached plan.
+    getSchemaPlan(config)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        futures = {
+            executor.submit(_createFoldersTimed, config, assetType, assetName): idx
+            for idx, (assetType, assetName) in enumerate(assets)
+        }
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+
+            result = future.result()
+            results[futures[future]] = result
+            if callback is not None:
+                callback(result)
+            if progress is not None:
+                progress(len(results), len(assets))
+            if isCancelled is not None and isCancelled():
+                for pending in futures:
+                    pending.cancel()
+
+    return [results[idx] for idx in range(len(assets)) if idx in results]
+
+
+def createFoldersFromManifest(
+    config, filepath, maxWorkers=MAX_WORKERS, callback=None, **kwargs
+):
+    """Create every asset listed in a manifest. See loadManifest for the formats.
+
+    Args:
+        config (Config):
+        filepath (str): path to the .csv or .json manifest
+        maxWorkers (int):
+        callback (callable):
+        **kwargs: progress, isCancelled see bulkCreateFolders
+
+    Returns:
+        list[CreateResult]
+    """
+    assets = loadManifest(filepath)
+    logger.info("Creating %s assets from %s", len(assets), filepath)
+    results = bulkCreateFolders(
+        config, assets, maxWorkers=maxWorkers, callback=callback, **kwargs
+    )
+    failed = [result for result in results if not result.success]
+    logger.info(
+        "Created %s assets, %s failed.", len(results) - len(failed), len(failed)
+    )
+    return results
@@ -0,0 +1,116 @@
+import logging
+import itertools
+import threading
+from PySide6 import QtCore
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+_JOB_IDS = itertools.count(1)
+
+
+class JobSignals(QtCore.QObject):
+    """Signals for a Job. A QRunnable isn't a QObject so can't emit these itself."""
+
+    progress = QtCore.Signal(str, int, int, name="progress")
+    result = QtCore.Signal(str, object, name="result")
+    finished = QtCore.Signal(str, object, name="finished")
+    error = QtCore.Signal(str, str, name="error")
+    cancelled = QtCore.Signal(str, name="cancelled")
+
+
+class Job(QtCore.QRunnable):
+    def __init__(self, label, func, streamResults=False, **kwargs):
+        """Runs func(progress=, isCancelled=, **kwargs) on a QThreadPool thread.
+
+        func should call progress(done, total) as it goes and stop early when isCancelled() returns True.
+
+        Args:
+            label (string): Display name for the job eg: Character/Arachne
+            func (callable):
+            streamResults (bool): also pass func a callback=, each value it's called with is emitted by signals.result
+            **kwargs: passed along to func
+        """
+        super().__init__()
+        self.label = label
+        self.jobId = "{}#{}".format(label, next(_JOB_IDS))
+        self.signals = JobSignals()
+        self._func = func
+        self._kwargs = kwargs
+        if streamResults:
+            self._kwargs["callback"] = self._result
+        self._cancelEvent = threading.Event()
+
+    def cancel(self):
+        self._cancelEvent.set()
+
+    def isCancelled(self):
+        return self._cancelEvent.is_set()
+
+    def _progress(self, done, total):
+        self.signals.progress.emit(self.jobId, done, total)
+
+    def _result(self, value):
+        self.signals.result.emit(self.jobId, value)
+
+    def run(self):
+        try:
+            result = self._func(
+                progress=self._progress, isCancelled=self.isCancelled, **self._kwargs
+            )
+        except Exception as e:
+            logger.exception("Job %s failed!", self.jobId)
+            self.signals.error.emit(self.jobId, str(e))
+            return
+
+        if self.isCancelled():
+            logger.info("Job %s cancelled.", self.jobId)
+            self.signals.cancelled.emit(self.jobId)
+            return
+
+        self.signals.finished.emit(self.jobId, result)
+
+
+class JobManager(QtCore.QObject):
+    """Keeps hold of the running jobs so they can be cancelled, and drops them when they're done."""
+
+    def __init__(self, maxThreadCount=None, parent=None):
+        super().__init__(parent=parent)
+        self._pool = QtCore.QThreadPool(self)
+        if maxThreadCount is not None:
+            self._pool.setMaxThreadCount(maxThreadCount)
+        self._jobs = dict()
+
+    def start(self, job):
+        """
+        Args:
+            job (Job):
+
+        Returns:
+            Job
+        """
+        self._jobs[job.jobId] = job
+        job.signals.finished.connect(self._remove)
+        job.signals.error.connect(self._remove)
+        job.signals.cancelled.connect(self._remove)
+        self._pool.start(job)
+        return job
+
+    def _remove(self, jobId, *args):
+        self._jobs.pop(jobId, None)
+
+    def jobs(self):
+        return list(self._jobs.values())
+
+    def cancel(self, jobId):
+        job = self._jobs.get(jobId)
+        if job is not None:
+            job.cancel()
+
+    def cancelAll(self):
+        for job in self.jobs():
+            job.cancel()
+
+    def waitForDone(self, msecs=-1):
+        return self._pool.waitForDone(msecs)
@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import threading
+import itertools
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".switch", "journals")
+_JOURNAL_IDS = itertools.count(1)
+# The journals this process has open, see recoverJournals
+_OPEN_JOURNALS = set()
+_OPEN_LOCK = threading.Lock()
+# Windows GetExitCodeProcess for a process that hasn't exited.
+_STILL_ACTIVE = 259
+
+
+def getJournalDir():
+    """The folder the journals are written to. eg: ~/.switch/journals
+
+    Returns:
+        str
+    """
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+    return JOURNAL_DIR
+
+
+def newJournalPath(prefix):
+    """A new, unique journal file path.
+
+    Args:
+        prefix (str): eg: migrate
+
+    Returns:
+        str
+    """
+    fileName = "{}_{}_{}_{}.jsonl".format(
+        prefix, time.strftime("%Y%m%d-%H%M%S"), os.getpid(), next(_JOURNAL_IDS)
+    )
+    return os.path.join(getJournalDir(), fileName)
+
+
+def _readEntries(filepath):
+    entries = []
+    with open(filepath) as infile:
+        for line in infile:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning("Skipping damaged journal line in %s", filepath)
+
+    return entries
+
+
+def readJournal(filepath):
+    """Read the changes back out of a journal. A partly written last line (eg: from a crash) is ignored.
+
+    Args:
+        filepath (str):
+
+    Returns:
+        list[dict]
+    """
+    return [entry for entry in _readEntries(filepath) if entry.get("action") != "owner"]
+
+
+def journalOwner(filepath):
+    """
+    Args:
+        filepath (str):
+
+    Returns:
+        dict: the pid and host of the process that wrote the journal, None for journals from before they were recorded
+    """
+    with open(filepath) as infile:
+        line = infile.readline()
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if entry.get("action") == "owner" else None
+
+
+def processAlive(pid):
+    """
+    Args:
+        pid (int): a process on this host
+
+    Returns:
+        bool: True if the process is still running, or can't be checked
+    """
+    if sys.platform == "win32":
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        # PROCESS_QUERY_LIMITED_INFORMATION
+        handle = kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return ctypes.GetLastError() == 5  # ERROR_ACCESS_DENIED, it exists
+        try:
+            exitCode = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exitCode))
+            return exitCode.value == _STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def isOrphaned(filepath):
+    """A journal is orphaned once the process that wrote it has gone without committing or rolling back.
+    Journals still open in a running switch, on this workstation or another sharing the journal folder, aren't.
+
+    Args:
+        filepath (str):
+
+    Returns:
+        bool
+    """
+    with _OPEN_LOCK:
+        if os.path.abspath(filepath) in _OPEN_JOURNALS:
+            return False
+
+    owner = journalOwner(filepath)
+    if owner is None:
+        # Written before journals recorded their owner.
+        return True
+    if owner["host"] != socket.gethostname():
+        # Only that workstation can tell if it's still running, it recovers its own.
+        return False
+    if owner["pid"] == os.getpid():
+        return True
+    return not processAlive(owner["pid"])
+
+
+def rollbackJournal(filepath):
+    """Undo the changes recorded in a journal, newest first, then remove the journal.
+    Created folders are only removed while they are still empty so nothing added since is ever lost,
+    recorded files (eg: seed files) are removed.
+
+    Args:
+        filepath (str):
+
+    Returns:
+        bool: True if everything was undone
+    """
+    clean = True
+    for entry in reversed(readJournal(filepath)):
+        action = entry.get("action")
+        try:
+            if action == "mkdir":
+                paths = entry.get("paths") or (
+                    [entry["path"]] if "path" in entry else []
+                )
+                for path in reversed(paths):
+                    if os.path.isdir(path) and not os.listdir(path):
+                        os.rmdir(path)
+                    elif os.path.isdir(path):
+                        logger.warning("Not removing %s as it is not empty.", path)
+                        clean = False
+            elif action == "file":
+                for path in reversed(entry.get("paths", [])):
+                    if os.path.isfile(path):
+                        os.remove(path)
+            elif action == "rename":
+                # Recorded before the rename, it may never have happened.
+                if os.path.isdir(entry["dst"]) and not os.path.exists(entry["src"]):
+                    os.rename(entry["dst"], entry["src"])
+                elif not (
+                    os.path.isdir(entry["src"]) and not os.path.exists(entry["dst"])
+                ):
+                    clean = False
+        except OSError as e:
+            logger.error("Failed to roll back %s: %s", entry, e)
+            clean = False
+
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        # eg: still held open by another process on Windows, it's rolled back again next time.
+        logger.error("Failed to remove journal %s: %s", filepath, e)
+        return False
+
+    logger.info("Rolled back %s", filepath)
+    return clean
+
+
+def recoverJournals(prefix):
+    """Roll back any journals with the prefix left behind by a crash.
+    Journals are removed when their work completes so any still on disk are unfinished,
+    those still being written by a running switch are left alone, see isOrphaned.
+
+    Args:
+        prefix (str): eg: create
+
+    Returns:
+        list[str]: the journals rolled back
+    """
+    journalDir = getJournalDir()
+    recovered = []
+    for fileName in sorted(os.listdir(journalDir)):
+        if not fileName.startswith(prefix + "_") or not fileName.endswith(".jsonl"):
+            continue
+
+        filepath = os.path.join(journalDir, fileName)
+        try:
+            if not isOrphaned(filepath):
+                continue
+        except FileNotFoundError:
+            # Committed as it was read.
+            continue
+
+        logger.warning("Recovering unfinished journal %s", filepath)
+        rollbackJournal(filepath)
+        recovered.append(filepath)
+
+    return recovered
+
+
+class Journal:
+    def __init__(self, filepath):
+        """An append only json-lines record of the changes made to disk. Safe to share between threads.
+        The first entry records the owning process so other instances leave it alone while it runs.
+
+        Args:
+            filepath (str):
+        """
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        with _OPEN_LOCK:
+            _OPEN_JOURNALS.add(os.path.abspath(filepath))
+        self._file = open(filepath, "a")
+        if self._file.tell() == 0:
+            self.record("owner", pid=os.getpid(), host=socket.gethostname())
+
+    def record(self, action, **data):
+        """Write an entry and flush it straight to the file.
+
+        Args:
+            action (str): eg: mkdir, rename
+            **data: the json-able details of the change
+        """
+        data["action"] = action
+        line = json.dumps(data)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        with _OPEN_LOCK:
+            _OPEN_JOURNALS.discard(os.path.abspath(self.filepath))
+
+    def commit(self):
+        """The work is complete, the journal isn't needed anymore."""
+        self.close()
+        try:
+            os.remove(self.filepath)
+        except FileNotFoundError:
+            # The work is still done, only the journal went missing.
+            logger.warning("Journal %s was already removed.", self.filepath)
+
+    def rollback(self):
+        """Undo everything recorded so far. See rollbackJournal.
+
+        Returns:
+            bool
+        """
+        self.close()
+        return rollbackJournal(self.filepath)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,281 @@
+import os
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from services import auditManager as ss_auditManager
+from services import folderManager as ss_folderManager
+from services import journalManager as ss_journalManager
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+MAX_WORKERS = 8
+
+
+@dataclass
+class MigrationPlan:
+    """The folder changes between two versions of a config's schema."""
+
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    renames: dict = field(default_factory=dict)
+
+
+@dataclass
+class AssetMigration:
+    """What was (or with a dry run, would be) changed for a single asset."""
+
+    root: str
+    assetName: str
+    folderPath: str
+    created: list = field(default_factory=list)
+    renamed: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    error: str = ""
+
+
+def _normalize(relPath):
+    tokens = relPath.strip().replace("\\", "/").split("/")
+    return os.path.sep.join(token for token in tokens if token)
+
+
+def parseRenames(text):
+    """Parse a rename map from text, one `old/folder -> new/folder` per line.
+
+    Args:
+        text (str):
+
+    Returns:
+        dict
+    """
+    renames = dict()
+    for line in text.splitlines():
+        if "->" not in line:
+            continue
+        old, new = line.split("->", 1)
+        if old.strip() and new.strip():
+            renames[_normalize(old)] = _normalize(new)
+
+    return renames
+
+
+def diffConfigs(oldConfig, newConfig, renames=None):
+    """Compare the schemas of two configs.
+
+    Args:
+        oldConfig (Config): the config the existing assets were created with
+        newConfig (Config): the edited config
+        renames (dict): optional, {"old/relative/folder": "new/relative/folder"}.
+            Renamed folders are moved instead of being created.
+
+    Returns:
+        MigrationPlan
+    """
+    oldPlan = ss_folderManager.compileSchema(oldConfig)
+    newPlan = ss_folderManager.compileSchema(newConfig)
+    renames = {_normalize(old): _normalize(new) for old, new in (renames or {}).items()}
+
+    # Anything that lives under a renamed folder arrives with the rename.
+    def isRenameTarget(relPath):
+        for target in renames.values():
+            if relPath == target or relPath.startswith(target + os.path.sep):
+                return True
+        return False
+
+    oldPaths = set(oldPlan)
+    newPaths = set(newPlan)
+    return MigrationPlan(
+        added=[
+            relPath
+            for relPath in newPlan
+            if relPath not in oldPaths and not isRenameTarget(relPath)
+        ],
+        removed=[relPath for relPath in oldPlan if relPath not in newPaths],
+        renames=renames,
+    )
+
+
+def _missingFolders(dirPath):
+    """
+    Returns:
+        list[str]: dirPath and the parents of it that don't exist yet, top down
+    """
+    missing = []
+    while dirPath and not os.path.isdir(dirPath):
+        missing.insert(0, dirPath)
+        parentPath = os.path.dirname(dirPath)
+        if parentPath == dirPath:
+            break
+        dirPath = parentPath
+    return missing
+
+
+def migrateAsset(
+    migrationPlan, root, assetName, folderPath, journal=None, dryRun=False
+):
+    """Apply the migration plan to a single asset. Renames first, then the added folders.
+    Folders are never deleted, a rename is skipped if its source is missing or its target already exists.
+
+    Args:
+        migrationPlan (MigrationPlan):
+        root (str):
+        assetName (str):
+        folderPath (str): the asset's root folder
+        journal (Journal): optional, every change is recorded to it before it's made so a crash part way
+            through a rename or mkdir is still rolled back
+        dryRun (bool): report only, don't touch the disk
+
+    Returns:
+        AssetMigration
+    """
+    migration = AssetMigration(root=root, assetName=assetName, folderPath=folderPath)
+    try:
+        for oldRelPath, newRelPath in migrationPlan.renames.items():
+            src = os.path.sep.join([folderPath, oldRelPath])
+            dst = os.path.sep.join([folderPath, newRelPath])
+            if not os.path.isdir(src) or os.path.exists(dst):
+                migration.skipped.append(oldRelPath)
+                continue
+
+            migration.renamed.append((oldRelPath, newRelPath))
+            if dryRun:
+                continue
+
+            parents = _missingFolders(os.path.dirname(dst))
+            if journal is not None:
+                if parents:
+                    journal.record("mkdir", paths=parents)
+                journal.record("rename", src=src, dst=dst)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # Same volume move, we never fall back to copying the folder's contents.
+            os.rename(src, dst)
+
+        folderPlan = ss_folderManager.diffSchemaPlan(folderPath, migrationPlan.added)
+        migration.created = folderPlan.missing
+        if dryRun:
+            return migration
+
+        for relPath in folderPlan.missing:
+            dirPath = os.path.sep.join([folderPath, relPath])
+            if journal is not None:
+                journal.record("mkdir", path=dirPath)
+            os.makedirs(dirPath, exist_ok=True)
+    except OSError as e:
+        logger.error("Failed to migrate %s: %s", folderPath, e)
+        migration.error = str(e)
+
+    return migration
+
+
+def iterMigrate(
+    oldConfig,
+    newConfig,
+    renames=None,
+    dryRun=False,
+    journal=None,
+    maxWorkers=MAX_WORKERS,
+    isCancelled=None,
+):
+    """Migrate every existing asset of oldConfig to the schema of newConfig, assets run in parallel.
+
+    Args:
+        oldConfig (Config):
+        newConfig (Config):
+        renames (dict): see diffConfigs
+        dryRun (bool):
+        journal (Journal):
+        maxWorkers (int):
+        isCancelled (callable): optional, returning True stops queuing more assets
+
+    Yields:
+        AssetMigration
+    """
+    migrationPlan = diffConfigs(oldConfig, newConfig, renames=renames)
+    maxPending = maxWorkers * 2
+    pending = set()
+    with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        for root, assetName, folderPath in ss_auditManager.iterAssets(oldConfig):
+            if isCancelled is not None and isCancelled():
+                break
+
+            pending.add(
+                executor.submit(
+                    migrateAsset,
+                    migrationPlan,
+                    root,
+                    assetName,
+                    folderPath,
+                    journal=journal,
+                    dryRun=dryRun,
+                )
+            )
+            if len(pending) < maxPending:
+                continue
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+        for future in pending:
+            yield future.result()
+
+
+def migrateProject(
+    oldConfig,
+    newConfig,
+    renames=None,
+    dryRun=False,
+    journalPath=None,
+    maxWorkers=MAX_WORKERS,
+    callback=None,
+    progress=None,
+    isCancelled=None,
+):
+    """Migrate every existing asset, journaling the changes to getJournalDir() unless it's a dry run.
+
+    Args:
+        oldConfig (Config):
+        newConfig (Config):
+        renames (dict): see diffConfigs
+        dryRun (bool):
+        journalPath (str): optional, defaults to a new journal in getJournalDir()
+        maxWorkers (int):
+        callback (callable): optional, called with each AssetMigration
+        progress (callable): optional, called with (migrated, failed) asset counts
+        isCancelled (callable): optional
+
+    Returns:
+        list[AssetMigration]
+    """
+    journal = None
+    if not dryRun:
+        journal = ss_journalManager.Journal(
+            journalPath or ss_journalManager.newJournalPath("migrate")
+        )
+        logger.info("Journaling migration to %s", journal.filepath)
+
+    results = []
+    failed = 0
+    try:
+        for migration in iterMigrate(
+            oldConfig,
+            newConfig,
+            renames=renames,
+            dryRun=dryRun,
+            journal=journal,
+            maxWorkers=maxWorkers,
+            isCancelled=isCancelled,
+        ):
+            results.append(migration)
+            if migration.error:
+                failed += 1
+            if callback is not None:
+                callback(migration)
+            if progress is not None:
+                progress(len(results), failed)
+    finally:
+        if journal is not None:
+            journal.close()
+
+    return results
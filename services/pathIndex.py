@@ -0,0 +1,185 @@
+import os
+import logging
+from dataclasses import dataclass
+from services import folderManager as ss_folderManager
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+
+@dataclass(frozen=True)
+class PathInfo:
+    """Where a path sits in a project.
+    eg: C:/temp/pandb/assets/Character/Arachne/Model/work/maya/scene.ma
+        root: Character, assetName: Arachne, baseFolder: Model,
+        schemaPath: Model/work/maya, remainder: scene.ma
+    Anything the path doesn't reach is left empty.
+    """
+
+    config: object
+    root: str = ""
+    assetName: str = ""
+    baseFolder: str = ""
+    schemaPath: str = ""
+    remainder: str = ""
+
+    def tokens(self):
+        """
+        Returns:
+            list[str]: root, assetName, the schema folders and the remainder, skipping any that are empty
+        """
+        tokens = [self.root, self.assetName]
+        for relPath in (self.schemaPath, self.remainder):
+            tokens.extend(relPath.split(os.path.sep) if relPath else [])
+        return [token for token in tokens if token]
+
+
+class _Node:
+    __slots__ = ("children", "name", "config", "schemaPath")
+
+    def __init__(self, name=""):
+        # {normcased token: _Node}
+        self.children = dict()
+        self.name = name
+        self.config = None
+        self.schemaPath = None
+
+
+def _key(token):
+    return os.path.normcase(token)
+
+
+def _tokenize(path):
+    return [token for token in path.replace("\\", "/").split("/") if token]
+
+
+def _compileSchemaTrie(plan):
+    """
+    Args:
+        plan (tuple(str)): see folderManager.getSchemaPlan
+
+    Returns:
+        _Node
+    """
+    trie = _Node()
+    for relPath in plan:
+        node = trie
+        for token in relPath.split(os.path.sep):
+            node = node.children.setdefault(_key(token), _Node(token))
+        node.schemaPath = relPath
+
+    return trie
+
+
+class PathIndex:
+    def __init__(self, configs=()):
+        """Answers which config, root, asset and schema folder a path belongs to.
+        Each config's rootPathTokens and compiled schema become a trie, so a lookup is a
+        dict lookup per path token no matter how many configs or schema folders there are.
+
+        Args:
+            configs (list[Config]):
+        """
+        self._projects = _Node()
+        # {id(config): (roots {normcased root: root}, schema trie)}
+        self._configs = dict()
+        for config in configs:
+            self.add(config)
+
+    def add(self, config):
+        """Index the config, replacing any config with the same rootPathTokens.
+
+        Args:
+            config (Config):
+        """
+        node = self._projects
+        for token in _tokenize("/".join(config.rootPathTokens())):
+            node = node.children.setdefault(_key(token), _Node(token))
+
+        if node.config is not None:
+            self._configs.pop(id(node.config), None)
+
+        node.config = config
+        self._configs[id(config)] = (
+            {_key(root): root for root in config.iterRoots()},
+            _compileSchemaTrie(ss_folderManager.getSchemaPlan(config)),
+        )
+
+    def configs(self):
+        """
+        Returns:
+            list[Config]
+        """
+        found = []
+        toVisit = [self._projects]
+        while toVisit:
+            node = toVisit.pop()
+            if node.config is not None:
+                found.append(node.config)
+            toVisit.extend(node.children.values())
+
+        return found
+
+    def lookup(self, path):
+        """
+        Args:
+            path (str): any file or folder path, / or \\ separated
+
+        Returns:
+            PathInfo: None if the path isn't under any indexed config's rootPathTokens
+        """
+        tokens = _tokenize(path)
+        node = self._projects
+        config = None
+        idx = 0
+        # The longest project prefix wins, configs can nest inside each other's projects.
+        for tokenIdx, token in enumerate(tokens):
+            node = node.children.get(_key(token))
+            if node is None:
+                break
+            if node.config is not None:
+                config = node.config
+                idx = tokenIdx + 1
+
+        if config is None:
+            return None
+
+        roots, schemaTrie = self._configs[id(config)]
+        rest = tokens[idx:]
+        if not rest or _key(rest[0]) not in roots:
+            return PathInfo(config=config, remainder=os.path.sep.join(rest))
+
+        root = roots[_key(rest[0])]
+        if len(rest) == 1:
+            return PathInfo(config=config, root=root)
+
+        assetName = rest[1]
+        node = schemaTrie
+        schemaPath = ""
+        matched = 0
+        for tokenIdx, token in enumerate(rest[2:]):
+            node = node.children.get(_key(token))
+            if node is None:
+                break
+            schemaPath = node.schemaPath or schemaPath
+            matched = tokenIdx + 1
+
+        return PathInfo(
+            config=config,
+            root=root,
+            assetName=assetName,
+            baseFolder=schemaPath.split(os.path.sep)[0] if schemaPath else "",
+            schemaPath=schemaPath,
+            remainder=os.path.sep.join(rest[2 + matched :]),
+        )
+
+    def lookupMany(self, paths):
+        """
+        Args:
+            paths (list[str]):
+
+        Returns:
+            list[PathInfo]
+        """
+        return [self.lookup(path) for path in paths]
@@ -0,0 +1,211 @@
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+# A field matches a single folder / file name unless it gives its own pattern, eg: {version:v\d{3}}
+FIELD_PATTERN = r"[^/]+"
+
+
+class TemplateError(ValueError):
+    """The template is malformed or a field needed to build the path is missing."""
+
+
+def _tokenize(template):
+    """Split a template into literal text and fields.
+
+    Args:
+        template (str): eg: {root}/{asset}/work/{app}/{asset}_{version:v\\d{3}}.ma
+
+    Returns:
+        list[tuple(bool, str, str)]: (isField, text or field name, field pattern)
+    """
+    parts = []
+    literal = []
+    idx = 0
+    while idx < len(template):
+        char = template[idx]
+        if char != "{":
+            if char == "}":
+                raise TemplateError("Unmatched }} in {}".format(template))
+            literal.append(char)
+            idx += 1
+            continue
+
+        # Find the closing brace, patterns may use {n} quantifiers of their own.
+        depth = 1
+        end = idx + 1
+        while end < len(template) and depth:
+            if template[end] == "{":
+                depth += 1
+            elif template[end] == "}":
+                depth -= 1
+            end += 1
+        if depth:
+            raise TemplateError("Unmatched {{ in {}".format(template))
+
+        name, _, pattern = template[idx + 1 : end - 1].partition(":")
+        if not name.isidentifier():
+            raise TemplateError("Invalid field {{{}}} in {}".format(name, template))
+
+        if literal:
+            parts.append((False, "".join(literal), ""))
+            literal = []
+        parts.append((True, name, pattern or FIELD_PATTERN))
+        idx = end
+
+    if literal:
+        parts.append((False, "".join(literal), ""))
+
+    return parts
+
+
+class PathTemplate:
+    def __init__(self, name, template, rootPath=""):
+        """A named path template compiled once into a formatter and a regex matcher.
+        A field used more than once must have the same value everywhere it appears.
+
+        Args:
+            name (str): eg: work
+            template (str): eg: {root}/{asset}/{dept}/work/{app}
+            rootPath (str): optional, the template is relative to this eg: "/".join(config.rootPathTokens())
+        """
+        self.name = name
+        self.template = template.strip("/\\")
+        self.rootPath = rootPath.replace("\\", "/").rstrip("/")
+
+        # Backslashes in a field's pattern are regex escapes, only literal text is a path.
+        parts = [
+            (isField, text if isField else text.replace("\\", "/"), pattern)
+            for isField, text, pattern in _tokenize(self.template)
+        ]
+        self._fields = []
+        regex = []
+        for isField, text, pattern in parts:
+            if not isField:
+                regex.append(re.escape(text))
+            elif text in self._fields:
+                regex.append("(?P={})".format(text))
+            else:
+                self._fields.append(text)
+                regex.append("(?P<{}>{})".format(text, pattern))
+
+        # format() only has to join the literals and values back up.
+        self._formatParts = [(isField, text) for isField, text, _ in parts]
+
+        prefix = re.escape(self.rootPath + "/") if self.rootPath else ""
+        flags = re.IGNORECASE if os.name == "nt" else 0
+        self._regex = re.compile(prefix + "".join(regex), flags)
+        self._fullmatch = self._regex.fullmatch
+
+    def __repr__(self):
+        return "PathTemplate({!r}, {!r})".format(self.name, self.template)
+
+    def fields(self):
+        """
+        Returns:
+            list[str]: the field names in the order they first appear
+        """
+        return list(self._fields)
+
+    def pattern(self):
+        """
+        Returns:
+            re.Pattern: the compiled matcher
+        """
+        return self._regex
+
+    def format(self, **fields):
+        """Build a path from the fields.
+
+        Raises:
+            TemplateError: if a field is missing
+
+        Returns:
+            str
+        """
+        try:
+            relPath = "".join(
+                str(fields[text]) if isField else text
+                for isField, text in self._formatParts
+            )
+        except KeyError as e:
+            raise TemplateError(
+                "{} needs a value for {}".format(self.name, e.args[0])
+            ) from None
+
+        if self.rootPath:
+            return "/".join([self.rootPath, relPath])
+        return relPath
+
+    def parse(self, path):
+        """Parse a path back into its fields.
+
+        Args:
+            path (str): / or \\ separated
+
+        Returns:
+            dict: None if the path doesn't match the template
+        """
+        match = self._fullmatch(path.replace("\\", "/"))
+        if match is None:
+            return None
+        return match.groupdict()
+
+    def parseMany(self, paths):
+        """Parse many paths, eg: a whole project listing.
+
+        Args:
+            paths (iterable[str]):
+
+        Returns:
+            list[dict]: None for each path that doesn't match
+        """
+        fullmatch = self._fullmatch
+        results = []
+        append = results.append
+        for path in paths:
+            match = fullmatch(path.replace("\\", "/"))
+            append(match.groupdict() if match is not None else None)
+
+        return results
+
+
+def compileTemplates(config):
+    """Compile the config's PATHTEMPLATES, relative to its rootPathTokens.
+
+    Args:
+        config (Config):
+
+    Raises:
+        TemplateError:
+
+    Returns:
+        dict: {name: PathTemplate}
+    """
+    rootPath = "/".join(config.rootPathTokens())
+    return {
+        name: PathTemplate(name, template, rootPath=rootPath)
+        for name, template in config.pathTemplates().items()
+    }
+
+
+def matchTemplate(templates, path):
+    """Find the first template that parses the path.
+
+    Args:
+        templates (dict): see compileTemplates
+        path (str):
+
+    Returns:
+        tuple(str, dict): (template name, fields), (None, None) if none match
+    """
+    for name, template in templates.items():
+        fields = template.parse(path)
+        if fields is not None:
+            return name, fields
+
+    return None, None
@@ -0,0 +1,166 @@
+import os
+import sys
+import errno
+import shutil
+import logging
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+# linux/fs.h _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+COPY_BUFFER_SIZE = 1024 * 1024
+# Errors that mean "this filesystem can't do it", try the next way to copy.
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EMLINK,
+}
+if hasattr(errno, "ENOTSUP"):
+    _UNSUPPORTED.add(errno.ENOTSUP)
+
+
+def _reflink(src, dst):
+    import fcntl
+
+    with open(src, "rb") as infile, open(dst, "wb") as outfile:
+        fcntl.ioctl(outfile.fileno(), FICLONE, infile.fileno())
+
+
+def _copyFileRange(src, dst):
+    with open(src, "rb") as infile, open(dst, "wb") as outfile:
+        remaining = os.fstat(infile.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(infile.fileno(), outfile.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def _bufferedCopy(src, dst):
+    with open(src, "rb") as infile, open(dst, "wb") as outfile:
+        shutil.copyfileobj(infile, outfile, COPY_BUFFER_SIZE)
+
+
+def copyFile(src, dst, allowHardlink=False):
+    """Copy src to dst using the cheapest way the filesystem supports:
+    reflink, copy_file_range (lets the filesystem / server share or offload the data), hardlink then a buffered copy.
+
+    Args:
+        src (str):
+        dst (str): must not exist
+        allowHardlink (bool): a hardlinked file shares its data with src, edits in place show up in both.
+            Off by default, only turn it on for templates nothing ever edits in place.
+
+    Returns:
+        str: the method used, one of reflink, copy_file_range, hardlink, copy
+    """
+    methods = []
+    if sys.platform.startswith("linux"):
+        methods.append(("reflink", _reflink))
+    if hasattr(os, "copy_file_range"):
+        methods.append(("copy_file_range", _copyFileRange))
+    if allowHardlink:
+        methods.append(("hardlink", os.link))
+
+    for name, method in methods:
+        try:
+            method(src, dst)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+            if name != "hardlink" and os.path.isfile(dst):
+                os.remove(dst)
+            continue
+
+        logger.debug("Copied %s to %s using %s", src, dst, name)
+        return name
+
+    _bufferedCopy(src, dst)
+    shutil.copystat(src, dst)
+    return "copy"
+
+
+def _matches(relPath, folderKey):
+    return relPath == folderKey or relPath.endswith(os.path.sep + folderKey)
+
+
+def getSeedFiles(config, plan, assetName):
+    """Work out the seed files for an asset from the config's SEEDFILES.
+    eg: "SEEDFILES": {"work/maya": ["templates/{assetName}_v000.ma"]}
+    A folder key matches any schema folder ending with it, so work/maya matches Model/work/maya and Rig/work/maya.
+    Relative template paths are relative to the config file. {assetName} in the file name is filled in.
+
+    Args:
+        config (Config):
+        plan (tuple(str)): see folderManager.getSchemaPlan
+        assetName (str):
+
+    Returns:
+        list[tuple(str, str)]: (templatePath, relative destination file path)
+    """
+    seedFiles = config.seedFiles()
+    if not seedFiles:
+        return []
+
+    configPath = config.configPath()
+    configDir = (
+        os.path.dirname(os.path.abspath(configPath))
+        if isinstance(configPath, str)
+        else os.getcwd()
+    )
+
+    seeds = []
+    for folderKey, templates in seedFiles.items():
+        folderKey = os.path.sep.join(
+            token for token in folderKey.replace("\\", "/").split("/") if token
+        )
+        if not isinstance(templates, list):
+            templates = [templates]
+
+        for relPath in plan:
+            if not _matches(relPath, folderKey):
+                continue
+
+            for template in templates:
+                templatePath = os.path.join(configDir, os.path.expanduser(template))
+                fileName = os.path.basename(template).replace("{assetName}", assetName)
+                seeds.append((templatePath, os.path.sep.join([relPath, fileName])))
+
+    return seeds
+
+
+def seedFolders(seeds, folderPath, allowHardlink=False, journal=None):
+    """Copy the seed files into the asset. Existing files are never overwritten.
+
+    Args:
+        seeds (list[tuple(str, str)]): see getSeedFiles
+        folderPath (str): the asset's root folder
+        allowHardlink (bool): see copyFile
+        journal (Journal): optional, the files are recorded before they are copied
+
+    Returns:
+        list[str]: the files copied
+    """
+    toCopy = []
+    for templatePath, relPath in seeds:
+        dst = os.path.sep.join([folderPath, relPath])
+        if os.path.exists(dst):
+            continue
+        if not os.path.isfile(templatePath):
+            logger.warning("Seed file %s does not exist!", templatePath)
+            continue
+        toCopy.append((templatePath, dst))
+
+    if journal is not None and toCopy:
+        journal.record("file", paths=[dst for _, dst in toCopy])
+
+    for templatePath, dst in toCopy:
+        copyFile(templatePath, dst, allowHardlink=allowHardlink)
+
+    return [dst for _, dst in toCopy]
@@ -11,13 +11,24 @@ from widgets.help import HelpView
 from widgets.splash import SplashWidget
 from widgets.folderDockWidget import FolderDockWidget
 from widgets.configDockWidget import ConfigDockWidget
+from widgets.auditDockWidget import AuditDockWidget
+from widgets.archiveDockWidget import ArchiveDockWidget
 from widgets import configBrowser as suiw_configBrowser
+from widgets import utils as widgetUtils
 from widgets.base import BaseDockWidget as BaseDockWidget
 from widgets import systemFileBrowser as suiw_systemBrowser
 from widgets.themeEditorDockWidget import ThemeEditorDockWidget
 from widgets.customBrowserDockWidget import CustomBrowserDockWidget
 from services import folderManager as ss_folderManager
 from services import configManger as ss_configManager
+from services import jobManager as ss_jobManager
+from services import journalManager as ss_journalManager
+from services import auditManager as ss_auditManager
+from services import migrationManager as ss_migrationManager
+from services import archiveManager as ss_archiveManager
+from services import archiveCatalog as ss_archiveCatalog
+from services import configWatcher as ss_configWatcher
+from services import configRegistry as ss_configRegistry
 
 insideMaya = False
 try:
@@ -32,7 +43,7 @@ logger = logging.getLogger(__name__)
 logger.propagate = False
 logging.basicConfig()
 
-VERS = "0.2.1"
+VERS = "0.2.2"
 APPNAAME = "switch"
 WORKSPACENAME = "switchDock"
 WORKSPACEDOCKNAME = "{}WorkspaceControl".format(WORKSPACENAME)
@@ -76,6 +87,15 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         )
         self.dw = None
         self.configDockWidget = None
+        self.auditDockWidget = None
+        self.archiveDockWidget = None
+        self.jobManager = ss_jobManager.JobManager(parent=self)
+        self.archiveCatalog = ss_archiveCatalog.ArchiveCatalog()
+        self.configWatcher = ss_configWatcher.ConfigWatcher(parent=self)
+        self.configWatcher.fileChanged.connect(self._configFileChanged)
+        self.configRegistry = ss_configRegistry.ConfigRegistry()
+        if self.config is not None and self.config.configPath():
+            self.configWatcher.watch(self.config.configPath())
 
         self.setWindowTitle("{} v{} : {}".format(APPNAAME, VERS, self.configPath))
         self.setObjectName(OBJECTNAME)
@@ -105,10 +125,18 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         )
         self.loadConfig.triggered.connect(self._loadConfig)
 
+        # Filled from the config registry each time it opens.
+        self.projectsMenu = QtWidgets.QMenu("Projects", self)
+        self.projectsMenu.aboutToShow.connect(self._updateProjectsMenu)
+        self.fileMenu.addMenu(self.projectsMenu)
+
         self.createConfig = self.fileMenu.addAction(
             self._fetchIcon("iconmonstr-plus-1-240"), "Create / Update Schema Config"
         )
         self.createConfig.triggered.connect(self._createConfigUI)
+
+        self.auditConfig = self.fileMenu.addAction("Audit Project Schema")
+        self.auditConfig.triggered.connect(self._auditProject)
         self.fileMenu.addSeparator()
 
         self.recentMenu = QtWidgets.QMenu("Recent Configs: ", self)
@@ -144,6 +172,8 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         helpMenu.triggered.connect(self._showHelp)
 
         self.createFoldersButton = None
+        # The sorted roots the toolbar buttons were last built for.
+        self._toolbarRoots = None
         # MAIN APP TOOLBAR
         self.toolbar = QtWidgets.QToolBar()
         self.toolbar.setWindowTitle("mainToolBar")
@@ -158,6 +188,7 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         )
         layout.addWidget(self._browserWidget)
         self._browserWidget.fileOpened.connect(self._updateRecentFilesMenu)
+        self._browserWidget.archive.connect(self._archiveFolders)
 
         self.configChanged.connect(self._browserWidget.setConfig)
         self.themeChanged.connect(self._browserWidget.setTheme)
@@ -202,15 +233,22 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
             return
 
         customBrowserWidget = CustomBrowserDockWidget(
-            themeName=self.themeName, themeColor=self.themeColor, dir=dir
+            themeName=self.themeName,
+            themeColor=self.themeColor,
+            dir=dir,
+            catalog=self.archiveCatalog,
         )
         customBrowserWidget.closed.connect(self._customDockWidgetRemoved)
+        customBrowserWidget.restore.connect(self._restoreArchives)
+        customBrowserWidget.rescan.connect(self._scanArchives)
         self.addDockWidget(QtCore.Qt.RightDockWidgetArea, customBrowserWidget)
         self._customBrowserDockWidgets.append(customBrowserWidget)
         if dir not in self._recentCustomBrowserPaths:
             self._recentCustomBrowserPaths.append(dir)
 
         self.themeChanged.connect(customBrowserWidget.setTheme)
+        # Catch the catalog up with anything archived there since it was last open.
+        self._scanArchives(dir)
 
     def _editTheme(self):
         self.editThemeUI = ThemeEditorDockWidget(
@@ -243,6 +281,12 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         self.helpUI.show()
 
     def _updateToolBarButtons(self):
+        """Rebuild the root buttons, only if the config's roots have changed."""
+        rootList = sorted(self.config.iterRoots()) if self.config is not None else None
+        if rootList == self._toolbarRoots:
+            return
+
+        self._toolbarRoots = rootList
         self.toolbar.clear()
         if self.config is None:
             return
@@ -250,8 +294,6 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         self.toolbarLabel = QtWidgets.QLabel("Asset roots: ")
         self.toolbar.addWidget(self.toolbarLabel)
 
-        rootList = list(self.config.iterRoots())
-        rootList.sort()
         for rootDirName in ["root"] + rootList:
             self.toolbar.addSeparator()
             button = QtWidgets.QPushButton("..{}".format(rootDirName))
@@ -295,11 +337,39 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         self.configBrowser.show()
         self.configBrowser.fileSelected.connect(self.setConfig)
 
+    def _updateProjectsMenu(self):
+        """List the registry's configs by project, only new or changed config files are read."""
+        self.projectsMenu.clear()
+        for entry in self.configRegistry.refresh():
+            act = self.projectsMenu.addAction(
+                "{} ({})".format(entry.projectName or "-", entry.configName())
+            )
+            act.setToolTip(entry.configPath)
+            act.setStatusTip(entry.configPath)
+            act.triggered.connect(partial(self.setConfig, filepath=entry.configPath))
+
+        self.projectsMenu.addSeparator()
+        registerDir = self.projectsMenu.addAction("Register Config Directory...")
+        registerDir.triggered.connect(self._registerConfigDirectory)
+
+    def _registerConfigDirectory(self):
+        dirPath = QtWidgets.QFileDialog.getExistingDirectory(
+            None,
+            "Register Config Directory",
+            self.configRegistry.configsDir,
+            QtWidgets.QFileDialog.ShowDirsOnly,
+        )
+        if not dirPath:
+            return
+
+        self.configRegistry.registerDirectory(dirPath)
+
     def _createConfigUI(self):
         if self.configDockWidget is None:
             self.configDockWidget = ConfigDockWidget(self.themeName, self.themeColor)
             self.configDockWidget.setFloating(True)
             self.configDockWidget.resize(800, 600)
+            self.configDockWidget.migrate.connect(self._migrateAssets)
 
             self.themeChanged.connect(self.configDockWidget.setTheme)
 
@@ -307,6 +377,125 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         else:
             self.configDockWidget.show()
 
+    def _migrateAssets(self, oldConfig, newConfig, renames, dryRun):
+        """Run a schema migration, or its dry run, as a background job for the config editor.
+
+        Args:
+            oldConfig (Config): the config the assets were created with
+            newConfig (Config): the schema being migrated to
+            renames (dict): see migrationManager.diffConfigs
+            dryRun (bool):
+        """
+        job = ss_jobManager.Job(
+            "migrate",
+            ss_migrationManager.migrateProject,
+            oldConfig=oldConfig,
+            newConfig=newConfig,
+            renames=renames,
+            dryRun=dryRun,
+        )
+        self.configDockWidget.setMigrationJob(job, dryRun)
+        self.jobManager.start(job)
+
+    def _auditProject(self):
+        """Compare every asset on disk against the current config's schema."""
+        if self.config is None:
+            return
+
+        if self.auditDockWidget is None:
+            self.auditDockWidget = AuditDockWidget(self.themeName, self.themeColor)
+            self.themeChanged.connect(self.auditDockWidget.setTheme)
+            self.addDockWidget(QtCore.Qt.BottomDockWidgetArea, self.auditDockWidget)
+        else:
+            self.auditDockWidget.show()
+
+        job = ss_jobManager.Job(
+            "audit",
+            ss_auditManager.auditProject,
+            streamResults=True,
+            config=self.config,
+        )
+        self.auditDockWidget.setJob(job)
+        self.jobManager.start(job)
+
+    def _showArchiveDock(self):
+        if self.archiveDockWidget is None:
+            self.archiveDockWidget = ArchiveDockWidget(self.themeName, self.themeColor)
+            self.themeChanged.connect(self.archiveDockWidget.setTheme)
+            self.addDockWidget(QtCore.Qt.BottomDockWidgetArea, self.archiveDockWidget)
+        else:
+            self.archiveDockWidget.show()
+
+    def _archiveFolders(self, folders, removeExisting=False):
+        """Archive the folders as a background job so browsing carries on.
+
+        Args:
+            folders (list[tuple(str, str, str)]): (inDirPath, outFilePath, arcRoot)
+            removeExisting (bool): delete each folder once it's archived
+        """
+        self._showArchiveDock()
+        job = ss_jobManager.Job(
+            "archive",
+            ss_archiveManager.archiveFolders,
+            streamResults=True,
+            folders=folders,
+            maxWorkers=self.archiveDockWidget.workers(),
+            compression=self.archiveDockWidget.compression(),
+            maxVolumeSize=self.archiveDockWidget.volumeSize(),
+            checkpoint=self.archiveDockWidget.resumable(),
+            backend=self.archiveDockWidget.backend(),
+            removeSource=removeExisting,
+        )
+        job.signals.finished.connect(self._catalogArchives)
+        self.archiveDockWidget.addJob(job, folders)
+        self.jobManager.start(job)
+
+    def _catalogArchives(self, jobId, results):
+        """Add the archives an archive job wrote to the catalog so they can be searched straight away.
+
+        Args:
+            jobId (str):
+            results (list[FolderProgress]):
+        """
+        archivePaths = list()
+        for result in results:
+            if result is not None and result.state == "done":
+                archivePaths.extend(ss_archiveManager.volumePaths(result.outFilePath))
+        if not archivePaths:
+            return
+
+        job = ss_jobManager.Job(
+            "catalog", self.archiveCatalog.addArchives, archivePaths=archivePaths
+        )
+        self.jobManager.start(job)
+
+    def _scanArchives(self, dirPath):
+        """Bring the catalog up to date with the archives under dirPath as a background job.
+
+        Args:
+            dirPath (str):
+        """
+        job = ss_jobManager.Job(
+            "catalog", self.archiveCatalog.scanDirectory, dirPath=dirPath
+        )
+        self.jobManager.start(job)
+
+    def _restoreArchives(self, archives):
+        """Restore the archives as a background job, progress and cancel are in the Archive dock.
+
+        Args:
+            archives (list[tuple(str, str, list[str])]): (inFilePath, rootDir, member paths)
+        """
+        self._showArchiveDock()
+        job = ss_jobManager.Job(
+            "restore",
+            ss_archiveManager.restoreArchives,
+            streamResults=True,
+            archives=archives,
+        )
+        self.archiveDockWidget.addRestoreJob(job, archives)
+        self.jobManager.start(job)
+
     def _changeRoot(self, dirName="root"):
         """Change the root dir of the treeView to be that of the clicked root button
 
@@ -322,13 +511,51 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         self._browserWidget.setprojectPath(tokens)
 
     def _createFolder(self, assetData):
-        """Create the folders based off the widget's assetName and assetType
+        """Create the folders based off the widget's assetName and assetType.
+        Runs as a background job so the dock can take the next asset straight away.
 
         Args:
             assetData (list[assetName, assetType]):
         """
         assetName, assetType = assetData
-        ss_folderManager.createFolders(self.config, assetType, assetName)
+        if not assetName or assetType is None:
+            logger.warning("Select an asset root and type a name to create folders.")
+            return
+
+        job = ss_jobManager.Job(
+            "{}/{}".format(assetType, assetName),
+            ss_folderManager.createFolders,
+            config=self.config,
+            assetType=assetType,
+            assetName=assetName,
+        )
+        self.dw.addJob(job)
+        self.jobManager.start(job)
+
+    def _createFoldersFromManifest(self, filepath):
+        """Create the folders for every asset in the manifest as a background job.
+
+        Args:
+            filepath (string): path to the .csv or .json manifest
+        """
+        job = ss_jobManager.Job(
+            os.path.basename(filepath),
+            ss_folderManager.createFoldersFromManifest,
+            config=self.config,
+            filepath=filepath,
+        )
+        job.signals.finished.connect(self._manifestCreated)
+        self.dw.addJob(job)
+        self.jobManager.start(job)
+
+    def _manifestCreated(self, jobId, results):
+        failed = [result for result in results if not result.success]
+        if failed:
+            message = "\n".join(
+                "{}/{}: {}".format(result.assetType, result.assetName, result.error)
+                for result in failed
+            )
+            widgetUtils.errorWidget(title="Failed to create assets.", message=message)
 
     def createFolderUI(self):
         """Show the widget for creating a new folder"""
@@ -337,6 +564,7 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
                 self.themeName, self.themeColor, config=self.config
             )
             self.dw.commit.connect(self._createFolder)
+            self.dw.commitManifest.connect(self._createFoldersFromManifest)
             self.addDockWidget(QtCore.Qt.BottomDockWidgetArea, self.dw)
             self.dw.resize(300, 300)
             self.resizeDocks([self.dw], [125], QtCore.Qt.Vertical)
@@ -376,25 +604,67 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         if not filepath:
             return
 
-        self.config = ss_configManager.getConfigByFilePath(filepath)
-        self.config.setConfigPath(filepath)
-        if self.config is not None and os.path.isfile(filepath):
+        config = ss_configManager.getConfigByFilePath(filepath)
+        if config is not None and os.path.isfile(filepath):
             logger.debug("Setting config to: %s", filepath)
             if filepath not in self._recentConfigs:
                 self._recentConfigs.append(filepath)
                 act = self.recentMenu.addAction(filepath)
                 act.triggered.connect(partial(self.setConfig, filepath=filepath))
 
+        if self.config is not None and self.config.configPath():
+            self.configWatcher.unwatch(self.config.configPath())
+        if config is not None:
+            self.configWatcher.watch(config.configPath())
+
+        self._applyConfig(config)
+
+    def _configFileChanged(self, filepath):
+        """The current config was edited on disk, reload it in place.
+
+        Args:
+            filepath (string):
+        """
+        if self.config is None or filepath != self.config.configPath():
+            return
+
+        try:
+            config = ss_configManager.getConfigByFilePath(filepath)
+        except ValueError as e:
+            # Invalid json, keep the current config until the file is fixed.
+            logger.error("Not reloading %s: %s", filepath, e)
+            return
+
+        if config is None or config is self.config:
+            return
+
+        errors = config.validateSchema()
+        if errors:
+            logger.error("Not reloading %s: %s", filepath, "\n".join(errors))
+            return
+
+        logger.info("Reloading config: %s", filepath)
+        self._applyConfig(config)
+
+    def _applyConfig(self, config):
+        """Swap to the config, updating the toolbar and docks in place.
+
+        Args:
+            config (Config):
+        """
+        self.config = config
         self.configPath = (
             self.config.projectPath() if self.config else "No config found"
         )
         self.setWindowTitle("{} v{} : {}".format(APPNAAME, VERS, self.configPath))
         self._updateToolBarButtons()
 
-        # Close the createFolders wwidget.
         if self.dw is not None:
-            self.dw.close()
-            self.dw = None
+            if self.config is not None:
+                self.dw.setConfig(self.config)
+            else:
+                self.dw.close()
+                self.dw = None
 
         self.configChanged.emit(self.config)
 
@@ -416,6 +686,11 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         self._settings.setValue("state", self.saveState())
 
         self._settings.endGroup()
+        # Don't leave half built jobs running behind a closed app.
+        self.jobManager.cancelAll()
+        self.jobManager.waitForDone()
+        self.archiveCatalog.close()
+
         # Force the show for the browsers settings to save
         self._browserWidget.close()
         super(Switch, self).closeEvent(e)
@@ -459,6 +734,10 @@ class Switch(QtWidgets.QMainWindow, IconMixin):
         )
         self.exitApp.triggered.connect(self.close)
 
+        # Clean up any folder creation left half built by a crash.
+        for journalPath in ss_journalManager.recoverJournals("create"):
+            logger.warning("Rolled back unfinished folder creation: %s", journalPath)
+
         # Open the previous active config when the ui was closed.
         lastOpened = self._settings.value("lastOpened", defaultValue=None)
         logger.debug("lastOpened: %s", lastOpened)
@@ -0,0 +1,29 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from services import configManger as ss_configManager
+from services import journalManager as ss_journalManager
+
+
+class AssetTestCase(unittest.TestCase):
+    """Creates assets from testConfig.json in a temp project folder, with the journals kept there too.
+    self.config is an editable copy of the cached config with its projectPath set to the temp folder.
+    """
+
+    def setUp(self):
+        self.curFolder = os.path.dirname(__file__)
+        self.testConfigPath = os.path.join(self.curFolder, "testConfig.json")
+        self.tempDirPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempDirPath, True)
+        journalDirPatch = mock.patch.object(
+            ss_journalManager,
+            "JOURNAL_DIR",
+            os.path.join(self.tempDirPath, "journals"),
+        )
+        journalDirPatch.start()
+        self.addCleanup(journalDirPatch.stop)
+        self.config = ss_configManager.getConfigByFilePath(self.testConfigPath).copy()
+        self.config.data["projectPath"] = self.tempDirPath.replace("\\", "/")
+        return super().setUp()
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from services import archiveManager as ss_archiveManager
+from services import archiveCatalog as ss_archiveCatalog
+
+
+class Test_ArchiveCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tempDirPath = tempfile.mkdtemp()
+        self.archiveDir = os.path.join(self.tempDirPath, "archives")
+        os.makedirs(self.archiveDir)
+        for assetName in ("Arachne", "Bob"):
+            assetPath = os.path.join(self.tempDirPath, "assets", assetName)
+            for idx in range(3):
+                filepath = os.path.join(
+                    assetPath, "Model", "{}_v{:03d}.ma".format(assetName, idx)
+                )
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                with open(filepath, "wb") as outfile:
+                    outfile.write("//Maya ASCII {}\n".format(idx).encode())
+            ss_archiveManager.archiveFolder(
+                inDirPath=assetPath,
+                outFilePath=os.path.join(self.archiveDir, "{}.zip".format(assetName)),
+            )
+        self.catalog = ss_archiveCatalog.ArchiveCatalog(
+            os.path.join(self.tempDirPath, "catalog.db")
+        )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.catalog.close()
+        ss_archiveManager.clearListCache()
+        shutil.rmtree(self.tempDirPath, ignore_errors=True)
+        return super().tearDown()
+
+    def test_scanAndSearch(self):
+        self.assertEqual(self.catalog.scanDirectory(self.archiveDir), 2)
+        self.assertEqual(len(self.catalog.archives()), 2)
+
+        hits = self.catalog.search("arachne_v001")
+        self.assertEqual([hit.name() for hit in hits], ["Arachne_v001.ma"])
+        self.assertEqual(os.path.basename(hits[0].archivePath), "Arachne.zip")
+        self.assertEqual(len(hits[0].sha256), 64)
+        self.assertEqual(len(self.catalog.search("*_v00[12].ma")), 4)
+        self.assertEqual(self.catalog.search("v_0"), [])
+        self.assertEqual(
+            self.catalog.search("Bob_v000.ma", dirPath=self.tempDirPath)[0].name(),
+            "Bob_v000.ma",
+        )
+        self.assertEqual(
+            self.catalog.search(
+                "Bob", dirPath=os.path.join(self.tempDirPath, "assets")
+            ),
+            [],
+        )
+
+    def test_rescanOnlyReadsChanges(self):
+        self.catalog.scanDirectory(self.archiveDir)
+        with mock.patch.object(
+            ss_archiveCatalog, "_readArchive", wraps=ss_archiveCatalog._readArchive
+        ) as readArchive:
+            self.assertEqual(self.catalog.scanDirectory(self.archiveDir), 0)
+            readArchive.assert_not_called()
+
+        os.remove(os.path.join(self.archiveDir, "Bob.zip"))
+        self.catalog.scanDirectory(self.archiveDir)
+        self.assertEqual(self.catalog.search("Bob"), [])
+        self.assertEqual(len(self.catalog.search("Arachne")), 3)
+
+    def test_addArchives(self):
+        archivePath = os.path.join(self.archiveDir, "Arachne.zip")
+        self.assertEqual(self.catalog.addArchives([archivePath]), 1)
+        self.assertEqual(self.catalog.addArchives([archivePath]), 0)
+        self.assertEqual(
+            [hit.memberPath for hit in self.catalog.members(archivePath)],
+            [
+                "Arachne/Model/Arachne_v000.ma",
+                "Arachne/Model/Arachne_v001.ma",
+                "Arachne/Model/Arachne_v002.ma",
+            ],
+        )
+
+    def test_skipsBrokenArchives(self):
+        with open(os.path.join(self.archiveDir, "broken.zip"), "wb") as outfile:
+            outfile.write(b"not a zip")
+        self.catalog.scanDirectory(self.archiveDir)
+        self.assertEqual(len(self.catalog.archives()), 2)
@@ -1,5 +1,10 @@
 import os
+import shutil
+import hashlib
+import zipfile
+import tempfile
 import unittest
+from unittest import mock
 from services import archiveManager as ss_archiveManager
 
 
@@ -36,5 +41,475 @@ class Test_ArchiveManager(unittest.TestCase):
         self.assertTrue(os.path.isfile(self.destZipPath))
 
 
+class Test_ArchiveFolder(unittest.TestCase):
+    def setUp(self):
+        self.tempDirPath = tempfile.mkdtemp()
+        self.assetPath = os.path.join(
+            self.tempDirPath, "assets", "Character", "Arachne"
+        )
+        self.files = {
+            os.path.join("Model", "work", "maya", "scene{}.ma".format(idx)): (
+                "//Maya ASCII {}\n".format(idx) * (idx * 100 + 1)
+            ).encode()
+            for idx in range(20)
+        }
+        self.files[os.path.join("Model", "big.bin")] = os.urandom(4096)
+        for relPath, data in self.files.items():
+            filepath = os.path.join(self.assetPath, relPath)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "wb") as outfile:
+                outfile.write(data)
+        os.makedirs(os.path.join(self.assetPath, "Rig", "publish"))
+        self.zipPath = os.path.join(self.tempDirPath, "Arachne.zip")
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tempDirPath, ignore_errors=True)
+        return super().tearDown()
+
+    def _assertArchive(self, prefix):
+        with zipfile.ZipFile(self.zipPath) as myzip:
+            self.assertIsNone(myzip.testzip())
+            for relPath, data in self.files.items():
+                arcname = "/".join([prefix] + relPath.split(os.path.sep))
+                self.assertEqual(myzip.read(arcname), data)
+            self.assertIn("/".join([prefix, "Rig", "publish", ""]), myzip.namelist())
+
+    def test_compression(self):
+        for compression, compressType in ss_archiveManager.COMPRESSION.items():
+            self.assertTrue(
+                ss_archiveManager.archiveFolder(
+                    self.assetPath, self.zipPath, compression=compression, maxWorkers=4
+                )
+            )
+            self._assertArchive("Arachne")
+            with zipfile.ZipFile(self.zipPath) as myzip:
+                self.assertEqual(
+                    {
+                        info.compress_type
+                        for info in myzip.infolist()
+                        if not info.is_dir()
+                    },
+                    {compressType},
+                )
+            os.remove(self.zipPath)
+
+        with self.assertRaises(ValueError):
+            ss_archiveManager.archiveFolder(
+                self.assetPath, self.zipPath, compression="rar"
+            )
+
+    def test_arcRootAndLargeFiles(self):
+        progress = []
+        # Everything over 1kb is streamed in rather than compressed on a worker.
+        with mock.patch.object(ss_archiveManager, "LARGE_FILE_SIZE", 1024):
+            ss_archiveManager.archiveFolder(
+                self.assetPath,
+                self.zipPath,
+                arcRoot=self.tempDirPath,
+                progress=lambda *args: progress.append(args),
+            )
+        self._assertArchive("assets/Character/Arachne")
+        self.assertEqual(progress[-1][0], len(self.files) + 1)
+        self.assertEqual(
+            progress[-1][1], sum(len(data) for data in self.files.values())
+        )
+
+    def test_cancel(self):
+        result = ss_archiveManager.archiveFolder(
+            self.assetPath, self.zipPath, isCancelled=lambda: True
+        )
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(self.zipPath))
+
+    def test_archiveFolders(self):
+        folders = []
+        for name in ("Model", "Rig", "Missing"):
+            folders.append(
+                (
+                    os.path.join(self.assetPath, name),
+                    os.path.join(self.tempDirPath, "{}.zip".format(name)),
+                    None,
+                )
+            )
+        reports = []
+        progress = []
+        results = ss_archiveManager.archiveFolders(
+            folders,
+            maxWorkers=2,
+            callback=reports.append,
+            progress=lambda *args: progress.append(args),
+        )
+        self.assertEqual(
+            [result.state for result in results], ["done", "done", "failed"]
+        )
+        self.assertEqual(results[0].files, len(self.files))
+        self.assertGreater(results[0].throughput(), 0)
+        self.assertEqual(progress[-1], (3, 3))
+        self.assertTrue(all(report.state != "queued" for report in reports))
+
+        # Existing archives are left alone, removeSource only deletes what was archived.
+        results = ss_archiveManager.archiveFolders(folders[:1], removeSource=True)
+        self.assertEqual(results[0].state, "failed")
+        self.assertTrue(os.path.isdir(folders[0][0]))
+
+        os.remove(folders[1][1])
+        results = ss_archiveManager.archiveFolders(folders[1:2], removeSource=True)
+        self.assertEqual(results[0].state, "done")
+        self.assertFalse(os.path.exists(folders[1][0]))
+
+    def test_storeBackend(self):
+        folders = [
+            (self.assetPath, os.path.join(self.tempDirPath, "Arachne.zip"), None)
+        ]
+        results = ss_archiveManager.archiveFolders(
+            folders, backend="store", removeSource=True
+        )
+        self.assertEqual(results[0].state, "done", results[0].error)
+        self.assertFalse(os.path.exists(self.assetPath))
+        self.assertFalse(os.path.exists(self.zipPath))
+
+        store = ss_archiveManager.storeFor(self.zipPath)
+        self.assertEqual(store.manifests(), ["Arachne"])
+        store.restore("Arachne", os.path.dirname(self.assetPath))
+        for relPath, data in self.files.items():
+            with open(os.path.join(self.assetPath, relPath), "rb") as infile:
+                self.assertEqual(infile.read(), data)
+
+        # Already in the store.
+        results = ss_archiveManager.archiveFolders(folders, backend="store")
+        self.assertEqual(results[0].state, "failed")
+        with self.assertRaises(ValueError):
+            ss_archiveManager.archiveFolders(folders, backend="tar")
+
+    def test_manifestAndVerify(self):
+        with mock.patch.object(ss_archiveManager, "LARGE_FILE_SIZE", 1024):
+            ss_archiveManager.archiveFolder(self.assetPath, self.zipPath)
+        manifest = ss_archiveManager.loadManifest(self.zipPath)
+        members = {member["path"]: member for member in manifest["files"]}
+        self.assertEqual(len(members), len(self.files))
+        for relPath, data in self.files.items():
+            member = members["/".join(["Arachne"] + relPath.split(os.path.sep))]
+            self.assertEqual(member["size"], len(data))
+            self.assertEqual(member["sha256"], hashlib.sha256(data).hexdigest())
+        self.assertEqual(manifest["dirs"], ["Arachne/Rig/publish/"])
+
+        result = ss_archiveManager.verifyArchive(
+            self.zipPath, inDirPath=self.assetPath, maxWorkers=3
+        )
+        self.assertTrue(result.ok(), result.errors)
+        self.assertEqual(result.files, len(self.files))
+
+        # A file added to the source since isn't in the archive.
+        newPath = os.path.join(self.assetPath, "Model", "new.ma")
+        with open(newPath, "w") as outfile:
+            outfile.write("new")
+        result = ss_archiveManager.verifyArchive(self.zipPath, inDirPath=self.assetPath)
+        self.assertFalse(result.ok())
+        os.remove(newPath)
+
+        # Damage a member's data, its header stays readable.
+        with zipfile.ZipFile(self.zipPath) as myzip:
+            zinfo = myzip.getinfo("Arachne/Model/big.bin")
+            offset = zinfo.header_offset + len(zinfo.FileHeader()) + 10
+        with open(self.zipPath, "r+b") as outfile:
+            outfile.seek(offset)
+            data = outfile.read(1)
+            outfile.seek(offset)
+            outfile.write(bytes([data[0] ^ 0xFF]))
+        result = ss_archiveManager.verifyArchive(self.zipPath)
+        self.assertFalse(result.ok())
+        self.assertEqual(result.files, len(self.files) - 1)
+
+    def test_removeSourceVerifies(self):
+        failed = ss_archiveManager.VerifyResult(self.zipPath, errors=["damaged"])
+        with mock.patch.object(ss_archiveManager, "verifyArchive", return_value=failed):
+            results = ss_archiveManager.archiveFolders(
+                [(self.assetPath, self.zipPath, None)], removeSource=True
+            )
+        self.assertEqual(results[0].state, "failed")
+        self.assertIn("damaged", results[0].error)
+        self.assertTrue(os.path.isdir(self.assetPath))
+
+    def test_listAndRestoreMembers(self):
+        ss_archiveManager.archiveFolder(self.assetPath, self.zipPath)
+        members = ss_archiveManager.listArchive(self.zipPath)
+        self.assertEqual(len(members), len(self.files) + 1)
+        self.assertIn(
+            ss_archiveManager.ArchiveMember(
+                "Arachne/Rig/publish/", isDir=True, dateTime=members[-1].dateTime
+            ),
+            members,
+        )
+        # Listed once until the archive changes.
+        with mock.patch.object(zipfile, "ZipFile") as mockZipFile:
+            self.assertIs(ss_archiveManager.listArchive(self.zipPath), members)
+            mockZipFile.assert_not_called()
+
+        self.assertEqual(
+            len(ss_archiveManager.filterMembers(members, patterns=["*/scene1?.ma"])),
+            10,
+        )
+        self.assertEqual(
+            [
+                member.path
+                for member in ss_archiveManager.filterMembers(
+                    members, subtrees=["Arachne/Rig"], paths=["Arachne/Model/big.bin"]
+                )
+            ],
+            ["Arachne/Model/big.bin", "Arachne/Rig/publish/"],
+        )
+
+        restoreDir = os.path.join(self.tempDirPath, "restore")
+        self.assertTrue(
+            ss_archiveManager.restoreFile(
+                self.zipPath, restoreDir, patterns=["*/scene3.ma"]
+            )
+        )
+        restored = []
+        for root, _, files in os.walk(restoreDir):
+            restored.extend(os.path.join(root, fileName) for fileName in files)
+        self.assertEqual(
+            restored,
+            [os.path.join(restoreDir, "Arachne", "Model", "work", "maya", "scene3.ma")],
+        )
+
+    def test_restoreArchives(self):
+        with mock.patch.object(ss_archiveManager, "LARGE_FILE_SIZE", 1024):
+            ss_archiveManager.archiveFolder(self.assetPath, self.zipPath)
+        restoreDir = os.path.join(self.tempDirPath, "restore")
+        reports = []
+        progress = []
+        results = ss_archiveManager.restoreArchives(
+            [
+                (self.zipPath, restoreDir, None),
+                (os.path.join(self.tempDirPath, "Missing.zip"), restoreDir, None),
+            ],
+            maxWorkers=3,
+            callback=reports.append,
+            progress=lambda *args: progress.append(args),
+        )
+        self.assertEqual([result.state for result in results], ["done", "failed"])
+        self.assertEqual(results[0].files, len(self.files) + 1)
+        self.assertEqual(
+            results[0].bytes, sum(len(data) for data in self.files.values())
+        )
+        self.assertEqual(results[0].bytes, results[0].totalBytes)
+        self.assertEqual(progress[-1], (2, 2))
+        self.assertEqual(reports[-1].state, "done")
+        for relPath, data in self.files.items():
+            with open(os.path.join(restoreDir, "Arachne", relPath), "rb") as infile:
+                self.assertEqual(infile.read(), data)
+        self.assertTrue(
+            os.path.isdir(os.path.join(restoreDir, "Arachne", "Rig", "publish"))
+        )
+
+        # Cancelled part way through a member, the partly written file is removed.
+        cancelDir = os.path.join(self.tempDirPath, "cancel")
+        reads = []
+
+        def isCancelled():
+            reads.append(True)
+            return len(reads) > 2
+
+        with mock.patch.object(ss_archiveManager, "READ_SIZE", 64):
+            results = ss_archiveManager.restoreArchives(
+                [(self.zipPath, cancelDir, ["Arachne/Model/big.bin"])],
+                maxWorkers=1,
+                isCancelled=isCancelled,
+            )
+        self.assertEqual(results[0].state, "cancelled")
+        self.assertEqual(results[0].files, 0)
+        self.assertGreater(results[0].bytes, 0)
+        self.assertEqual(os.listdir(os.path.join(cancelDir, "Arachne", "Model")), [])
+
+    def test_splitVolumes(self):
+        with mock.patch.object(ss_archiveManager, "LARGE_FILE_SIZE", 1024):
+            self.assertTrue(
+                ss_archiveManager.archiveFolder(
+                    self.assetPath,
+                    self.zipPath,
+                    compression="store",
+                    maxVolumeSize=4096,
+                )
+            )
+        self.assertFalse(os.path.exists(self.zipPath))
+        index = ss_archiveManager.loadIndex(self.zipPath)
+        volumes = ss_archiveManager.volumePaths(self.zipPath)
+        self.assertGreater(len(volumes), 2)
+        self.assertEqual(volumes[0], os.path.join(self.tempDirPath, "Arachne.001.zip"))
+        self.assertEqual(len(index["members"]), len(self.files) + 1)
+
+        found = dict()
+        for number, volume in enumerate(volumes, 1):
+            # Only a file bigger than a volume gets to go past the limit, on its own.
+            with zipfile.ZipFile(volume) as myzip:
+                self.assertIsNone(myzip.testzip())
+                names = myzip.namelist()
+            if len(names) > 1:
+                self.assertLessEqual(os.path.getsize(volume), 4096)
+            found.update((name, number) for name in names)
+            self.assertTrue(ss_archiveManager.verifyArchive(volume).ok())
+        self.assertEqual(found, index["members"])
+
+        result = ss_archiveManager.verifyArchive(self.zipPath, inDirPath=self.assetPath)
+        self.assertTrue(result.ok(), result.errors)
+        self.assertEqual(result.files, len(self.files))
+
+        # One volume restores without the others.
+        restoreDir = os.path.join(self.tempDirPath, "restore")
+        ss_archiveManager.restoreFile(volumes[-1], restoreDir)
+        self.assertTrue(os.listdir(restoreDir))
+
+        # A damaged volume fails the whole archive, not its neighbours.
+        with open(volumes[1], "r+b") as outfile:
+            outfile.truncate(100)
+        self.assertFalse(ss_archiveManager.verifyArchive(self.zipPath).ok())
+        self.assertTrue(ss_archiveManager.verifyArchive(volumes[0]).ok())
+
+        # An existing split archive isn't overwritten.
+        with mock.patch.object(ss_archiveManager.widgetUtils, "errorWidget"):
+            self.assertFalse(
+                ss_archiveManager.archiveFolder(
+                    self.assetPath, self.zipPath, maxVolumeSize=4096
+                )
+            )
+
+    def _interruptAfter(self, count):
+        """Patch _writeCompressed to fail after count members, like a crash part way through."""
+        writeCompressed = ss_archiveManager._writeCompressed
+        calls = []
+
+        def interrupted(*args):
+            calls.append(True)
+            if len(calls) > count:
+                raise OSError("interrupted")
+            return writeCompressed(*args)
+
+        return mock.patch.object(ss_archiveManager, "_writeCompressed", interrupted)
+
+    def test_resumeFromCheckpoint(self):
+        with self._interruptAfter(5), self.assertRaises(OSError):
+            ss_archiveManager.archiveFolder(
+                self.assetPath, self.zipPath, maxWorkers=2, checkpoint=True
+            )
+        settings, records = ss_archiveManager.loadCheckpoint(self.zipPath)
+        self.assertEqual(len(records), 5)
+        # A crash mid write leaves a cut off line and data past the last good member.
+        with open(ss_archiveManager.checkpointPath(self.zipPath), "a") as outfile:
+            outfile.write('{"volume": 1, "end": ')
+        with open(self.zipPath, "ab") as outfile:
+            outfile.write(os.urandom(1000))
+
+        progress = []
+        self.assertTrue(
+            ss_archiveManager.archiveFolder(
+                self.assetPath,
+                self.zipPath,
+                checkpoint=True,
+                progress=lambda *args: progress.append(args),
+            )
+        )
+        self.assertEqual(progress[0][0], 6)
+        self.assertFalse(os.path.exists(ss_archiveManager.checkpointPath(self.zipPath)))
+        self._assertArchive("Arachne")
+        with zipfile.ZipFile(self.zipPath) as myzip:
+            self.assertEqual(len(myzip.namelist()), len(self.files) + 1)
+        result = ss_archiveManager.verifyArchive(self.zipPath, inDirPath=self.assetPath)
+        self.assertTrue(result.ok(), result.errors)
+
+    def test_resumeSplitVolumes(self):
+        calls = []
+
+        def isCancelled():
+            calls.append(True)
+            return len(calls) > 12
+
+        with mock.patch.object(ss_archiveManager, "LARGE_FILE_SIZE", 1024):
+            self.assertFalse(
+                ss_archiveManager.archiveFolder(
+                    self.assetPath,
+                    self.zipPath,
+                    compression="store",
+                    maxVolumeSize=4096,
+                    checkpoint=True,
+                    isCancelled=isCancelled,
+                )
+            )
+            # Resumed with the volume size it was started with.
+            self.assertTrue(
+                ss_archiveManager.archiveFolder(
+                    self.assetPath, self.zipPath, checkpoint=True
+                )
+            )
+        index = ss_archiveManager.loadIndex(self.zipPath)
+        self.assertEqual(index["maxVolumeSize"], 4096)
+        self.assertEqual(len(index["members"]), len(self.files) + 1)
+        result = ss_archiveManager.verifyArchive(self.zipPath, inDirPath=self.assetPath)
+        self.assertTrue(result.ok(), result.errors)
+
+    def _readTree(self, rootDir):
+        found = dict()
+        for root, _, files in os.walk(rootDir):
+            for fileName in files:
+                filepath = os.path.join(root, fileName)
+                with open(filepath, "rb") as infile:
+                    found[os.path.relpath(filepath, rootDir)] = hashlib.sha256(
+                        infile.read()
+                    ).hexdigest()
+        return found
+
+    def test_updateArchive(self):
+        # The existing archive becomes generation 0.
+        ss_archiveManager.archiveFolder(self.assetPath, self.zipPath)
+        self.assertIsNone(ss_archiveManager.updateArchive(self.assetPath, self.zipPath))
+        self.assertFalse(
+            os.path.exists(ss_archiveManager.generationsPath(self.zipPath))
+        )
+        before = self._readTree(os.path.dirname(self.assetPath))
+
+        scenePath = os.path.join(self.assetPath, "Model", "work", "maya", "scene1.ma")
+        touchedPath = os.path.join(self.assetPath, "Model", "work", "maya", "scene2.ma")
+        with open(scenePath, "wb") as outfile:
+            outfile.write(b"//Maya ASCII changed\n")
+        with open(os.path.join(self.assetPath, "Model", "new.ma"), "wb") as outfile:
+            outfile.write(b"//Maya ASCII new\n")
+        os.remove(os.path.join(self.assetPath, "Model", "work", "maya", "scene3.ma"))
+        os.utime(touchedPath, (1000000000, 1000000000))
+
+        with mock.patch.object(
+            ss_archiveManager, "_fileCrc", wraps=ss_archiveManager._fileCrc
+        ) as fileCrc:
+            generation = ss_archiveManager.updateArchive(self.assetPath, self.zipPath)
+        # Only the file with the same size and a new mtime is read for its CRC.
+        fileCrc.assert_called_once_with(touchedPath)
+        self.assertEqual(generation["number"], 1)
+        self.assertEqual(generation["archive"], "Arachne.gen001.zip")
+        self.assertEqual(generation["added"], ["Arachne/Model/new.ma"])
+        self.assertEqual(generation["changed"], ["Arachne/Model/work/maya/scene1.ma"])
+        self.assertEqual(generation["deleted"], ["Arachne/Model/work/maya/scene3.ma"])
+        with zipfile.ZipFile(
+            ss_archiveManager.generationPath(self.zipPath, 1)
+        ) as myzip:
+            self.assertEqual(len(myzip.namelist()), 2)
+
+        # Nothing changed since, and the touched file isn't read again.
+        with mock.patch.object(ss_archiveManager, "_fileCrc") as fileCrc:
+            self.assertIsNone(
+                ss_archiveManager.updateArchive(self.assetPath, self.zipPath)
+            )
+            fileCrc.assert_not_called()
+
+        after = self._readTree(os.path.dirname(self.assetPath))
+        restoreDir = os.path.join(self.tempDirPath, "latest")
+        results = ss_archiveManager.restoreGeneration(self.zipPath, restoreDir)
+        self.assertEqual({result.state for result in results}, {"done"})
+        self.assertEqual(self._readTree(restoreDir), after)
+
+        restoreDir = os.path.join(self.tempDirPath, "first")
+        ss_archiveManager.restoreGeneration(self.zipPath, restoreDir, generation=0)
+        self.assertEqual(self._readTree(restoreDir), before)
+
+
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+from services import archiveStore as ss_archiveStore
+
+
+class Test_ArchiveStore(unittest.TestCase):
+    def setUp(self):
+        self.tempDirPath = tempfile.mkdtemp()
+        self.assetPath = os.path.join(self.tempDirPath, "Character", "Arachne")
+        self.shared = os.urandom(64 * 1024)
+        self.files = {
+            "Model/textures/skin.tif": self.shared,
+            "Model/work/scene.ma": b"//Maya ASCII\n" * 100,
+            "Rig/textures/skin.tif": self.shared,
+        }
+        for relPath, data in self.files.items():
+            self._write(relPath, data)
+        os.makedirs(os.path.join(self.assetPath, "Rig", "publish"))
+        self.store = ss_archiveStore.ArchiveStore(
+            os.path.join(self.tempDirPath, "store")
+        )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tempDirPath, ignore_errors=True)
+        return super().tearDown()
+
+    def _write(self, relPath, data):
+        filepath = os.path.join(self.assetPath, *relPath.split("/"))
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "wb") as outfile:
+            outfile.write(data)
+
+    def test_dedup(self):
+        manifest = self.store.archiveFolder(self.assetPath, "arachne_v1", maxWorkers=2)
+        self.assertEqual(
+            [member["path"] for member in manifest["files"]],
+            ["Arachne/" + relPath for relPath in sorted(self.files)],
+        )
+        self.assertEqual(manifest["dirs"], ["Arachne/Rig/publish"])
+        # The shared texture is only stored once.
+        self.assertEqual(
+            manifest["newBytes"],
+            len(self.shared) + len(self.files["Model/work/scene.ma"]),
+        )
+
+        # Archiving again only costs the changed file.
+        self._write("Model/work/scene.ma", b"//Maya ASCII v2\n")
+        manifest = self.store.archiveFolder(self.assetPath, "arachne_v2")
+        self.assertEqual(manifest["newBytes"], len(b"//Maya ASCII v2\n"))
+        self.assertEqual(self.store.manifests(), ["arachne_v1", "arachne_v2"])
+
+        self.store.removeManifest("arachne_v1")
+        self.assertEqual(self.store.garbageCollect(), 1)
+
+    def test_garbageCollectKeepsRunningArchives(self):
+        self.store.archiveFolder(self.assetPath, "arachne_v1")
+        self.store.removeManifest("arachne_v1")
+        # arachne_v2 is still archiving, it reused the texture but hasn't saved its manifest yet.
+        leasePath = self.store._takeLease("arachne_v2")
+        digest, _, stored = self.store.putFile(
+            os.path.join(self.assetPath, "Model", "textures", "skin.tif")
+        )
+        self.assertFalse(stored)
+        self.store.garbageCollect()
+        self.assertTrue(self.store.hasObject(digest))
+
+        self.store._dropLease(leasePath)
+        self.assertEqual(self.store.garbageCollect(), 2)
+        self.assertFalse(self.store.hasObject(digest))
+
+    def test_restore(self):
+        self.store.archiveFolder(self.assetPath, "arachne")
+        restoreDir = os.path.join(self.tempDirPath, "restored")
+        restored = self.store.restore("arachne", restoreDir)
+        self.assertEqual(len(restored), len(self.files))
+        for relPath, data in self.files.items():
+            with open(
+                os.path.join(restoreDir, "Arachne", *relPath.split("/")), "rb"
+            ) as infile:
+                self.assertEqual(infile.read(), data)
+        self.assertTrue(
+            os.path.isdir(os.path.join(restoreDir, "Arachne", "Rig", "publish"))
+        )
+
+        # A single file straight from the manifest.
+        singleDir = os.path.join(self.tempDirPath, "single")
+        restored = self.store.restore(
+            "arachne", singleDir, paths=["Arachne/Model/work/scene.ma"]
+        )
+        self.assertEqual(os.listdir(singleDir), ["Arachne"])
+        self.assertEqual(len(restored), 1)
+
+    def test_damagedObject(self):
+        manifest = self.store.archiveFolder(self.assetPath, "arachne")
+        member = manifest["files"][0]
+        with open(self.store.objectPath(member["sha256"]), "wb") as outfile:
+            outfile.write(b"")
+        with self.assertRaises(ss_archiveStore.StoreError):
+            self.store.restoreMember(member, os.path.join(self.tempDirPath, "out.bin"))
+        self.assertFalse(os.path.exists(os.path.join(self.tempDirPath, "out.bin")))
+
+        with self.assertRaises(ValueError):
+            self.store.loadManifest("../escape")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
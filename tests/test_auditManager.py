@@ -0,0 +1,58 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+from assetTestCase import AssetTestCase
+from services import auditManager as ss_auditManager
+from services import folderManager as ss_folderManager
+
+
+class Test_AuditManager(AssetTestCase):
+    def test_iterAudit(self):
+        for idx in range(10):
+            ss_folderManager.createFolders(self.config, "root01", "asset%s" % idx)
+
+        assetPath = ss_folderManager.planFolders(
+            self.config, "root01", "asset3"
+        ).folderPath
+        shutil.rmtree(os.path.join(assetPath, "base02"))
+        os.makedirs(os.path.join(assetPath, "base01", "old", "deep"))
+
+        audits = list(ss_auditManager.iterAudit(self.config, maxWorkers=2))
+        self.assertEqual(len(audits), 10)
+        dirty = [audit for audit in audits if not audit.isClean()]
+        self.assertEqual(len(dirty), 1)
+        self.assertEqual(dirty[0].assetName, "asset3")
+        self.assertEqual(
+            dirty[0].missing, ["base02", os.path.join("base02", "root02SubFolder")]
+        )
+        self.assertEqual(dirty[0].unexpected, [os.path.join("base01", "old")])
+
+    def test_iterAuditReportsErrors(self):
+        for idx in range(3):
+            ss_folderManager.createFolders(self.config, "root01", "asset%s" % idx)
+
+        auditAsset = ss_auditManager.auditAsset
+
+        def failAsset1(plan, root, assetName, folderPath):
+            if assetName == "asset1":
+                raise PermissionError("Access is denied")
+            return auditAsset(plan, root, assetName, folderPath)
+
+        with mock.patch.object(ss_auditManager, "auditAsset", side_effect=failAsset1):
+            audits = list(ss_auditManager.iterAudit(self.config, maxWorkers=2))
+        self.assertEqual(len(audits), 3)
+        dirty = [audit for audit in audits if not audit.isClean()]
+        self.assertEqual([audit.assetName for audit in dirty], ["asset1"])
+        self.assertEqual(dirty[0].error, "Access is denied")
+
+    def test_auditProject(self):
+        ss_folderManager.createFolders(self.config, "root02", "asset")
+        found = []
+        result = ss_auditManager.auditProject(self.config, callback=found.append)
+        self.assertEqual(result, (1, 0))
+        self.assertEqual(found[0].root, "root02")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -1,5 +1,13 @@
 import os
+import json
+import time
+import socket
+import shutil
+import tempfile
 import unittest
+from unittest import mock
+from services import configManger as ss_configManager
+from services import journalManager as ss_journalManager
 
 
 class Test_ConfigManager(unittest.TestCase):
@@ -11,6 +19,150 @@ class Test_ConfigManager(unittest.TestCase):
     def tearDown(self) -> None:
         return super().tearDown()
 
+    def test_schemaGraph(self):
+        config = ss_configManager.Config(
+            data={
+                "BASEFOLDERS": {"Art": "ASSETFOLDERS", "Model": ["ASSETFOLDERS"]},
+                "ASSETFOLDERS": {"work": "WORKFOLDERS", "review": None},
+                "WORKFOLDERS": {"maya": ["cache"]},
+            }
+        )
+        art, model = config.schemaGraph()
+        self.assertIs(config.schemaGraph(), config.schemaGraph())
+        # The linked schema is resolved once and shared.
+        self.assertIs(art.children[0], model.children[0])
+        self.assertEqual(
+            config.parseBaseFolders()["Art"],
+            {"work": {"maya": {"cache": None}}, "review": None},
+        )
+        self.assertTrue(config.isLinkedFolderName("WORKFOLDERS"))
+        self.assertFalse(config.isLinkedFolderName("BASEFOLDERS"))
+        self.assertEqual(config.validateSchema(), [])
+
+    def test_schemaGraphErrors(self):
+        config = ss_configManager.Config(
+            data={
+                "BASEFOLDERS": {"Art": "ASSETFOLDERS"},
+                "ASSETFOLDERS": {"work": ["WORKFOLDERS"]},
+                "WORKFOLDERS": {"maya": "ASSETFOLDERS"},
+            }
+        )
+        with self.assertRaises(ss_configManager.SchemaError):
+            config.schemaGraph()
+        errors = config.validateSchema()
+        self.assertEqual(
+            errors[0], "Schema cycle: ASSETFOLDERS -> WORKFOLDERS -> ASSETFOLDERS"
+        )
+
+        config = ss_configManager.Config(data={"BASEFOLDERS": {"Art": "MISSING"}})
+        with self.assertRaises(ss_configManager.SchemaError):
+            config.schemaGraph()
+
+    def test_parseBaseFoldersDoesNotMutate(self):
+        config = ss_configManager.getConfigByFilePath(self.testConfigPath)
+        config.parseBaseFolders()
+        self.assertEqual(config.data["BASEFOLDERS"]["base01"], "BASE01")
+
+    def test_configCache(self):
+        tempDirPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempDirPath, True)
+        configPath = os.path.join(tempDirPath, "cached.json")
+        with open(configPath, "w") as outfile:
+            json.dump({"projectName": "first"}, outfile)
+
+        config = ss_configManager.getConfigByFilePath(configPath)
+        with mock.patch.object(ss_configManager, "loadJson") as loadJson:
+            self.assertIs(ss_configManager.getConfigByFilePath(configPath), config)
+            self.assertIs(ss_configManager.getConfigByFilePath(configPath[:-5]), config)
+            loadJson.assert_not_called()
+
+        # Changing the file invalidates the cached Config.
+        with open(configPath, "w") as outfile:
+            json.dump({"projectName": "second"}, outfile)
+        reloaded = ss_configManager.getConfigByFilePath(configPath)
+        self.assertIsNot(reloaded, config)
+        self.assertEqual(reloaded.projectName(), "second")
+
+        ss_configManager.saveConfig(configPath, {"projectName": "third"})
+        self.assertEqual(
+            ss_configManager.getConfigByFilePath(configPath).projectName(), "third"
+        )
+
+    def test_cachedConfigIsReadOnly(self):
+        config = ss_configManager.getConfigByFilePath(self.testConfigPath)
+        with self.assertRaises(TypeError):
+            config.data["projectPath"] = "elsewhere"
+        with self.assertRaises(TypeError):
+            config.data["BASEFOLDERS"].pop("base01")
+        self.assertIsInstance(config.data["ROOTS"], dict)
+        self.assertEqual(json.loads(json.dumps(config.data)), config.data)
+
+        edited = config.copy()
+        edited.data["projectPath"] = "elsewhere"
+        edited.data["BASEFOLDERS"]["base01"] = None
+        self.assertEqual(edited.configPath(), config.configPath())
+        self.assertNotEqual(config.projectPath(), "elsewhere")
+        self.assertEqual(config.data["BASEFOLDERS"]["base01"], "BASE01")
+        self.assertIs(ss_configManager.getConfigByFilePath(self.testConfigPath), config)
+
+    def test_saveConfigAtomic(self):
+        tempDirPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempDirPath, True)
+        configPath = os.path.join(tempDirPath, "saved.json")
+        data = {"projectName": "saved", "ROOTS": {"Character": None}}
+        for encoder in (ss_configManager.orjson, None):
+            with mock.patch.object(ss_configManager, "orjson", encoder):
+                ss_configManager.saveConfig(configPath[:-5], data)
+                self.assertEqual(ss_configManager.loadJson(configPath), data)
+
+        # Only the config is left, no temp or lock files.
+        self.assertEqual(os.listdir(tempDirPath), ["saved.json"])
+
+        # A failed write leaves the previous config in place.
+        with mock.patch.object(os, "fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                ss_configManager.saveConfig(configPath, {"projectName": "broken"})
+        self.assertEqual(ss_configManager.loadJson(configPath), data)
+        self.assertEqual(os.listdir(tempDirPath), ["saved.json"])
+
+    def test_configLock(self):
+        tempDirPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempDirPath, True)
+        configPath = os.path.join(tempDirPath, "locked.json")
+        with ss_configManager.configLock(configPath) as lockPath:
+            self.assertTrue(os.path.isfile(lockPath))
+            with self.assertRaises(ss_configManager.ConfigLockError):
+                ss_configManager.saveConfig(configPath, {}, timeout=0.1)
+        self.assertFalse(os.path.exists(lockPath))
+
+        # A lock left behind by a crash on another host is broken once it's old enough,
+        # going by the time in the lock rather than its mtime.
+        stale = time.time() - ss_configManager.STALE_LOCK_AGE - 1
+        with open(lockPath, "w") as outfile:
+            json.dump({"host": "crashed", "pid": 1, "time": time.time()}, outfile)
+        os.utime(lockPath, (stale, stale))
+        with self.assertRaises(ss_configManager.ConfigLockError):
+            ss_configManager.saveConfig(configPath, {}, timeout=0.1)
+
+        with open(lockPath, "w") as outfile:
+            json.dump({"host": "crashed", "pid": 1, "time": stale}, outfile)
+        ss_configManager.saveConfig(
+            configPath, {"projectName": "recovered"}, timeout=0.1
+        )
+        self.assertEqual(
+            ss_configManager.loadJson(configPath), {"projectName": "recovered"}
+        )
+        self.assertEqual(os.listdir(tempDirPath), ["locked.json"])
+
+        # On this host a lock is broken as soon as its process is gone.
+        with open(lockPath, "w") as outfile:
+            json.dump(
+                {"host": socket.gethostname(), "pid": 1, "time": time.time()}, outfile
+            )
+        with mock.patch.object(ss_journalManager, "processAlive", return_value=False):
+            ss_configManager.saveConfig(configPath, {}, timeout=0.1)
+        self.assertFalse(os.path.exists(lockPath))
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -0,0 +1,113 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from services import configManger as ss_configManager
+from services import configRegistry as ss_configRegistry
+
+
+class Test_ConfigRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tempDirPath = tempfile.mkdtemp()
+        self.configsDir = os.path.join(self.tempDirPath, "configs")
+        self.showDir = os.path.join(self.tempDirPath, "show")
+        os.makedirs(self.configsDir)
+        os.makedirs(self.showDir)
+        self.registryPath = os.path.join(self.tempDirPath, "registry.json")
+        self._write(self.configsDir, "assets", "Assets", ["Prop", "Character"])
+        self._write(self.showDir, "shots", "Shots", ["Seq010"])
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tempDirPath, ignore_errors=True)
+        return super().tearDown()
+
+    def _write(self, dirPath, configName, projectName, roots):
+        configPath = os.path.join(dirPath, "{}.json".format(configName))
+        with open(configPath, "w") as outfile:
+            json.dump(
+                {
+                    "projectName": projectName,
+                    "projectPath": "C:/temp",
+                    "configRoot": "pandb",
+                    "ROOTS": {root: None for root in roots},
+                },
+                outfile,
+            )
+        return configPath
+
+    def _registry(self):
+        return ss_configRegistry.ConfigRegistry(
+            registryPath=self.registryPath, configsDir=self.configsDir
+        )
+
+    def test_refresh(self):
+        registry = self._registry()
+        entries = registry.refresh()
+        self.assertEqual([entry.projectName for entry in entries], ["Assets"])
+        self.assertEqual(entries[0].roots, ["Character", "Prop"])
+        self.assertEqual(entries[0].configName(), "assets")
+
+        entries = registry.registerDirectory(self.showDir)
+        self.assertEqual([entry.projectName for entry in entries], ["Assets", "Shots"])
+
+        os.remove(os.path.join(self.showDir, "shots.json"))
+        self.assertEqual(len(registry.refresh()), 1)
+
+    def test_cacheOnlyReadsChangedConfigs(self):
+        registry = self._registry()
+        registry.registerDirectory(self.showDir)
+
+        # A new registry picks the directories and metadata back up from the cache.
+        registry = self._registry()
+        self.assertEqual(len(registry.directories()), 2)
+        with mock.patch.object(ss_configManager, "loadJson") as loadJson:
+            self.assertEqual(len(registry.refresh()), 2)
+            loadJson.assert_not_called()
+
+        configPath = self._write(
+            self.showDir, "shots", "Shots v2", ["Seq010", "Seq020"]
+        )
+        entries = registry.refresh()
+        self.assertEqual(registry.getEntry(configPath).roots, ["Seq010", "Seq020"])
+        self.assertIn("Shots v2", [entry.projectName for entry in entries])
+
+    def test_skipsInvalidConfigsUntilTheyChange(self):
+        badPath = os.path.join(self.configsDir, "broken.json")
+        with open(badPath, "w") as outfile:
+            outfile.write("{not json")
+        registry = self._registry()
+        self.assertEqual(len(registry.refresh()), 1)
+
+        registry = self._registry()
+        with mock.patch.object(
+            ss_configManager, "loadJson", wraps=ss_configManager.loadJson
+        ) as loadJson:
+            registry.refresh()
+            loadJson.assert_not_called()
+
+            with open(badPath, "w") as outfile:
+                outfile.write("{still not json}")
+            registry.refresh()
+            loadJson.assert_called_once()
+
+    def test_savesDirectoryChanges(self):
+        emptyDir = os.path.join(self.tempDirPath, "empty")
+        os.makedirs(emptyDir)
+        self._registry().registerDirectory(emptyDir)
+        self.assertEqual(len(self._registry().directories()), 2)
+
+        self._registry().unregisterDirectory(emptyDir)
+        self.assertEqual(len(self._registry().directories()), 1)
+
+    def test_getConfig(self):
+        registry = self._registry()
+        entry = registry.refresh()[0]
+        config = registry.getConfig(entry.configPath)
+        self.assertEqual(config.projectName(), "Assets")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from PySide6 import QtCore
+from services import configWatcher as ss_configWatcher
+
+
+class Test_ConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        self.app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+        self.tempDirPath = tempfile.mkdtemp()
+        self.configPath = os.path.join(self.tempDirPath, "watched.json")
+        self._write({"projectName": "first"})
+        self.watcher = ss_configWatcher.ConfigWatcher(debounceMs=50)
+        self.changed = []
+        self.watcher.fileChanged.connect(self.changed.append)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.watcher.clear()
+        shutil.rmtree(self.tempDirPath, ignore_errors=True)
+        return super().tearDown()
+
+    def _write(self, data):
+        with open(self.configPath, "w") as outfile:
+            json.dump(data, outfile)
+
+    def _wait(self, timeout=2.0):
+        end = time.time() + timeout
+        while not self.changed and time.time() < end:
+            self.app.processEvents(QtCore.QEventLoop.AllEvents, 50)
+            time.sleep(0.01)
+        # Let any stray, undebounced emits through before checking.
+        for _ in range(10):
+            self.app.processEvents(QtCore.QEventLoop.AllEvents, 20)
+            time.sleep(0.01)
+
+    def test_debouncedChange(self):
+        self.watcher.watch(self.configPath)
+        for idx in range(3):
+            self._write({"projectName": "edit{}".format(idx)})
+        self._wait()
+        self.assertEqual(
+            self.changed, [os.path.abspath(self.configPath).replace("\\", "/")]
+        )
+
+    def test_replacedFile(self):
+        self.watcher.watch(self.configPath)
+        tmpPath = self.configPath + ".tmp"
+        with open(tmpPath, "w") as outfile:
+            json.dump({"projectName": "replaced"}, outfile)
+        os.replace(tmpPath, self.configPath)
+        self._wait()
+        self.assertEqual(len(self.changed), 1)
+
+    def test_unwatch(self):
+        self.watcher.watch(self.configPath)
+        self.watcher.unwatch(self.configPath)
+        self.assertEqual(self.watcher.watched(), [])
+        self._write({"projectName": "ignored"})
+        self._wait(timeout=0.3)
+        self.assertEqual(self.changed, [])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,216 @@
+import os
+import json
+import unittest
+from unittest import mock
+from assetTestCase import AssetTestCase
+from services import configManger as ss_configManager
+from services import folderManager as ss_folderManager
+from services import journalManager as ss_journalManager
+
+
+class Test_FolderManager(AssetTestCase):
+    def test_compileSchema(self):
+        plan = ss_folderManager.compileSchema(self.config)
+        self.assertEqual(
+            plan,
+            (
+                "base01",
+                os.path.join("base01", "root01SubFolder"),
+                "base02",
+                os.path.join("base02", "root02SubFolder"),
+                "base03",
+                os.path.join("base03", "root03SubFolder01"),
+                os.path.join("base03", "root03SubFolder02"),
+            ),
+        )
+
+    def test_compileSchemaListStyle(self):
+        data = {
+            "BASEFOLDERS": {"base01": ["LINKED01", "extra"], "base02": []},
+            "LINKED01": {"maya": ["LINKED02"], "LINKED02": [None]},
+            "LINKED02": {"cache": [None]},
+        }
+        plan = ss_folderManager.compileSchema(ss_configManager.Config(data=data))
+        self.assertEqual(
+            plan,
+            (
+                "base01",
+                os.path.join("base01", "maya"),
+                os.path.join("base01", "maya", "cache"),
+                os.path.join("base01", "cache"),
+                os.path.join("base01", "extra"),
+                "base02",
+            ),
+        )
+
+    def test_getSchemaPlanCached(self):
+        configPath = os.path.join(self.tempDirPath, "cached.json")
+        with open(configPath, "w") as outfile:
+            json.dump(self.config.data, outfile)
+
+        config = ss_configManager.getConfigByFilePath(configPath)
+        plan = ss_folderManager.getSchemaPlan(config)
+        self.assertIs(plan, ss_folderManager.getSchemaPlan(config))
+
+        edited = config.copy()
+        edited.data["BASEFOLDERS"] = {"only": None}
+        with open(configPath, "w") as outfile:
+            json.dump(edited.data, outfile)
+        stat = os.stat(configPath)
+        os.utime(configPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        config = ss_configManager.getConfigByFilePath(configPath)
+        self.assertEqual(ss_folderManager.getSchemaPlan(config), ("only",))
+
+    def test_getLeafFolders(self):
+        plan = ("a", os.path.join("a", "b"), "c")
+        self.assertEqual(
+            ss_folderManager.getLeafFolders(plan), [os.path.join("a", "b"), "c"]
+        )
+
+    def test_createFolders(self):
+        ss_folderManager.createFolders(self.config, "root01", "assetA")
+        assetPath = os.path.join(
+            self.tempDirPath, "testProject", "tempConfigRoot", "root01", "assetA"
+        )
+        for relPath in ss_folderManager.compileSchema(self.config):
+            self.assertTrue(os.path.isdir(os.path.join(assetPath, relPath)))
+
+    def test_planFolders(self):
+        plan = ss_folderManager.compileSchema(self.config)
+        folderPlan = ss_folderManager.planFolders(self.config, "root01", "assetA")
+        self.assertFalse(folderPlan.rootExists)
+        self.assertEqual(folderPlan.missing, list(plan))
+        self.assertFalse(os.path.isdir(folderPlan.folderPath))
+
+        os.makedirs(os.path.join(folderPlan.folderPath, "base02"))
+        folderPlan = ss_folderManager.createFolders(
+            self.config, "root01", "assetA", dryRun=True
+        )
+        self.assertTrue(folderPlan.rootExists)
+        self.assertEqual(folderPlan.existing, ["base02"])
+
+        ss_folderManager.createFolders(self.config, "root01", "assetA")
+        folderPlan = ss_folderManager.planFolders(self.config, "root01", "assetA")
+        self.assertEqual(folderPlan.existing, list(plan))
+        self.assertEqual(folderPlan.missing, [])
+
+    def test_createFoldersRollback(self):
+        assetPath = ss_folderManager.planFolders(
+            self.config, "root01", "assetA"
+        ).folderPath
+        # A file where a folder should go makes creation fail partway.
+        os.makedirs(os.path.dirname(assetPath))
+        ss_folderManager.createFolders(self.config, "root01", "assetB")
+        with open(os.path.join(os.path.dirname(assetPath), "assetA"), "w"):
+            pass
+
+        with self.assertRaises(OSError):
+            ss_folderManager.createFolders(self.config, "root01", "assetA")
+        self.assertEqual(os.listdir(ss_journalManager.getJournalDir()), [])
+
+        os.remove(os.path.join(os.path.dirname(assetPath), "assetA"))
+        os.makedirs(os.path.join(assetPath, "base03"))
+        cancelled = ss_folderManager.createFolders(
+            self.config, "root01", "assetA", isCancelled=lambda: True
+        )
+        self.assertEqual(len(cancelled.missing), 6)
+        self.assertEqual(os.listdir(assetPath), ["base03"])
+
+    def test_recoverJournals(self):
+        journalPath = ss_journalManager.newJournalPath("create")
+        paths = [
+            os.path.join(self.tempDirPath, "crashed"),
+            os.path.join(self.tempDirPath, "crashed", "sub"),
+        ]
+        with ss_journalManager.Journal(journalPath) as journal:
+            journal.record("mkdir", paths=paths)
+        os.makedirs(paths[-1])
+
+        recovered = ss_journalManager.recoverJournals("create")
+        self.assertEqual(recovered, [journalPath])
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertFalse(os.path.exists(journalPath))
+
+    def test_recoverSkipsRunningJournals(self):
+        path = os.path.join(self.tempDirPath, "running")
+        os.makedirs(path)
+        # Still being written by this process.
+        journal = ss_journalManager.Journal(ss_journalManager.newJournalPath("create"))
+        journal.record("mkdir", paths=[path])
+        self.assertEqual(ss_journalManager.recoverJournals("create"), [])
+
+        # Another switch on this workstation, and one on another workstation.
+        journal.close()
+        with mock.patch.object(ss_journalManager, "processAlive", return_value=True):
+            with mock.patch.object(os, "getpid", return_value=os.getpid() + 1):
+                self.assertEqual(ss_journalManager.recoverJournals("create"), [])
+        with mock.patch.object(
+            ss_journalManager.socket, "gethostname", return_value="otherHost"
+        ):
+            self.assertEqual(ss_journalManager.recoverJournals("create"), [])
+        self.assertTrue(os.path.isdir(path))
+
+        # The other instance recovered it first, the work still counts as done.
+        os.remove(journal.filepath)
+        journal.commit()
+
+    def test_loadManifest(self):
+        csvPath = os.path.join(self.tempDirPath, "manifest.csv")
+        with open(csvPath, "w") as outfile:
+            outfile.write(
+                "assetType,assetName\nroot01,assetA\nroot02, assetB\n\nroot01,assetA\n"
+            )
+        self.assertEqual(
+            ss_folderManager.loadManifest(csvPath),
+            [("root01", "assetA"), ("root02", "assetB")],
+        )
+
+        jsonPath = os.path.join(self.tempDirPath, "manifest.json")
+        with open(jsonPath, "w") as outfile:
+            json.dump({"root01": ["assetA", "assetB"]}, outfile)
+        self.assertEqual(
+            ss_folderManager.loadManifest(jsonPath),
+            [("root01", "assetA"), ("root01", "assetB")],
+        )
+
+    def test_bulkCreateFolders(self):
+        assets = [("root01", "asset{:02d}".format(idx)) for idx in range(20)]
+        finished = []
+        results = ss_folderManager.bulkCreateFolders(
+            self.config, assets, maxWorkers=4, callback=finished.append
+        )
+        self.assertEqual(len(finished), 20)
+        self.assertEqual([(r.assetType, r.assetName) for r in results], assets)
+        self.assertTrue(all(result.success for result in results))
+
+    def test_bulkCreateRejectsBadRows(self):
+        assets = [
+            ("root01", "../escape"),
+            ("root01", ".."),
+            ("root01", "C:evil"),
+            ("root01", os.path.abspath(self.tempDirPath)),
+            ("../root01", "assetA"),
+            ("root01", "assetA"),
+            ("root01", "assetB"),
+        ]
+        results = ss_folderManager.bulkCreateFolders(self.config, assets, maxWorkers=2)
+        self.assertEqual(
+            [result.success for result in results], [False] * 5 + [True, True]
+        )
+        self.assertTrue(all(result.error for result in results[:5]))
+        self.assertFalse(os.path.exists(os.path.join(self.tempDirPath, "escape")))
+
+        # Any error is reported against its asset, the rest still get made.
+        with mock.patch.object(
+            ss_folderManager,
+            "createFolders",
+            side_effect=[KeyError("root01"), ss_folderManager.FolderPlan("")],
+        ):
+            results = ss_folderManager.bulkCreateFolders(
+                self.config, assets[-2:], maxWorkers=1
+            )
+        self.assertEqual([result.success for result in results], [False, True])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
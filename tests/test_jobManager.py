@@ -0,0 +1,64 @@
+import unittest
+from PySide6 import QtCore
+from services import jobManager as ss_jobManager
+
+
+def _count(total, progress=None, isCancelled=None):
+    for idx in range(total):
+        if isCancelled():
+            return idx
+        progress(idx + 1, total)
+    return total
+
+
+def _fail(progress=None, isCancelled=None):
+    raise OSError("disk full")
+
+
+class Test_JobManager(unittest.TestCase):
+    def setUp(self):
+        self.app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+        self.jobManager = ss_jobManager.JobManager()
+        self.events = []
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.jobManager.waitForDone()
+        return super().tearDown()
+
+    def _run(self, job):
+        job.signals.progress.connect(
+            lambda *args: self.events.append(("progress",) + args)
+        )
+        job.signals.finished.connect(
+            lambda *args: self.events.append(("finished",) + args)
+        )
+        job.signals.error.connect(lambda *args: self.events.append(("error",) + args))
+        job.signals.cancelled.connect(
+            lambda *args: self.events.append(("cancelled",) + args)
+        )
+        self.jobManager.start(job)
+        self.jobManager.waitForDone()
+        self.app.processEvents()
+
+    def test_finished(self):
+        job = ss_jobManager.Job("count", _count, total=3)
+        self._run(job)
+        self.assertEqual(self.events[-1], ("finished", job.jobId, 3))
+        self.assertEqual(len([e for e in self.events if e[0] == "progress"]), 3)
+        self.assertEqual(self.jobManager.jobs(), [])
+
+    def test_error(self):
+        job = ss_jobManager.Job("fail", _fail)
+        self._run(job)
+        self.assertEqual(self.events, [("error", job.jobId, "disk full")])
+
+    def test_cancelled(self):
+        job = ss_jobManager.Job("count", _count, total=3)
+        job.cancel()
+        self._run(job)
+        self.assertEqual(self.events, [("cancelled", job.jobId)])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
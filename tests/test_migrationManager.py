@@ -0,0 +1,107 @@
+import os
+import copy
+import unittest
+from unittest import mock
+from assetTestCase import AssetTestCase
+from services import configManger as ss_configManager
+from services import folderManager as ss_folderManager
+from services import journalManager as ss_journalManager
+from services import migrationManager as ss_migrationManager
+
+
+class Test_MigrationManager(AssetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.oldConfig = self.config
+
+        data = copy.deepcopy(self.oldConfig.data)
+        data["BASE01"] = {"renamedSubFolder": None, "newSubFolder": None}
+        self.newConfig = ss_configManager.Config(data=data)
+        self.renames = ss_migrationManager.parseRenames(
+            "base01/root01SubFolder -> base01/renamedSubFolder\n"
+        )
+        for idx in range(5):
+            ss_folderManager.createFolders(self.oldConfig, "root01", "asset%s" % idx)
+
+    def test_diffConfigs(self):
+        migrationPlan = ss_migrationManager.diffConfigs(
+            self.oldConfig, self.newConfig, renames=self.renames
+        )
+        self.assertEqual(migrationPlan.added, [os.path.join("base01", "newSubFolder")])
+        self.assertEqual(
+            migrationPlan.removed, [os.path.join("base01", "root01SubFolder")]
+        )
+
+    def test_migrateProject(self):
+        dryRun = ss_migrationManager.migrateProject(
+            self.oldConfig, self.newConfig, renames=self.renames, dryRun=True
+        )
+        self.assertEqual(len(dryRun), 5)
+        self.assertTrue(all(len(migration.created) == 1 for migration in dryRun))
+        self.assertTrue(all(len(migration.renamed) == 1 for migration in dryRun))
+        for migration in dryRun:
+            self.assertFalse(
+                os.path.isdir(
+                    os.path.join(migration.folderPath, "base01", "newSubFolder")
+                )
+            )
+
+        results = ss_migrationManager.migrateProject(
+            self.oldConfig,
+            self.newConfig,
+            renames=self.renames,
+            journalPath=os.path.join(self.tempDirPath, "migrate.jsonl"),
+            maxWorkers=2,
+        )
+        for migration in results:
+            self.assertEqual(migration.error, "")
+            for relPath in ss_folderManager.compileSchema(self.newConfig):
+                self.assertTrue(
+                    os.path.isdir(os.path.join(migration.folderPath, relPath))
+                )
+
+        entries = ss_journalManager.readJournal(
+            os.path.join(self.tempDirPath, "migrate.jsonl")
+        )
+        self.assertEqual(len(entries), 10)
+
+    def test_journalBeforeChange(self):
+        journalPath = os.path.join(self.tempDirPath, "migrate.jsonl")
+        with mock.patch.object(
+            ss_migrationManager.os, "rename", side_effect=OSError("crashed")
+        ):
+            results = ss_migrationManager.migrateProject(
+                self.oldConfig,
+                self.newConfig,
+                renames=self.renames,
+                journalPath=journalPath,
+                maxWorkers=1,
+            )
+        self.assertTrue(all(migration.error for migration in results))
+        # The renames were journaled before they failed, rolling back what never happened is clean.
+        self.assertEqual(
+            [entry["action"] for entry in ss_journalManager.readJournal(journalPath)],
+            ["rename"] * 5,
+        )
+        self.assertTrue(ss_journalManager.rollbackJournal(journalPath))
+        for migration in results:
+            self.assertTrue(
+                os.path.isdir(
+                    os.path.join(migration.folderPath, "base01", "root01SubFolder")
+                )
+            )
+
+    def test_journal(self):
+        journalPath = os.path.join(self.tempDirPath, "test.jsonl")
+        with ss_journalManager.Journal(journalPath) as journal:
+            journal.record("mkdir", path="a")
+        with open(journalPath, "a") as outfile:
+            outfile.write('{"action": "mkd')
+        self.assertEqual(
+            ss_journalManager.readJournal(journalPath),
+            [{"path": "a", "action": "mkdir"}],
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
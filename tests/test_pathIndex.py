@@ -0,0 +1,58 @@
+import os
+import unittest
+from services import configManger as ss_configManager
+from services import pathIndex as ss_pathIndex
+
+
+class Test_PathIndex(unittest.TestCase):
+    def setUp(self):
+        self.curFolder = os.path.dirname(__file__)
+        self.testConfigPath = os.path.join(self.curFolder, "testConfig.json")
+        self.config = ss_configManager.getConfigByFilePath(self.testConfigPath)
+        self.index = ss_pathIndex.PathIndex([self.config])
+        self.rootPath = "/".join(self.config.rootPathTokens())
+        return super().setUp()
+
+    def test_lookup(self):
+        info = self.index.lookup(
+            "{}/root01/assetA/base03/root03SubFolder01/scene.ma".format(self.rootPath)
+        )
+        self.assertIs(info.config, self.config)
+        self.assertEqual(info.root, "root01")
+        self.assertEqual(info.assetName, "assetA")
+        self.assertEqual(info.baseFolder, "base03")
+        self.assertEqual(info.schemaPath, os.path.join("base03", "root03SubFolder01"))
+        self.assertEqual(info.remainder, "scene.ma")
+        self.assertEqual(
+            info.tokens(),
+            ["root01", "assetA", "base03", "root03SubFolder01", "scene.ma"],
+        )
+
+    def test_lookupPartial(self):
+        self.assertIsNone(self.index.lookup("/somewhere/else/entirely"))
+
+        info = self.index.lookup(self.rootPath.replace("/", "\\"))
+        self.assertIs(info.config, self.config)
+        self.assertEqual(info.root, "")
+
+        info = self.index.lookup("{}/root02".format(self.rootPath))
+        self.assertEqual((info.root, info.assetName), ("root02", ""))
+
+        info = self.index.lookup(
+            "{}/root02/assetB/notInSchema/file".format(self.rootPath)
+        )
+        self.assertEqual(info.assetName, "assetB")
+        self.assertEqual(info.schemaPath, "")
+        self.assertEqual(info.remainder, os.path.join("notInSchema", "file"))
+
+    def test_lookupMany(self):
+        paths = [
+            "{}/root01/asset{}/base01".format(self.rootPath, idx) for idx in range(100)
+        ]
+        infos = self.index.lookupMany(paths)
+        self.assertEqual([info.assetName for info in infos][:2], ["asset0", "asset1"])
+        self.assertTrue(all(info.baseFolder == "base01" for info in infos))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import unittest
+from services import configManger as ss_configManager
+from services import pathTemplates as ss_pathTemplates
+
+
+class Test_PathTemplates(unittest.TestCase):
+    def setUp(self):
+        self.curFolder = os.path.dirname(__file__)
+        self.testConfigPath = os.path.join(self.curFolder, "testConfig.json")
+        self.config = ss_configManager.Config(
+            data={
+                "projectPath": "C:/temp",
+                "projectName": "pandb",
+                "configRoot": "assets",
+                "PATHTEMPLATES": {
+                    "work": "{root}/{asset}/{dept}/work/{app}",
+                    "scene": "{root}/{asset}/{dept}/work/maya/{asset}_{version:v\\d{3}}.ma",
+                },
+            }
+        )
+        self.templates = ss_pathTemplates.compileTemplates(self.config)
+        return super().setUp()
+
+    def test_formatAndParse(self):
+        template = self.templates["work"]
+        self.assertEqual(template.fields(), ["root", "asset", "dept", "app"])
+        path = template.format(
+            root="Character", asset="Arachne", dept="Model", app="maya"
+        )
+        self.assertEqual(path, "C:/temp/pandb/assets/Character/Arachne/Model/work/maya")
+        self.assertEqual(
+            template.parse(path.replace("/", "\\")),
+            {"root": "Character", "asset": "Arachne", "dept": "Model", "app": "maya"},
+        )
+        self.assertIsNone(template.parse(path + "/extra"))
+
+        with self.assertRaises(ss_pathTemplates.TemplateError):
+            template.format(root="Character")
+
+    def test_repeatedFieldsAndPatterns(self):
+        template = self.templates["scene"]
+        folder = "C:/temp/pandb/assets/Character/Arachne/Model/work/maya/"
+        self.assertEqual(
+            template.parse(folder + "Arachne_v012.ma"),
+            {
+                "root": "Character",
+                "asset": "Arachne",
+                "dept": "Model",
+                "version": "v012",
+            },
+        )
+        # The asset name has to match both places and the version its pattern.
+        self.assertIsNone(template.parse(folder + "Spider_v012.ma"))
+        self.assertIsNone(template.parse(folder + "Arachne_v12.ma"))
+
+        name, fields = ss_pathTemplates.matchTemplate(
+            self.templates, folder + "Arachne_v001.ma"
+        )
+        self.assertEqual((name, fields["version"]), ("scene", "v001"))
+        self.assertEqual(
+            ss_pathTemplates.matchTemplate(self.templates, "C:/elsewhere"), (None, None)
+        )
+
+    def test_parseMany(self):
+        template = self.templates["work"]
+        paths = [
+            template.format(
+                root="Prop", asset="asset{}".format(idx), dept="Model", app="maya"
+            )
+            for idx in range(1000)
+        ] + ["C:/elsewhere"]
+        results = template.parseMany(paths)
+        self.assertEqual(results[10]["asset"], "asset10")
+        self.assertIsNone(results[-1])
+
+    def test_invalidTemplates(self):
+        for template in ("{root", "root}", "{not valid}"):
+            with self.assertRaises(ss_pathTemplates.TemplateError):
+                ss_pathTemplates.PathTemplate("bad", template)
+
+    def test_notALinkedSchema(self):
+        self.assertNotIn("PATHTEMPLATES", self.config.linkedFolderNames())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+from unittest import mock
+from assetTestCase import AssetTestCase
+from services import folderManager as ss_folderManager
+from services import journalManager as ss_journalManager
+from services import seedManager as ss_seedManager
+
+
+class Test_SeedManager(AssetTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.templatePath = os.path.join(self.tempDirPath, "template.ma")
+        with open(self.templatePath, "w") as outfile:
+            outfile.write("//Maya ASCII scene")
+
+        self.config.data["SEEDFILES"] = {
+            "root03SubFolder01": [
+                self.templatePath.replace("template", "{assetName}_template")
+            ],
+        }
+
+    def test_copyFile(self):
+        for allowHardlink in (True, False):
+            dst = os.path.join(self.tempDirPath, "copy{}.ma".format(allowHardlink))
+            method = ss_seedManager.copyFile(
+                self.templatePath, dst, allowHardlink=allowHardlink
+            )
+            self.assertIn(method, ("reflink", "copy_file_range", "hardlink", "copy"))
+            with open(dst) as infile:
+                self.assertEqual(infile.read(), "//Maya ASCII scene")
+
+    def test_copyFileFallsBackToBufferedCopy(self):
+        dst = os.path.join(self.tempDirPath, "copy.ma")
+        unsupported = OSError(ss_seedManager.errno.EXDEV, "Cross-device")
+        with mock.patch.object(
+            ss_seedManager, "_reflink", side_effect=unsupported
+        ), mock.patch.object(ss_seedManager, "_copyFileRange", side_effect=unsupported):
+            method = ss_seedManager.copyFile(
+                self.templatePath, dst, allowHardlink=False
+            )
+
+        self.assertEqual(method, "copy")
+        with open(dst) as infile:
+            self.assertEqual(infile.read(), "//Maya ASCII scene")
+
+    def test_getSeedFiles(self):
+        self.config.data["SEEDFILES"] = {"root03SubFolder01": ["template.ma"]}
+        plan = ss_folderManager.getSchemaPlan(self.config)
+        seeds = ss_seedManager.getSeedFiles(self.config, plan, "assetA")
+        self.assertEqual(
+            seeds,
+            [
+                (
+                    os.path.join(self.curFolder, "template.ma"),
+                    os.path.join("base03", "root03SubFolder01", "template.ma"),
+                )
+            ],
+        )
+
+    def test_createFoldersSeeds(self):
+        self.config.data["SEEDFILES"] = {"root03SubFolder01": [self.templatePath]}
+        folderPlan = ss_folderManager.createFolders(self.config, "root01", "assetA")
+        seedPath = os.path.join(
+            folderPlan.folderPath, "base03", "root03SubFolder01", "template.ma"
+        )
+        self.assertEqual(folderPlan.seeded, [seedPath])
+        self.assertTrue(os.path.isfile(seedPath))
+
+        # An existing file is never overwritten.
+        with open(seedPath, "w") as outfile:
+            outfile.write("edited")
+        folderPlan = ss_folderManager.createFolders(self.config, "root01", "assetA")
+        self.assertEqual(folderPlan.seeded, [])
+        with open(seedPath) as infile:
+            self.assertEqual(infile.read(), "edited")
+
+    def test_rollbackRemovesSeeds(self):
+        self.config.data["SEEDFILES"] = {"root03SubFolder01": [self.templatePath]}
+        with mock.patch.object(
+            ss_seedManager, "copyFile", side_effect=OSError("disk full")
+        ):
+            with self.assertRaises(OSError):
+                ss_folderManager.createFolders(self.config, "root01", "assetA")
+
+        folderPlan = ss_folderManager.planFolders(self.config, "root01", "assetA")
+        self.assertFalse(os.path.exists(folderPlan.folderPath))
+        self.assertEqual(os.listdir(ss_journalManager.getJournalDir()), [])
+
+    def test_failedSeedOnCompleteAsset(self):
+        folderPlan = ss_folderManager.createFolders(
+            self.config, "root01", "assetA", seed=False
+        )
+        self.config.data["SEEDFILES"] = {"root03SubFolder01": [self.templatePath]}
+        with mock.patch.object(
+            ss_seedManager, "copyFile", side_effect=OSError("disk full")
+        ):
+            with self.assertRaises(OSError):
+                ss_folderManager.createFolders(self.config, "root01", "assetA")
+
+        # Nothing to create so nothing was journaled as made, the asset is left as it was.
+        self.assertFalse(
+            ss_folderManager.planFolders(self.config, "root01", "assetA").missing
+        )
+        self.assertTrue(os.path.isdir(folderPlan.folderPath))
+        self.assertEqual(os.listdir(ss_journalManager.getJournalDir()), [])
+
+    def test_seedHardlinksIsOptIn(self):
+        self.config.data["SEEDFILES"] = {"root03SubFolder01": [self.templatePath]}
+        with mock.patch.object(
+            ss_seedManager, "copyFile", wraps=ss_seedManager.copyFile
+        ) as copyFile:
+            ss_folderManager.createFolders(self.config, "root01", "assetA")
+            self.config.data["SEEDHARDLINKS"] = True
+            ss_folderManager.createFolders(self.config, "root01", "assetB")
+
+        self.assertEqual(
+            [call.kwargs["allowHardlink"] for call in copyFile.call_args_list],
+            [False, True],
+        )
@@ -0,0 +1,213 @@
+import os
+import logging
+from PySide6 import QtWidgets, QtCore
+from widgets.base import BaseWidget as BaseWidget
+from widgets.base import BaseDockWidget as BaseDockWidget
+from services import archiveManager as ss_archiveManager
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+
+def _formatSize(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return "{:.1f}{}".format(size, unit)
+        size /= 1024.0
+    return "{:.1f}TB".format(size)
+
+
+class ArchiveDockWidget(BaseDockWidget):
+    closed = QtCore.Signal(bool, name="closed")
+
+    def __init__(self, themeName, themeColor, parent=None):
+        """Follows batch archive and restore jobs, one row per folder or archive with its progress and throughput.
+
+        Args:
+            themeName (string):
+            themeColor (string):
+            parent (QtWidget):
+        """
+        super().__init__(themeName=themeName, themeColor=themeColor, parent=parent)
+        self.setWindowTitle("Archive:")
+        self.setObjectName("ArchiveObject")
+        # {jobId: Job} for those still running
+        self._jobs = dict()
+        # {(jobId, inDirPath or inFilePath): QTreeWidgetItem}
+        self._items = dict()
+
+        self.w = BaseWidget(themeName=themeName, themeColor=themeColor)
+        self.mainLayout = QtWidgets.QVBoxLayout(self.w)
+
+        workersLayout = QtWidgets.QHBoxLayout()
+        self.workersInput = QtWidgets.QSpinBox()
+        self.workersInput.setRange(1, 32)
+        self.workersInput.setValue(ss_archiveManager.FOLDER_WORKERS)
+        self.workersInput.setToolTip("Folders archived at once.")
+        self.compressionInput = QtWidgets.QComboBox()
+        self.compressionInput.addItems(list(ss_archiveManager.COMPRESSION))
+        self.compressionInput.setCurrentText(ss_archiveManager.DEFAULT_COMPRESSION)
+        workersLayout.addWidget(QtWidgets.QLabel("Workers:"))
+        workersLayout.addWidget(self.workersInput)
+        workersLayout.addWidget(QtWidgets.QLabel("Compression:"))
+        workersLayout.addWidget(self.compressionInput)
+        self.volumeSizeInput = QtWidgets.QSpinBox()
+        self.volumeSizeInput.setRange(0, 1024)
+        self.volumeSizeInput.setSuffix(" GB")
+        self.volumeSizeInput.setSpecialValueText("Off")
+        self.volumeSizeInput.setToolTip(
+            "Split archives into volumes of up to this size, each volume is a zip of its own."
+        )
+        workersLayout.addWidget(QtWidgets.QLabel("Volumes:"))
+        workersLayout.addWidget(self.volumeSizeInput)
+        self.resumableInput = QtWidgets.QCheckBox("Resumable")
+        self.resumableInput.setChecked(True)
+        self.resumableInput.setToolTip(
+            "Checkpoint archives as they're written, archiving an interrupted folder again picks up where it stopped."
+        )
+        workersLayout.addWidget(self.resumableInput)
+        self.backendInput = QtWidgets.QComboBox()
+        self.backendInput.addItems(list(ss_archiveManager.BACKENDS))
+        self.backendInput.setCurrentText(ss_archiveManager.DEFAULT_BACKEND)
+        self.backendInput.setToolTip(
+            "zip: a zip per folder.\nstore: file contents are stored once in the {} folder beside the archives, "
+            "archiving a folder again only stores what changed.".format(
+                ss_archiveManager.STORE_DIRNAME
+            )
+        )
+        workersLayout.addWidget(QtWidgets.QLabel("Backend:"))
+        workersLayout.addWidget(self.backendInput)
+        workersLayout.addStretch(1)
+
+        self.tree = QtWidgets.QTreeWidget()
+        self.tree.setColumnCount(4)
+        self.tree.setHeaderLabels(["Folder", "State", "Archived", "Throughput"])
+        self.tree.header().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+
+        self.cancelButton = QtWidgets.QPushButton("Cancel Running")
+        self.cancelButton.clicked.connect(self.cancelJobs)
+
+        self.mainLayout.addLayout(workersLayout)
+        self.mainLayout.addWidget(self.tree)
+        self.mainLayout.addWidget(self.cancelButton)
+        self.setWidget(self.w)
+
+    def workers(self):
+        return self.workersInput.value()
+
+    def compression(self):
+        return self.compressionInput.currentText()
+
+    def volumeSize(self):
+        """
+        Returns:
+            int: the maximum volume size in bytes, None to archive to a single zip
+        """
+        return self.volumeSizeInput.value() * 1024**3 or None
+
+    def resumable(self):
+        return self.resumableInput.isChecked()
+
+    def backend(self):
+        return self.backendInput.currentText()
+
+    def addJob(self, job, folders):
+        """Follow a job running archiveManager.archiveFolders.
+
+        Args:
+            job (Job):
+            folders (list[tuple(str, str, str)]): the job's folders
+        """
+        self._jobs[job.jobId] = job
+        for inDirPath, outFilePath, _ in folders:
+            item = QtWidgets.QTreeWidgetItem(
+                [os.path.basename(inDirPath), "queued", "", ""]
+            )
+            item.setToolTip(0, "{} -> {}".format(inDirPath, outFilePath))
+            self.tree.addTopLevelItem(item)
+            self._items[(job.jobId, inDirPath)] = item
+
+        job.signals.result.connect(self._folderProgress)
+        job.signals.finished.connect(self._jobDone)
+        job.signals.error.connect(self._jobError)
+        job.signals.cancelled.connect(self._jobDone)
+
+    def _folderProgress(self, jobId, folderProgress):
+        """
+        Args:
+            jobId (string):
+            folderProgress (FolderProgress):
+        """
+        item = self._items.get((jobId, folderProgress.inDirPath))
+        if item is None:
+            return
+
+        item.setText(1, folderProgress.error or folderProgress.state)
+        item.setText(
+            2,
+            "{} files, {}".format(
+                folderProgress.files, _formatSize(folderProgress.bytes)
+            ),
+        )
+        item.setText(3, "{}/s".format(_formatSize(folderProgress.throughput())))
+
+    def addRestoreJob(self, job, archives):
+        """Follow a job running archiveManager.restoreArchives.
+
+        Args:
+            job (Job):
+            archives (list[tuple(str, str, list[str])]): the job's archives
+        """
+        self._jobs[job.jobId] = job
+        for inFilePath, rootDir, _ in archives:
+            item = QtWidgets.QTreeWidgetItem(
+                ["restore {}".format(os.path.basename(inFilePath)), "queued", "", ""]
+            )
+            item.setToolTip(0, "{} -> {}".format(inFilePath, rootDir))
+            self.tree.addTopLevelItem(item)
+            self._items[(job.jobId, inFilePath)] = item
+
+        job.signals.result.connect(self._restoreProgress)
+        job.signals.finished.connect(self._jobDone)
+        job.signals.error.connect(self._jobError)
+        job.signals.cancelled.connect(self._jobDone)
+
+    def _restoreProgress(self, jobId, restoreProgress):
+        """
+        Args:
+            jobId (string):
+            restoreProgress (RestoreProgress):
+        """
+        item = self._items.get((jobId, restoreProgress.inFilePath))
+        if item is None:
+            return
+
+        item.setText(1, restoreProgress.error or restoreProgress.state)
+        item.setText(
+            2,
+            "{}/{} files, {}/{}".format(
+                restoreProgress.files,
+                restoreProgress.totalFiles,
+                _formatSize(restoreProgress.bytes),
+                _formatSize(restoreProgress.totalBytes),
+            ),
+        )
+        item.setText(3, "{}/s".format(_formatSize(restoreProgress.throughput())))
+
+    def _jobDone(self, jobId, *args):
+        self._jobs.pop(jobId, None)
+
+    def _jobError(self, jobId, message):
+        self._jobs.pop(jobId, None)
+        for (itemJobId, _), item in self._items.items():
+            if itemJobId == jobId and item.text(1) in ("queued", "running"):
+                item.setText(1, "failed: {}".format(message))
+
+    def cancelJobs(self):
+        for job in self._jobs.values():
+            job.cancel()
+
+    def closeEvent(self, e) -> None:
+        super(ArchiveDockWidget, self).closeEvent(e)
+        self.closed.emit(True)
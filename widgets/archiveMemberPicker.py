@@ -0,0 +1,128 @@
+import fnmatch
+import logging
+from PySide6 import QtWidgets, QtCore
+from widgets.base import ThemeMixin as ThemeMixin
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+PATHROLE = QtCore.Qt.UserRole + 1
+
+
+class ArchiveMemberPicker(QtWidgets.QDialog, ThemeMixin):
+    def __init__(self, themeName, themeColor, archivePath, members, parent=None):
+        """Pick what to restore from an archive. Members are shown as a folder tree,
+        checking a folder checks everything under it and the filter hides files not matching a glob.
+
+        Args:
+            themeName (string):
+            themeColor (string):
+            archivePath (string):
+            members (list[ArchiveMember]): see archiveManager.listArchive
+            parent (QtWidget):
+        """
+        super().__init__(parent=parent)
+        self.setTheme((themeName, themeColor))
+        self.setWindowTitle("Restore from {}".format(archivePath))
+        self.resize(600, 500)
+        # {folder path: QTreeWidgetItem}
+        self._folders = dict()
+        self._files = list()
+
+        self.mainLayout = QtWidgets.QVBoxLayout(self)
+        self.filterInput = QtWidgets.QLineEdit()
+        self.filterInput.setPlaceholderText("Filter eg: *.ma")
+        self.filterInput.textChanged.connect(self._filter)
+
+        self.tree = QtWidgets.QTreeWidget()
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["Member", "Size"])
+        self.tree.header().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        for member in members:
+            self._addMember(member)
+
+        buttons = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
+        )
+        buttons.button(QtWidgets.QDialogButtonBox.Ok).setText("Restore")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        self.mainLayout.addWidget(self.filterInput)
+        self.mainLayout.addWidget(self.tree)
+        self.mainLayout.addWidget(buttons)
+
+    def _newItem(self, parentItem, name, path):
+        item = QtWidgets.QTreeWidgetItem([name, ""])
+        item.setFlags(
+            item.flags() | QtCore.Qt.ItemIsUserCheckable | QtCore.Qt.ItemIsAutoTristate
+        )
+        item.setCheckState(0, QtCore.Qt.Unchecked)
+        item.setData(0, PATHROLE, path)
+        if parentItem is None:
+            self.tree.addTopLevelItem(item)
+        else:
+            parentItem.addChild(item)
+        return item
+
+    def _folderItem(self, folderPath):
+        if not folderPath:
+            return None
+
+        item = self._folders.get(folderPath)
+        if item is None:
+            parentPath, _, name = folderPath.rpartition("/")
+            item = self._newItem(self._folderItem(parentPath), name, folderPath)
+            self._folders[folderPath] = item
+        return item
+
+    def _addMember(self, member):
+        if member.isDir:
+            # Keep empty folders so they can be restored too.
+            self._folderItem(member.path.rstrip("/"))
+            return
+
+        parentPath, _, name = member.path.rpartition("/")
+        item = self._newItem(self._folderItem(parentPath), name, member.path)
+        item.setText(1, "{:,}".format(member.size))
+        self._files.append(item)
+
+    def _filter(self, text):
+        pattern = text.strip()
+        for item in self._files:
+            path = item.data(0, PATHROLE)
+            item.setHidden(
+                bool(pattern)
+                and not fnmatch.fnmatch(path, pattern)
+                and not fnmatch.fnmatch(path.rpartition("/")[2], pattern)
+            )
+
+        # Hide the folders left with nothing to show, empty folders never match a filter.
+        for folderPath in sorted(self._folders, key=len, reverse=True):
+            item = self._folders[folderPath]
+            item.setHidden(
+                bool(pattern)
+                and all(item.child(idx).isHidden() for idx in range(item.childCount()))
+            )
+        if pattern:
+            self.tree.expandAll()
+
+    def selectedMembers(self):
+        """
+        Returns:
+            list[str]: the checked member paths that aren't filtered out, folders end with /
+        """
+        selected = [
+            item.data(0, PATHROLE)
+            for item in self._files
+            if item.checkState(0) == QtCore.Qt.Checked and not item.isHidden()
+        ]
+        selected.extend(
+            "{}/".format(folderPath)
+            for folderPath, item in self._folders.items()
+            if item.childCount() == 0
+            and item.checkState(0) == QtCore.Qt.Checked
+            and not item.isHidden()
+        )
+        return selected
@@ -0,0 +1,122 @@
+import os
+import logging
+from PySide6 import QtWidgets, QtCore
+from widgets.base import BaseWidget as BaseWidget
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+# ms to wait after typing stops before searching
+SEARCH_DELAY = 200
+HITROLE = QtCore.Qt.UserRole + 1
+
+
+class ArchiveSearchWidget(BaseWidget):
+    rescan = QtCore.Signal(str, name="rescan")
+    restore = QtCore.Signal(list, name="restore")
+    reveal = QtCore.Signal(str, name="reveal")
+
+    def __init__(self, themeName, themeColor, catalog, dirPath, parent=None):
+        """Search the archive catalog for the archives under a folder.
+        Double clicking a hit shows its archive in the browser, right click restores it.
+
+        Args:
+            themeName (string):
+            themeColor (string):
+            catalog (ArchiveCatalog):
+            dirPath (string): only archives under this folder are searched
+            parent (QtWidget):
+        """
+        super().__init__(themeName=themeName, themeColor=themeColor, parent=parent)
+        self._catalog = catalog
+        self._dirPath = dirPath
+
+        self.mainLayout = QtWidgets.QVBoxLayout(self)
+        self.mainLayout.setContentsMargins(0, 0, 0, 0)
+        searchLayout = QtWidgets.QHBoxLayout()
+        self.searchInput = QtWidgets.QLineEdit()
+        self.searchInput.setPlaceholderText(
+            "Search archives eg: Arachne_v012.ma or *_v01?.ma"
+        )
+        self.searchInput.setClearButtonEnabled(True)
+        self.rescanButton = QtWidgets.QPushButton("Rescan")
+        self.rescanButton.setToolTip(
+            "Catalog new and changed archives under {}".format(dirPath)
+        )
+        self.rescanButton.clicked.connect(self._rescan)
+        searchLayout.addWidget(self.searchInput)
+        searchLayout.addWidget(self.rescanButton)
+
+        self.results = QtWidgets.QTreeWidget()
+        self.results.setColumnCount(3)
+        self.results.setHeaderLabels(["Member", "Archive", "Size"])
+        self.results.setRootIsDecorated(False)
+        self.results.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.results.header().setSectionResizeMode(
+            QtWidgets.QHeaderView.ResizeToContents
+        )
+        self.results.itemDoubleClicked.connect(self._revealHit)
+        self.results.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.results.customContextMenuRequested.connect(self._rcMenu)
+        self.results.hide()
+
+        self._searchTimer = QtCore.QTimer(self)
+        self._searchTimer.setSingleShot(True)
+        self._searchTimer.setInterval(SEARCH_DELAY)
+        self._searchTimer.timeout.connect(self.search)
+        self.searchInput.textChanged.connect(self._searchTimer.start)
+
+        self.mainLayout.addLayout(searchLayout)
+        self.mainLayout.addWidget(self.results)
+
+    def _rescan(self):
+        self.rescan.emit(self._dirPath)
+
+    def search(self):
+        """Search the catalog for what's typed, the catalog is indexed so this is quick enough for the GUI thread."""
+        pattern = self.searchInput.text()
+        self.results.clear()
+        self.results.setHidden(not pattern.strip())
+        for hit in self._catalog.search(pattern, dirPath=self._dirPath):
+            item = QtWidgets.QTreeWidgetItem(
+                [hit.name(), os.path.basename(hit.archivePath), "{:,}".format(hit.size)]
+            )
+            item.setToolTip(0, hit.memberPath)
+            item.setToolTip(1, hit.archivePath)
+            item.setData(0, HITROLE, hit)
+            self.results.addTopLevelItem(item)
+
+    def _revealHit(self, item, column=0):
+        self.reveal.emit(item.data(0, HITROLE).archivePath)
+
+    def _rcMenu(self, pos):
+        if not self.results.selectedItems():
+            return
+
+        menu = QtWidgets.QMenu(self)
+        menu.setStyleSheet(self.sheet)
+        menu.addAction("Restore Selected...", self._restoreSelected)
+        menu.exec(self.results.mapToGlobal(pos))
+
+    def _restoreSelected(self):
+        rootDir = QtWidgets.QFileDialog.getExistingDirectory(
+            None,
+            "Root Directory",
+            "",
+            QtWidgets.QFileDialog.ShowDirsOnly
+            | QtWidgets.QFileDialog.DontResolveSymlinks,
+        )
+        if not rootDir:
+            return
+
+        # {archivePath: [member paths]}
+        archives = dict()
+        for item in self.results.selectedItems():
+            hit = item.data(0, HITROLE)
+            archives.setdefault(hit.archivePath, []).append(hit.memberPath)
+
+        # Restored as a background job, see Switch._restoreArchives
+        self.restore.emit(
+            [(archivePath, rootDir, paths) for archivePath, paths in archives.items()]
+        )
@@ -0,0 +1,111 @@
+import logging
+from PySide6 import QtWidgets, QtCore
+from widgets.base import BaseWidget as BaseWidget
+from widgets.base import BaseDockWidget as BaseDockWidget
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logging.basicConfig()
+
+
+class AuditDockWidget(BaseDockWidget):
+    closed = QtCore.Signal(bool, name="closed")
+
+    def __init__(self, themeName, themeColor, parent=None):
+        """Lists the assets that differ from the config's schema as an audit job streams them in.
+
+        Args:
+            themeName (string):
+            themeColor (string):
+            parent (QtWidget):
+        """
+        super().__init__(themeName=themeName, themeColor=themeColor, parent=parent)
+        self.setWindowTitle("Schema Audit:")
+        self.setObjectName("SchemaAuditObject")
+        self._job = None
+
+        self.w = BaseWidget(themeName=themeName, themeColor=themeColor)
+        self.mainLayout = QtWidgets.QVBoxLayout(self.w)
+
+        self.statusLabel = QtWidgets.QLabel("")
+        self.tree = QtWidgets.QTreeWidget()
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["Asset", "Missing / Unexpected"])
+        self.tree.header().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+
+        self.cancelButton = QtWidgets.QPushButton("Cancel")
+        self.cancelButton.clicked.connect(self.cancel)
+
+        self.mainLayout.addWidget(self.statusLabel)
+        self.mainLayout.addWidget(self.tree)
+        self.mainLayout.addWidget(self.cancelButton)
+        self.setWidget(self.w)
+
+    def setJob(self, job):
+        """Clear the previous results and follow the new audit job.
+
+        Args:
+            job (Job):
+        """
+        self.cancel()
+        self.tree.clear()
+        self._job = job
+        self.statusLabel.setText("Auditing...")
+        job.signals.result.connect(self._addAudit)
+        job.signals.progress.connect(self._progress)
+        job.signals.finished.connect(self._finished)
+        job.signals.error.connect(self._error)
+        job.signals.cancelled.connect(self._cancelled)
+
+    def _addAudit(self, jobId, audit):
+        """
+        Args:
+            jobId (string):
+            audit (AssetAudit):
+        """
+        if self._job is None or jobId != self._job.jobId or audit.isClean():
+            return
+
+        assetItem = QtWidgets.QTreeWidgetItem(
+            [
+                "{}/{}".format(audit.root, audit.assetName),
+                audit.error
+                or "{} / {}".format(len(audit.missing), len(audit.unexpected)),
+            ]
+        )
+        assetItem.setToolTip(0, audit.folderPath)
+        for relPath in audit.missing:
+            assetItem.addChild(QtWidgets.QTreeWidgetItem([relPath, "missing"]))
+        for relPath in audit.unexpected:
+            assetItem.addChild(QtWidgets.QTreeWidgetItem([relPath, "unexpected"]))
+
+        self.tree.addTopLevelItem(assetItem)
+
+    def _progress(self, jobId, audited, dirty):
+        self.statusLabel.setText(
+            "Auditing... {} assets, {} differ from the schema.".format(audited, dirty)
+        )
+
+    def _finished(self, jobId, result):
+        audited, dirty = result
+        self.statusLabel.setText(
+            "Audited {} assets, {} differ from the schema.".format(audited, dirty)
+        )
+        self._job = None
+
+    def _error(self, jobId, message):
+        self.statusLabel.setText("Audit failed: {}".format(message))
+        self._job = None
+
+    def _cancelled(self, jobId):
+        self.statusLabel.setText("Audit cancelled.")
+
+    def cancel(self):
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+
+    def closeEvent(self, e) -> None:
+        self.cancel()
+        super(AuditDockWidget, self).closeEvent(e)
+        self.closed.emit(True)
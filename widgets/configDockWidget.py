@@ -12,6 +12,7 @@ class ConfigDockWidget(BaseDockWidget):
     themeChanged = QtCore.Signal(list, name="themeChanged")
     commit = QtCore.Signal(list, name="commit")
     closed = QtCore.Signal(bool, name="closed")
+    migrate = QtCore.Signal(object, object, object, bool, name="migrate")
 
     def __init__(self, themeName, themeColor, parent=None):
         """
@@ -29,9 +30,13 @@ class ConfigDockWidget(BaseDockWidget):
         self.w = suiw_createSchema.CreateSchemaWidget(
             themeName=themeName, themeColor=themeColor
         )
+        self.w.migrate.connect(self.migrate)
         self.setWidget(self.w)
         self.themeChanged.connect(self.w.setTheme)
 
+    def setMigrationJob(self, job, dryRun):
+        self.w.setMigrationJob(job, dryRun)
+
     def setTheme(self, theme):
         super().setTheme(theme)
         self.themeChanged.emit(theme)
@@ -4,6 +4,7 @@ from PySide6 import QtWidgets, QtCore, QtGui
 from functools import partial
 from constants import schema as c_schema
 from services import configManger as ss_configManager
+from services import migrationManager as ss_migrationManager
 from widgets import configBrowser as suiw_configBrowser
 from widgets.base import BaseWidget
 from widgets.base import ThemeMixin
@@ -18,6 +19,8 @@ logging.basicConfig()
 
 class CreateSchemaWidget(BaseWidget):
     themeChanged = QtCore.Signal(list, name="themeChanged")
+    # oldConfig, newConfig, renames, dryRun, run as a job by Switch, see setMigrationJob
+    migrate = QtCore.Signal(object, object, object, bool, name="migrate")
 
     def __init__(self, themeName, themeColor, parent=None):
         super().__init__(themeName=themeName, themeColor=themeColor, parent=parent)
@@ -27,6 +30,10 @@ class CreateSchemaWidget(BaseWidget):
         self.setTheme([themeName, themeColor])
 
         self._names = list()
+        self._loadedConfig = None
+        self._migrationJob = None
+        # (oldConfig, newConfig, renames) waiting on its dry run
+        self._pendingMigration = None
         self._schTableWidgets = list()
         self._mainLayout = QtWidgets.QVBoxLayout(self)
 
@@ -98,6 +105,13 @@ class CreateSchemaWidget(BaseWidget):
         buttonLayout.addWidget(saveToButton)
         buttonLayout.addWidget(previewToButton)
 
+        migrateButton = QtWidgets.QPushButton("Migrate Existing Assets")
+        migrateButton.setToolTip(
+            "Apply the changes made to the loaded config to the assets already on disk."
+        )
+        migrateButton.clicked.connect(self._migrateAssets)
+        buttonLayout.addWidget(migrateButton)
+
         self._mainLayout.addLayout(buttonLayout)
         self._mainLayout.addWidget(mainPropertiesWidget)
         self._mainLayout.addWidget(scroller)
@@ -129,7 +143,11 @@ class CreateSchemaWidget(BaseWidget):
             filepath (string): Filename selected from the dialog
             data (dict): The parsed UI data from the widgets
         """
-        ss_configManager.saveConfig(filepath=filepath, data=data)
+        try:
+            ss_configManager.saveConfig(filepath=filepath, data=data)
+        except OSError as e:
+            # A lead on another workstation is still saving, or the share is unavailable.
+            errorWidget(title="Failed to save the config!", message=str(e))
 
     def _loadSchema(self):
         self.configBrowser = suiw_configBrowser.ConfigBrowser(
@@ -154,6 +172,10 @@ class CreateSchemaWidget(BaseWidget):
         data["projectPath"] = projPath
         data["configRoot"] = projRoot
         data["validExt"] = projExt
+        if self._loadedConfig is not None:
+            for key in c_schema.PASSTHROUGH_KEYS:
+                if key in self._loadedConfig.data:
+                    data[key] = self._loadedConfig.data[key]
 
         return data
 
@@ -182,9 +204,101 @@ class CreateSchemaWidget(BaseWidget):
                 extStr += "%s, " % n
         self._projectExtensions.setText(extStr)
 
+        self._loadedConfig = config
         self.schemaTree.setConfig(config)
         self.schemaTree._refresh()
 
+    def _migrateAssets(self):
+        """Migrate the existing assets from the loaded config's schema to the one being edited.
+        A dry run job runs first, its summary is confirmed before the migration job runs.
+        """
+        if self._migrationJob is not None:
+            errorWidget("Warning:", "A migration is already running!")
+            return
+
+        if self._loadedConfig is None:
+            errorWidget(
+                "Warning:", "Load the config the assets were created with first!"
+            )
+            return
+
+        data = self._parseTreeData()
+        if data is None:
+            return
+
+        newConfig = ss_configManager.Config(data)
+        text, ok = QtWidgets.QInputDialog.getMultiLineText(
+            self,
+            "Folder Renames",
+            "Optional, one rename per line. eg: work/maya -> work/mayaProject",
+        )
+        if not ok:
+            return
+
+        renames = ss_migrationManager.parseRenames(text)
+        self._pendingMigration = (self._loadedConfig, newConfig, renames)
+        self.migrate.emit(self._loadedConfig, newConfig, renames, True)
+
+    def setMigrationJob(self, job, dryRun):
+        """Follow a job running migrationManager.migrateProject.
+
+        Args:
+            job (Job):
+            dryRun (bool):
+        """
+        self._migrationJob = job
+        if dryRun:
+            job.signals.finished.connect(self._dryRunFinished)
+        else:
+            job.signals.finished.connect(self._migrationFinished)
+        job.signals.error.connect(self._migrationFailed)
+        job.signals.cancelled.connect(self._migrationCancelled)
+
+    def _dryRunFinished(self, jobId, dryRun):
+        self._migrationJob = None
+        if self._pendingMigration is None:
+            return
+
+        oldConfig, newConfig, renames = self._pendingMigration
+        self._pendingMigration = None
+        toCreate = sum(len(migration.created) for migration in dryRun)
+        toRename = sum(len(migration.renamed) for migration in dryRun)
+        confirm = QtWidgets.QMessageBox(
+            QtWidgets.QMessageBox.Warning,
+            "Migrate?!",
+            "{} assets: {} folders to create, {} folders to rename.".format(
+                len(dryRun), toCreate, toRename
+            ),
+            QtWidgets.QMessageBox.Ok | QtWidgets.QMessageBox.Cancel,
+            None,
+            QtCore.Qt.WindowStaysOnTopHint,
+        )
+        confirm.setStyleSheet(self.sheet)
+        if confirm.exec() != QtWidgets.QMessageBox.Ok:
+            return
+
+        self.migrate.emit(oldConfig, newConfig, renames, False)
+
+    def _migrationFinished(self, jobId, results):
+        failed = [migration for migration in results if migration.error]
+        if failed:
+            message = "\n".join(
+                "{}: {}".format(migration.folderPath, migration.error)
+                for migration in failed
+            )
+            errorWidget("Failed to migrate assets.", message)
+        logger.info("Migrated %s assets, %s failed.", len(results), len(failed))
+        self._migrationJob = None
+
+    def _migrationFailed(self, jobId, message):
+        errorWidget("Failed to migrate assets.", message)
+        self._migrationJob = None
+        self._pendingMigration = None
+
+    def _migrationCancelled(self, jobId):
+        self._migrationJob = None
+        self._pendingMigration = None
+
     def setTheme(self, theme):
         super().setTheme(theme)
         self.themeChanged.emit(theme)
@@ -273,7 +387,7 @@ class SchemaTreeWidget(QtWidgets.QTreeWidget, ThemeMixin):
                 # Check the current item is a linkedSubFolderItem
                 islinked = self._isLinkedSubFolderChild(currentItem)
                 if islinked:
-                    if currentItem.text(0) in self.config().linkedFolderNames():
+                    if self.config().isLinkedFolderName(currentItem.text(0)):
                         parentLinkedSubFolderName = currentItem.text(0)
                     else:
                         parentLinkedSubFolderName = self._getLinkedParentName(
@@ -435,7 +549,7 @@ class SchemaTreeWidget(QtWidgets.QTreeWidget, ThemeMixin):
         def expandLinkedFolders(twi, folderName):
             data = self.config().getLinkedSubFolder(folderName)
             for parentFolderName, subFolders in data.items():
-                if parentFolderName in self.config().linkedFolderNames():
+                if self.config().isLinkedFolderName(parentFolderName):
                     expandLinkedFolders(twi, parentFolderName)
                 else:
                     parentTWI = QtWidgets.QTreeWidgetItem()
@@ -443,7 +557,7 @@ class SchemaTreeWidget(QtWidgets.QTreeWidget, ThemeMixin):
                     twi.addChild(parentTWI)
 
                 for subFolder in subFolders:
-                    if subFolder in self.config().linkedFolderNames():
+                    if self.config().isLinkedFolderName(subFolder):
                         expandLinkedFolders(parentTWI, subFolder)
                     else:
                         if subFolder == None or subFolder == str(None):
@@ -467,10 +581,7 @@ class SchemaTreeWidget(QtWidgets.QTreeWidget, ThemeMixin):
                     if childName == None or childName == str(None):
                         continue
 
-                    if (
-                        self.asPreview
-                        and childName in self.config().linkedFolderNames()
-                    ):
+                    if self.asPreview and self.config().isLinkedFolderName(childName):
                         expandLinkedFolders(baseTWI, childName)
                     else:
                         # just show the linked name
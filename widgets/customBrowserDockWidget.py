@@ -2,6 +2,7 @@ import logging
 from PySide6 import QtCore, QtWidgets
 from widgets.base import BaseDockWidget as BaseDockWidget, IconMixin
 from widgets import systemFileBrowser as suiw_systemBrowser
+from widgets import archiveSearchWidget as suiw_archiveSearch
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
@@ -10,13 +11,17 @@ logging.basicConfig()
 
 class CustomBrowserDockWidget(BaseDockWidget, IconMixin):
     closed = QtCore.Signal(str, name="closed")
+    restore = QtCore.Signal(list, name="restore")
+    rescan = QtCore.Signal(str, name="rescan")
 
-    def __init__(self, themeName, themeColor, dir, parent=None):
+    def __init__(self, themeName, themeColor, dir, catalog=None, parent=None):
         """
 
         Args:
             themeName (string):
             themeColor (string):
+            dir (string):
+            catalog (ArchiveCatalog): optional, adds a search of the archives under dir
             parent QtWiget:
         """
         super().__init__(themeName=themeName, themeColor=themeColor, parent=parent)
@@ -28,7 +33,25 @@ class CustomBrowserDockWidget(BaseDockWidget, IconMixin):
         _customBrowserWidget = suiw_systemBrowser.CustomFileBrowser(
             rootDir=dir, themeName=self.themeName, themeColor=self.themeColor
         )
-        self.setWidget(_customBrowserWidget)
+        _customBrowserWidget.restore.connect(self.restore)
+        if catalog is None:
+            self.setWidget(_customBrowserWidget)
+        else:
+            self.archiveSearchWidget = suiw_archiveSearch.ArchiveSearchWidget(
+                themeName=self.themeName,
+                themeColor=self.themeColor,
+                catalog=catalog,
+                dirPath=dir,
+            )
+            self.archiveSearchWidget.restore.connect(self.restore)
+            self.archiveSearchWidget.rescan.connect(self.rescan)
+            self.archiveSearchWidget.reveal.connect(_customBrowserWidget.selectPath)
+            container = QtWidgets.QWidget()
+            containerLayout = QtWidgets.QVBoxLayout(container)
+            containerLayout.setContentsMargins(0, 0, 0, 0)
+            containerLayout.addWidget(self.archiveSearchWidget)
+            containerLayout.addWidget(_customBrowserWidget, 1)
+            self.setWidget(container)
         self.setWindowIconText(dir)
 
         tbWidget = QtWidgets.QWidget()
@@ -11,6 +11,7 @@ logging.basicConfig()
 
 class FolderDockWidget(BaseDockWidget):
     commit = QtCore.Signal(list, name="commit")
+    commitManifest = QtCore.Signal(str, name="commitManifest")
     closed = QtCore.Signal(bool, name="closed")
 
     def __init__(self, themeName, themeColor, config=None, parent=None):
@@ -24,12 +25,9 @@ class FolderDockWidget(BaseDockWidget):
 
         self.bl = QtWidgets.QHBoxLayout()
         self._assetType = None
-        self.config = config
-
-        for assetType in self.config.iterRoots():
-            rb = QtWidgets.QRadioButton(assetType)
-            rb.toggled.connect(partial(self._changeAssetType, assetType))
-            self.bl.addWidget(rb)
+        self.config = None
+        self._roots = list()
+        self.setConfig(config)
 
         self.inputName = QtWidgets.QLineEdit()
         self.inputName.setPlaceholderText(
@@ -37,14 +35,55 @@ class FolderDockWidget(BaseDockWidget):
         )
         self.inputName.returnPressed.connect(self._emit)
 
+        manifestButton = QtWidgets.QPushButton("From Manifest...")
+        manifestButton.setToolTip(
+            "Create many assets from a .csv or .json list of assetType, assetName rows."
+        )
+        manifestButton.clicked.connect(self._emitManifest)
+
+        # {jobId: (label, QListWidgetItem)} and {jobId: Job} for those still running
+        self._jobItems = dict()
+        self._runningJobs = dict()
+        self.jobList = QtWidgets.QListWidget()
+        cancelButton = QtWidgets.QPushButton("Cancel Running")
+        cancelButton.setToolTip("Stop any folder creation still running.")
+        cancelButton.clicked.connect(self.cancelJobs)
+
         self.mainLayout.addLayout(self.bl)
         self.mainLayout.addWidget(self.inputName)
+        self.mainLayout.addWidget(manifestButton)
+        self.mainLayout.addWidget(self.jobList)
+        self.mainLayout.addWidget(cancelButton)
         self.setWidget(self.w)
         # self.w.resize(100, 400)
         # self.resize(100, 400)
 
         self.mainLayout.addStretch(1)
 
+    def setConfig(self, config):
+        """Use a new or reloaded config, the root buttons are only rebuilt if its roots changed.
+
+        Args:
+            config (Config):
+        """
+        self.config = config
+        roots = list(config.iterRoots())
+        if roots == self._roots:
+            return
+
+        self._roots = roots
+        while self.bl.count():
+            self.bl.takeAt(0).widget().deleteLater()
+
+        if self._assetType not in roots:
+            self._assetType = None
+
+        for assetType in roots:
+            rb = QtWidgets.QRadioButton(assetType)
+            rb.setChecked(assetType == self._assetType)
+            rb.toggled.connect(partial(self._changeAssetType, assetType))
+            self.bl.addWidget(rb)
+
     def _changeAssetType(self, assetType, _):
         """String from toggling the radioButton
 
@@ -57,6 +96,61 @@ class FolderDockWidget(BaseDockWidget):
     def _emit(self):
         """Emit the signal for the list [assetName, assetType]"""
         self.commit.emit([self.inputName.text(), self._assetType])
+        self.inputName.clear()
+
+    def _emitManifest(self):
+        """Emit the signal for the manifest file picked by the user"""
+        filepath, _ = QtWidgets.QFileDialog.getOpenFileName(
+            None, "Asset Manifest", "", "Manifest (*.csv *.json)"
+        )
+        if not filepath:
+            return
+
+        self.commitManifest.emit(filepath)
+
+    def addJob(self, job):
+        """Track a background creation job in the list.
+
+        Args:
+            job (Job):
+        """
+        item = QtWidgets.QListWidgetItem("{}: queued".format(job.label))
+        self.jobList.insertItem(0, item)
+        self._jobItems[job.jobId] = (job.label, item)
+        self._runningJobs[job.jobId] = job
+        job.signals.progress.connect(self._jobProgress)
+        job.signals.finished.connect(self._jobFinished)
+        job.signals.error.connect(self._jobError)
+        job.signals.cancelled.connect(self._jobCancelled)
+
+    def _setJobText(self, jobId, text):
+        label, item = self._jobItems[jobId]
+        item.setText("{}: {}".format(label, text))
+
+    def _jobProgress(self, jobId, done, total):
+        self._setJobText(jobId, "{}/{}".format(done, total))
+
+    def _jobFinished(self, jobId, result):
+        if isinstance(result, list):
+            failed = len([r for r in result if not r.success])
+            text = "done {} assets, {} failed".format(len(result), failed)
+        else:
+            text = "done"
+        self._setJobText(jobId, text)
+        self._runningJobs.pop(jobId, None)
+
+    def _jobError(self, jobId, message):
+        self._setJobText(jobId, "FAILED {}".format(message))
+        self._runningJobs.pop(jobId, None)
+
+    def _jobCancelled(self, jobId):
+        self._setJobText(jobId, "cancelled")
+        self._runningJobs.pop(jobId, None)
+
+    def cancelJobs(self):
+        """Cancel any jobs in the list that are still running"""
+        for job in self._runningJobs.values():
+            job.cancel()
 
     def closeEvent(self, e) -> None:
         super(FolderDockWidget, self).closeEvent(e)
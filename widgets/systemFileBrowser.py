@@ -3,7 +3,9 @@ import logging
 import shutil
 from PySide6 import QtWidgets, QtCore, QtGui
 from widgets.base import BaseTreeViewWidget
+from widgets.archiveMemberPicker import ArchiveMemberPicker
 from services import archiveManager as ss_archiveManager
+from services import pathIndex as ss_pathIndex
 from functools import partial
 
 insideMaya = False
@@ -52,11 +54,14 @@ class Proxy(QtCore.QSortFilterProxyModel):
 
 class SystemFileBrowser(BaseTreeViewWidget):
     fileOpened = QtCore.Signal(str, name="fileOpened")
+    archive = QtCore.Signal(list, bool, name="archive")
 
     def __init__(self, config, themeName, themeColor, parent=None):
         super().__init__(themeName=themeName, themeColor=themeColor, parent=parent)
         self._settings = QtCore.QSettings("JBD", "switch_settings")
         self.config = config
+        self._rootPathTokens = config.rootPathTokens() if config is not None else None
+        self._pathIndex = ss_pathIndex.PathIndex([config] if config is not None else [])
         self.archiveFolderPath = None
         self._dir = QtCore.QDir()
         self._model = QtWidgets.QFileSystemModel()
@@ -326,10 +331,10 @@ class SystemFileBrowser(BaseTreeViewWidget):
                 logger.debug("Successfully removed directory!")
 
     def _archiveSelected(self, removeExisting=False):
-        """_summary_
+        """Zip the selected folders, emits archive for them to be archived in the background.
 
         Args:
-            removeExisting (bool, optional): _description_. Defaults to False.
+            removeExisting (bool, optional): delete the folders once archived. Defaults to False.
         """
         # Warn user first
         if removeExisting:
@@ -380,6 +385,7 @@ class SystemFileBrowser(BaseTreeViewWidget):
         else:
             dir = self.archiveFolderPath
 
+        folders = []
         rowIndices = self.selectedIndexes()
         for row in rowIndices:
             srcIdx = self._proxyModel.mapToSource(row)
@@ -387,23 +393,34 @@ class SystemFileBrowser(BaseTreeViewWidget):
                 continue
             path = self.model().filePath(srcIdx)
             if os.path.isdir(path):
-                # TODO : check this over for a more generic approach
-                zippath = "{}\\{}_{}_{}_{}.zip".format(
-                    dir,
-                    path.split("/")[-4],
-                    path.split("/")[-3],
-                    path.split("/")[-2],
-                    path.split("/")[-1],
-                )
-                logger.info("Archiving and cleaning: %s to %s", path, zippath)
-                result = ss_archiveManager.archiveFolder(
-                    inDirPath=path, outFilePath=zippath
-                )
-                if not result:
-                    continue
+                zippath = "{}\\{}.zip".format(dir, self._archiveName(path))
+                # Project relative names, restoring to the projectPath puts it back in place.
+                arcRoot = None
+                if self._pathIndex.lookup(path) is not None:
+                    arcRoot = self.config.projectPath()
+                folders.append((path, zippath, arcRoot))
+
+        if folders:
+            # Archived as a background job, see Switch._archiveFolders
+            self.archive.emit(folders, removeExisting)
 
-                if removeExisting:
-                    shutil.rmtree(path)
+    def _archiveName(self, path):
+        """Name the archive from where the folder sits in the project.
+        eg: assets_Character_Arachne_Model_work
+
+        Args:
+            path (string):
+
+        Returns:
+            string
+        """
+        info = self._pathIndex.lookup(path)
+        if info is not None and info.assetName:
+            tokens = [info.config.configRoot()] + info.tokens()
+            return "_".join(token for token in tokens if token)
+
+        # Not an asset folder of the config, name it from the last folders of the path.
+        return "_".join(path.split("/")[-4:])
 
     def dragMoveEvent(self, event) -> None:
         super(SystemFileBrowser, self).dragMoveEvent(event)
@@ -514,7 +531,14 @@ class SystemFileBrowser(BaseTreeViewWidget):
         Args:
             config (Config):
         """
+        rootPathTokens = config.rootPathTokens() if config is not None else None
         self.config = config
+        self._pathIndex = ss_pathIndex.PathIndex([config] if config is not None else [])
+        # A reload of the same project keeps the view where it is.
+        if rootPathTokens == self._rootPathTokens:
+            return
+
+        self._rootPathTokens = rootPathTokens
         self.updateModelPath()
 
     def closeEvent(self, e):
@@ -533,6 +557,8 @@ class SystemFileBrowser(BaseTreeViewWidget):
 
 
 class CustomFileBrowser(BaseTreeViewWidget):
+    restore = QtCore.Signal(list, name="restore")
+
     def __init__(self, rootDir, themeName, themeColor, parent=None):
         super().__init__(themeName=themeName, themeColor=themeColor, parent=parent)
         self._dir = QtCore.QDir()
@@ -567,6 +593,20 @@ class CustomFileBrowser(BaseTreeViewWidget):
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._rcMenu)
 
+    def selectPath(self, path):
+        """Select and scroll to a file under the browser's root, eg: an archive found by a search.
+
+        Args:
+            path (string):
+        """
+        srcIdx = self.model().index(path)
+        if not srcIdx.isValid():
+            return
+
+        idx = self._proxyModel.mapFromSource(srcIdx)
+        self.setCurrentIndex(idx)
+        self.scrollTo(idx)
+
     def selHasArchive(self):
         rowIndices = self.selectedIndexes()
         for row in rowIndices:
@@ -654,9 +694,10 @@ class CustomFileBrowser(BaseTreeViewWidget):
             QtWidgets.QFileDialog.ShowDirsOnly
             | QtWidgets.QFileDialog.DontResolveSymlinks,
         )
-        if not dir:
-            rootDir
+        if not rootDir:
+            return
 
+        archives = []
         rowIndices = self.selectedIndexes()
         for row in rowIndices:
             srcIdx = self._proxyModel.mapToSource(row)
@@ -665,11 +706,29 @@ class CustomFileBrowser(BaseTreeViewWidget):
 
             path = self.model().filePath(srcIdx)
             if os.path.isfile(path) and path.endswith(".zip"):
-                logger.info("Restoring archive: %s", path)
-                ss_archiveManager.restoreFile(path, rootDir)
+                # Only the zip's central directory is read to list it.
+                picker = ArchiveMemberPicker(
+                    self.themeName,
+                    self.themeColor,
+                    path,
+                    ss_archiveManager.listArchive(path),
+                    parent=self,
+                )
+                if picker.exec() != QtWidgets.QDialog.Accepted:
+                    continue
+
+                selected = picker.selectedMembers()
+                if not selected:
+                    continue
+                logger.info("Restoring %s members of archive: %s", len(selected), path)
+                archives.append((path, rootDir, selected))
             else:
                 logger.info("Can not restore: %s not a valid .zip archive!", path)
 
+        if archives:
+            # Restored as a background job, see Switch._restoreArchives
+            self.restore.emit(archives)
+
     def _deleteSelected(self):
         confirm = QtWidgets.QMessageBox(
             QtWidgets.QMessageBox.Warning,